@@ -0,0 +1,445 @@
+import numpy as np
+from pygame.math import Vector2
+from game_objects import Ball
+from typing import Iterable, NamedTuple, Optional, Tuple, Union
+
+ArrayLike = Union[float, np.ndarray]
+
+
+class BallSystem:
+    """以结构数组(SoA)形式存储多个球的状态
+
+    位置、速度、半径和颜色各自保存在连续的 NumPy 数组中，
+    物理引擎可以对所有球做整体数组运算。
+    """
+    positions: np.ndarray
+    velocities: np.ndarray
+    radii: np.ndarray
+    colors: np.ndarray
+    sleep: Optional['SleepState']
+
+    def __init__(self) -> None:
+        self.positions = np.zeros((0, 2), dtype=np.float64)
+        self.velocities = np.zeros((0, 2), dtype=np.float64)
+        self.radii = np.zeros(0, dtype=np.float64)
+        self.colors = np.zeros((0, 3), dtype=np.uint8)
+        self.sleep = None
+        self._buffers: Optional[Tuple[np.ndarray, ...]] = None
+
+    @classmethod
+    def from_arrays(cls, positions, velocities, radii, colors) -> 'BallSystem':
+        """从现有数组创建（数据会被复制）"""
+        system = cls()
+        system.positions = np.array(positions, dtype=np.float64).reshape(-1, 2)
+        count = len(system.positions)
+        system.velocities = np.array(velocities, dtype=np.float64).reshape(count, 2)
+        system.radii = np.broadcast_to(
+            np.asarray(radii, dtype=np.float64), (count,)).copy()
+        system.colors = np.broadcast_to(
+            np.asarray(colors, dtype=np.uint8), (count, 3)).copy()
+        return system
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def add(self, position, radius: float, color: Tuple[int, int, int],
+            velocity=(0, 0)) -> 'BallView':
+        """添加一个球，返回它的单球视图"""
+        self.extend([(position[0], position[1])], [(velocity[0], velocity[1])], radius, color)
+        return self.view(len(self) - 1)
+
+    def extend(self, positions, velocities, radii, colors) -> None:
+        """在末尾批量添加球，参数形式同 from_arrays
+
+        数组实际保存在容量按两倍增长的缓冲区中，positions 等属性是已用部分的视图，
+        逐个 add 的总代价为 O(N) 而不是每次都整体复制。
+        """
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        added = len(positions)
+        count = len(self)
+        if (self._buffers is None or self.positions.base is not self._buffers[0]
+                or count + added > len(self._buffers[0])):
+            # 首次增长，或数组被整体替换过（例如 from_arrays），重新分配并复制已有数据
+            capacity = max(8, 2 * (count + added))
+            current = (self.positions, self.velocities, self.radii, self.colors)
+            self._buffers = tuple(np.empty((capacity,) + array.shape[1:], dtype=array.dtype)
+                                  for array in current)
+            for buffer, array in zip(self._buffers, current):
+                buffer[:count] = array
+        positions_buf, velocities_buf, radii_buf, colors_buf = self._buffers
+        end = count + added
+        positions_buf[count:end] = positions
+        velocities_buf[count:end] = np.asarray(velocities, dtype=np.float64).reshape(added, 2)
+        radii_buf[count:end] = np.asarray(radii, dtype=np.float64)
+        colors_buf[count:end] = np.asarray(colors, dtype=np.uint8)
+        self.positions = positions_buf[:end]
+        self.velocities = velocities_buf[:end]
+        self.radii = radii_buf[:end]
+        self.colors = colors_buf[:end]
+
+    def view(self, index: int) -> 'BallView':
+        return BallView(self, index)
+
+    def views(self) -> Iterable['BallView']:
+        return (BallView(self, i) for i in range(len(self)))
+
+    def draw(self, surface, render_scale: Optional[float] = None, supersample: int = 1) -> None:
+        """批量绘制所有球，可以和单个物体一样交给 Renderer.render"""
+        from utils import draw_ball_batch
+        draw_ball_batch(surface, self.positions, self.radii, self.colors,
+                        render_scale, supersample)
+
+    def draw_aa(self, surface) -> None:
+        from utils import draw_ball_batch
+        draw_ball_batch(surface, self.positions, self.radii, self.colors, 1)
+
+    def get_bounds(self) -> None:
+        # 球可能分布在整个画面上，脏矩形模式下按整帧绘制
+        return None
+
+
+class SleepState:
+    """BallSystem 中各球的休眠状态，由 PhysicsEngine 维护
+
+    休眠的球记录它在六边形局部坐标系中的位置，每步跟随墙壁转动而不参与积分。
+    """
+
+    def __init__(self, count: int) -> None:
+        self.asleep = np.zeros(count, dtype=bool)
+        self.rest_steps = np.zeros(count, dtype=np.int64)
+        # 判断静止的参照点（六边形局部坐标）
+        self.anchor = np.zeros((count, 2), dtype=np.float64)
+        # 入睡时的局部位置
+        self.local = np.zeros((count, 2), dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.asleep)
+
+
+class BallView(Ball):
+    """BallSystem 中单个球的视图
+
+    保持 Ball 的接口不变，所有读写都直接作用于系统的数组。
+    """
+
+    def __init__(self, system: BallSystem, index: int) -> None:
+        self.system = system
+        self.index = index
+
+    @property
+    def position(self) -> Vector2:
+        x, y = self.system.positions[self.index]
+        return Vector2(x, y)
+
+    @position.setter
+    def position(self, value) -> None:
+        self.system.positions[self.index] = (value[0], value[1])
+
+    @property
+    def velocity(self) -> Vector2:
+        x, y = self.system.velocities[self.index]
+        return Vector2(x, y)
+
+    @velocity.setter
+    def velocity(self, value) -> None:
+        self.system.velocities[self.index] = (value[0], value[1])
+
+    @property
+    def radius(self) -> float:
+        return float(self.system.radii[self.index])
+
+    @radius.setter
+    def radius(self, value: float) -> None:
+        self.system.radii[self.index] = value
+
+    @property
+    def color(self) -> Tuple[int, int, int]:
+        r, g, b = self.system.colors[self.index]
+        return (int(r), int(g), int(b))
+
+    @color.setter
+    def color(self, value: Tuple[int, int, int]) -> None:
+        self.system.colors[self.index] = value[:3]
+
+
+def clamp_speed(velocities: np.ndarray, max_speed: float) -> np.ndarray:
+    """原地限制速度大小，返回被限制的掩码"""
+    speed = np.hypot(velocities[:, 0], velocities[:, 1])
+    clamped = speed > max_speed
+    if clamped.any():
+        velocities[clamped] *= (max_speed / speed[clamped])[:, None]
+    return clamped
+
+
+def integrate(positions: np.ndarray, velocities: np.ndarray, acceleration,
+              friction: float, max_speed: float, dt: float) -> int:
+    """原地推进 dt 秒：施加加速度和摩擦、限速、更新位置（对应 Ball.update）
+
+    返回被限速的球数。
+    """
+    velocities += acceleration * dt
+    velocities *= friction ** dt
+    clamped = clamp_speed(velocities, max_speed)
+    positions += velocities * dt
+    return int(np.count_nonzero(clamped))
+
+
+def centripetal_acceleration(positions: np.ndarray, center,
+                             rotation_speed: ArrayLike) -> np.ndarray:
+    """批量计算向心力，与 PhysicsEngine._calculate_centripetal_force 一致"""
+    r = positions - np.asarray(center, dtype=np.float64)
+    angular_velocity = np.radians(np.abs(rotation_speed))
+    # -r.normalize() * (ω² * |r|) * 0.1 化简为 -r * ω² * 0.1，r 为零时自然为零
+    return -r * (np.asarray(angular_velocity ** 2 * 0.1)[..., None])
+
+
+def hexagon_vertices(rotation: ArrayLike, center, radius: float) -> np.ndarray:
+    """计算旋转后的六边形顶点，rotation 为数组时返回 (M, 6, 2)"""
+    theta = np.radians(np.asarray(rotation, dtype=np.float64)[..., None]
+                       + np.arange(6) * 60.0)
+    center = np.asarray(center, dtype=np.float64)
+    return np.stack([center[..., 0, None] + radius * np.cos(theta),
+                     center[..., 1, None] + radius * np.sin(theta)], axis=-1)
+
+
+class WallCollisions(NamedTuple):
+    """resolve_wall_collisions 的结果"""
+    collided: np.ndarray  # 发生碰撞的掩码
+    clamped: int          # 反弹后被限速的球数
+    pushed: int           # 嵌入墙壁被推回的球数
+
+
+def resolve_wall_collisions(positions: np.ndarray, velocities: np.ndarray,
+                            radii: np.ndarray, vertices: np.ndarray, center,
+                            rotation_speed: ArrayLike, elasticity: float,
+                            max_speed: float, dt: float,
+                            border: float = 4) -> WallCollisions:
+    """批量处理球与六边形墙壁的碰撞，与 PhysicsEngine._handle_collision 一致
+
+    vertices 可以是所有球共享的 (6, 2)，也可以是每个球各自的 (N, 6, 2)。
+    原地修改位置和速度，返回碰撞掩码以及限速和推回的球数。
+    """
+    count = len(positions)
+    next_pos = positions + velocities * dt
+    starts = vertices
+    edges = np.roll(vertices, -1, axis=-2) - vertices
+    # 内法线 (-ey, ex)，凸多边形内部的点对所有边都在内侧
+    normals = np.stack([-edges[..., 1], edges[..., 0]], axis=-1)
+    rel = next_pos[:, None, :] - starts
+    side = np.sum(rel * normals, axis=-1)
+    outside = np.any(side < 0, axis=1)
+    collided = np.zeros(count, dtype=bool)
+    if not outside.any():
+        return WallCollisions(collided, 0, 0)
+
+    idx = np.nonzero(outside)[0]
+    p = next_pos[idx]
+    if vertices.ndim == 3:
+        starts, edges, normals = starts[idx], edges[idx], normals[idx]
+    rel = p[:, None, :] - starts
+    edge_len2 = np.sum(edges * edges, axis=-1)
+    t = np.clip(np.sum(rel * edges, axis=-1) / np.where(edge_len2 == 0, 1, edge_len2), 0, 1)
+    closest = starts + t[..., None] * edges
+    dist = np.hypot(*np.moveaxis(p[:, None, :] - closest, -1, 0))
+    k = np.argmin(dist, axis=1)
+    rows = np.arange(len(idx))
+    min_dist = dist[rows, k]
+    closest_point = closest[rows, k]
+    normal = (normals[k] if normals.ndim == 2 else normals[rows, k])
+    normal = normal / np.hypot(normal[:, 0], normal[:, 1])[:, None]
+
+    center = np.asarray(center, dtype=np.float64)
+    if center.ndim == 2:
+        center = center[idx]
+    radius_vec = closest_point - center
+    omega = np.radians(np.broadcast_to(np.asarray(rotation_speed, dtype=np.float64),
+                                       (count,))[idx])
+    # 墙面切向速度 ω × r
+    wall_vel = omega[:, None] * np.stack([-radius_vec[:, 1], radius_vec[:, 0]], axis=-1)
+
+    rel_vel = velocities[idx] - wall_vel
+    reflection = rel_vel - 2 * np.sum(rel_vel * normal, axis=1)[:, None] * normal
+    new_vel = wall_vel + reflection * elasticity
+    clamped = clamp_speed(new_vel, max_speed)
+    velocities[idx] = new_vel
+
+    push_distance = radii[idx] + border - min_dist
+    push = push_distance > 0
+    positions[idx[push]] = p[push] + normal[push] * push_distance[push][:, None]
+    collided[idx] = True
+    return WallCollisions(collided, int(np.count_nonzero(clamped)), int(np.count_nonzero(push)))
+
+
+def contain_in_polygon(positions: np.ndarray, radii: np.ndarray, polygon,
+                       border: float = 4, iterations: int = 3) -> np.ndarray:
+    """把中心越过墙壁的球推回凸多边形内，返回被推回的掩码
+
+    球与球之间的位置修正可能把贴墙的球挤到墙外，而墙壁碰撞只看下一步的位置，
+    深入墙外的球不会被推回。这里用 polygon.edge_distances_many 的有向距离，
+    对每条被越过的边沿内法线推到距离 r + border 处；推离一条边后可能越过相邻的边，
+    因此重复几次。
+    """
+    pushed = np.zeros(len(positions), dtype=bool)
+    normals = np.array(polygon.normals, dtype=np.float64)
+    for _ in range(iterations):
+        distances = polygon.edge_distances_many(positions)
+        violated = distances < 0
+        rows = np.flatnonzero(violated.any(axis=1))
+        if len(rows) == 0:
+            break
+        depth = np.where(violated[rows], radii[rows, None] + border - distances[rows], 0.0)
+        positions[rows] += depth @ normals
+        pushed[rows] = True
+    return pushed
+
+
+def force_in_contact_cone(force: np.ndarray, rows: np.ndarray, directions: np.ndarray,
+                          slack: float = 0.0) -> np.ndarray:
+    """判断各球所需的支撑力能否由接触提供，返回 (N,) 布尔数组
+
+    rows[m] 为第 m 个接触所属的球（force 的行号），directions[m] 为该接触推球的单位方向。
+    接触只能沿各自的方向推，力落在这些方向张成的锥内（两边各放宽 slack 弧度）时才托得住。
+    平面上的锥由方向之间最大的角度空隙决定：空隙小于 180° 时锥覆盖整个平面，
+    否则力的方向不能落在空隙内。没有接触的球只有在所需的力为零时才托得住。
+    """
+    held = np.hypot(force[:, 0], force[:, 1]) < 1e-9
+    if len(rows) == 0:
+        return held
+    angles = np.arctan2(directions[:, 1], directions[:, 0])
+    order = np.lexsort((angles, rows))
+    rows, angles = rows[order], angles[order]
+
+    # 同一个球的方向按角度排好，相邻方向之间的空隙，最后一个绕回第一个
+    first = np.r_[True, rows[1:] != rows[:-1]]
+    last = np.r_[rows[1:] != rows[:-1], True]
+    starts = np.flatnonzero(first)
+    group = np.cumsum(first) - 1
+    following = np.r_[angles[1:], 0.0]
+    following[last] = angles[starts] + 2 * np.pi
+    gaps = following - angles
+
+    widest = np.maximum.reduceat(gaps, starts)
+    candidates = np.flatnonzero(gaps == widest[group])
+    _, pick = np.unique(group[candidates], return_index=True)
+    gap_start = angles[candidates[pick]]
+
+    owner = rows[starts]
+    phi = np.arctan2(force[owner, 1], force[owner, 0])
+    into_gap = (phi - gap_start) % (2 * np.pi)
+    inside = (into_gap > slack) & (into_gap < widest - slack)
+    held[owner] |= (widest < np.pi) | ~inside
+    return held
+
+
+def as_array(vector: Optional[Vector2]) -> np.ndarray:
+    """将 Vector2 转为 NumPy 数组"""
+    if vector is None:
+        return np.zeros(2, dtype=np.float64)
+    return np.array((vector.x, vector.y), dtype=np.float64)
+
+
+# 广相阶段检查的相邻格子（半邻域），保证每对格子只被检查一次
+_NEIGHBOR_OFFSETS = ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1))
+
+
+def grid_candidate_pairs(positions: np.ndarray, radii: np.ndarray,
+                         bounds_min, bounds_max) -> Tuple[np.ndarray, np.ndarray]:
+    """均匀网格广相检测，返回可能相交的球对 (i, j)
+
+    格子边长取最大直径，每个球只需与自身及相邻格子中的球比较，
+    候选对数量与球数近似线性相关。
+    """
+    count = len(positions)
+    empty = np.zeros(0, dtype=np.int64)
+    if count < 2:
+        return empty, empty
+
+    bounds_min = np.asarray(bounds_min, dtype=np.float64)
+    bounds_max = np.asarray(bounds_max, dtype=np.float64)
+    cell_size = max(2.0 * float(radii.max()), 1e-6)
+    dims = np.maximum(np.ceil((bounds_max - bounds_min) / cell_size).astype(np.int64), 1)
+    cells = np.floor((positions - bounds_min) / cell_size).astype(np.int64)
+    # 越界的球归入边缘格子，只会增加候选对而不会漏检
+    np.clip(cells, 0, dims - 1, out=cells)
+
+    keys = cells[:, 0] * dims[1] + cells[:, 1]
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+
+    pairs_i, pairs_j = [], []
+    for dx, dy in _NEIGHBOR_OFFSETS:
+        nx = cells[:, 0] + dx
+        ny = cells[:, 1] + dy
+        src = np.nonzero((nx < dims[0]) & (ny >= 0) & (ny < dims[1]))[0]
+        neighbor_keys = nx[src] * dims[1] + ny[src]
+        start = np.searchsorted(sorted_keys, neighbor_keys, 'left')
+        counts = np.searchsorted(sorted_keys, neighbor_keys, 'right') - start
+        total = int(counts.sum())
+        if total == 0:
+            continue
+        first = np.repeat(np.cumsum(counts) - counts, counts)
+        i = np.repeat(src, counts)
+        j = order[np.repeat(start, counts) + np.arange(total) - first]
+        if dx == 0 and dy == 0:
+            keep = j > i
+            i, j = i[keep], j[keep]
+        pairs_i.append(i)
+        pairs_j.append(j)
+
+    if not pairs_i:
+        return empty, empty
+    return np.concatenate(pairs_i), np.concatenate(pairs_j)
+
+
+def resolve_ball_collisions(positions: np.ndarray, velocities: np.ndarray,
+                            radii: np.ndarray, pairs_i: np.ndarray, pairs_j: np.ndarray,
+                            elasticity: float) -> np.ndarray:
+    """处理候选球对之间的碰撞，返回发生碰撞的掩码
+
+    质量按面积(r²)计算，冲量使用与墙壁相同的弹性系数，
+    同时按质量比例把重叠的球推开。
+    """
+    count = len(positions)
+    collided = np.zeros(count, dtype=bool)
+    if len(pairs_i) == 0:
+        return collided
+
+    delta = positions[pairs_j] - positions[pairs_i]
+    dist = np.hypot(delta[:, 0], delta[:, 1])
+    overlap = radii[pairs_i] + radii[pairs_j] - dist
+    touching = overlap > 0
+    if not touching.any():
+        return collided
+
+    i, j = pairs_i[touching], pairs_j[touching]
+    delta, dist, overlap = delta[touching], dist[touching], overlap[touching]
+    # 完全重合时任取一个方向分开
+    safe = dist > 0
+    normal = np.zeros_like(delta)
+    normal[:, 0] = 1.0
+    normal[safe] = delta[safe] / dist[safe][:, None]
+
+    inv_i = 1.0 / np.maximum(radii[i], 1e-6) ** 2
+    inv_j = 1.0 / np.maximum(radii[j], 1e-6) ** 2
+    inv_sum = inv_i + inv_j
+
+    rel_vel = velocities[j] - velocities[i]
+    approach = np.sum(rel_vel * normal, axis=1)
+    impulse = np.where(approach < 0, -(1 + elasticity) * approach / inv_sum, 0.0)
+    correction = overlap / inv_sum
+
+    _scatter_add(velocities, i, -(impulse * inv_i)[:, None] * normal)
+    _scatter_add(velocities, j, (impulse * inv_j)[:, None] * normal)
+    _scatter_add(positions, i, -(correction * inv_i)[:, None] * normal)
+    _scatter_add(positions, j, (correction * inv_j)[:, None] * normal)
+
+    collided[i] = True
+    collided[j] = True
+    return collided
+
+
+def _scatter_add(target: np.ndarray, index: np.ndarray, values: np.ndarray) -> None:
+    """按索引累加 (N, 2) 数组，同一索引出现多次时全部累加"""
+    size = len(target)
+    target[:, 0] += np.bincount(index, weights=values[:, 0], minlength=size)
+    target[:, 1] += np.bincount(index, weights=values[:, 1], minlength=size)
@@ -0,0 +1,54 @@
+import os
+import sys
+import random
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# 不需要真实窗口
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from pygame.math import Vector2
+from config import GAME_CONFIG
+from game_engine import AA_STRATEGIES, PhysicsEngine, Renderer
+from game_objects import Ball, Hexagon
+
+FRAMES = 300
+
+
+def run_strategy(strategy: str) -> dict:
+    """用同一段模拟渲染 FRAMES 帧，返回 Renderer.cost_stats() 中该方式的统计"""
+    renderer = Renderer(
+        (GAME_CONFIG['WINDOW']['WIDTH'], GAME_CONFIG['WINDOW']['HEIGHT']),
+        GAME_CONFIG['WINDOW']['RENDER_SCALE'],
+        aa_strategy=strategy
+    )
+    physics = PhysicsEngine(
+        GAME_CONFIG['PHYSICS']['GRAVITY'],
+        GAME_CONFIG['PHYSICS']['ELASTICITY'],
+        GAME_CONFIG['PHYSICS']['FRICTION']
+    )
+    ball = Ball(Vector2(400, 250), 10, GAME_CONFIG['COLORS']['BALL_COLORS'][0])
+    hexagon = Hexagon(Vector2(400, 300), 200, GAME_CONFIG['COLORS']['HEXAGON'],
+                      rng=random.Random(0))
+    renderer.render([hexagon, ball])  # 预热缓存
+    renderer.frame_costs[strategy].clear()
+    for _ in range(FRAMES):
+        hexagon.update(GAME_CONFIG['HEXAGON']['ROTATION_ACCELERATION'])
+        physics.update(ball, hexagon)
+        renderer.render([hexagon, ball])
+    return renderer.cost_stats()[strategy]
+
+
+def main():
+    pygame.init()
+    print(f"{'strategy':>18} {'mean ms':>9} {'p95 ms':>9} {'max ms':>9}")
+    for strategy in AA_STRATEGIES:
+        stats = run_strategy(strategy)
+        print(f"{strategy:>18} {stats['mean_ms']:>9.3f} {stats['p95_ms']:>9.3f} "
+              f"{stats['max_ms']:>9.3f}")
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
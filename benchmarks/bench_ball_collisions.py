@@ -0,0 +1,58 @@
+import os
+import sys
+import time
+import numpy as np
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from pygame.math import Vector2
+from ball_system import BallSystem
+from config import GAME_CONFIG
+from game_engine import PhysicsEngine
+from game_objects import Hexagon
+
+BALL_COUNTS = [500, 1000, 2000, 4000, 8000]
+BALL_RADIUS = 1.0
+STEPS = 50
+
+
+def make_system(count: int, seed: int = 0) -> BallSystem:
+    """在六边形内切圆中随机放置球"""
+    rng = np.random.default_rng(seed)
+    angle = rng.uniform(0, 2 * np.pi, count)
+    distance = 160 * np.sqrt(rng.uniform(0, 1, count))
+    positions = np.stack([400 + distance * np.cos(angle),
+                          300 + distance * np.sin(angle)], axis=1)
+    velocities = rng.normal(0, 120, (count, 2))
+    return BallSystem.from_arrays(positions, velocities, BALL_RADIUS, (255, 0, 0))
+
+
+def time_steps(physics: PhysicsEngine, system: BallSystem, hexagon: Hexagon) -> float:
+    """返回每步平均耗时（秒）"""
+    physics.update_system(system, hexagon)  # 预热
+    start = time.perf_counter()
+    for _ in range(STEPS):
+        hexagon.update(GAME_CONFIG['HEXAGON']['ROTATION_ACCELERATION'])
+        physics.update_system(system, hexagon)
+    return (time.perf_counter() - start) / STEPS
+
+
+def main():
+    physics = PhysicsEngine(
+        GAME_CONFIG['PHYSICS']['GRAVITY'],
+        GAME_CONFIG['PHYSICS']['ELASTICITY'],
+        GAME_CONFIG['PHYSICS']['FRICTION']
+    )
+    print(f"{'balls':>8} {'pairs':>8} {'ms/step':>10} {'us/ball':>10}")
+    for count in BALL_COUNTS:
+        system = make_system(count)
+        hexagon = Hexagon(Vector2(400, 300), 200, GAME_CONFIG['COLORS']['HEXAGON'])
+        pairs_i, _ = physics.find_ball_pairs(system, hexagon)
+        per_step = time_steps(physics, system, hexagon)
+        print(f"{count:>8} {len(pairs_i):>8} {per_step * 1e3:>10.3f} "
+              f"{per_step / count * 1e6:>10.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+import os
+import sys
+import time
+import numpy as np
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# 不需要真实窗口
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from config import GAME_CONFIG
+from utils import draw_ball_batch, draw_glowing_circle, glow_lod
+
+BALL_COUNTS = [200, 1000, 5000, 20000, 50000]
+BALL_RADIUS = 10
+REPEATS = 5
+
+
+def make_balls(count: int, seed: int = 0):
+    """在六边形内切圆中随机放置不同颜色的球"""
+    rng = np.random.default_rng(seed)
+    angle = rng.uniform(0, 2 * np.pi, count)
+    distance = 160 * np.sqrt(rng.uniform(0, 1, count))
+    positions = np.stack([400 + distance * np.cos(angle),
+                          300 + distance * np.sin(angle)], axis=1)
+    palette = np.array(GAME_CONFIG['COLORS']['BALL_COLORS'], dtype=np.uint8)
+    return positions, palette[rng.integers(0, len(palette), count)]
+
+
+def time_draw(draw) -> float:
+    """返回在 2 倍表面上绘制一次的平均耗时（秒）"""
+    scale = GAME_CONFIG['WINDOW']['RENDER_SCALE']
+    surface = pygame.Surface((800 * scale, 600 * scale), pygame.SRCALPHA)
+    draw(surface)  # 预热精灵缓存
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        surface.fill((0, 0, 0, 0))
+        draw(surface)
+    return (time.perf_counter() - start) / REPEATS
+
+
+def main():
+    pygame.init()
+    print(f"{'balls':>6} {'layers':>6} {'per-ball ms':>12} {'blits ms':>9} {'splat ms':>9}")
+    for count in BALL_COUNTS:
+        positions, colors = make_balls(count)
+        layers = glow_lod(count)
+
+        def per_ball(surface):
+            for (x, y), color in zip(positions.tolist(), colors.tolist()):
+                draw_glowing_circle(surface, tuple(color), (x, y), BALL_RADIUS)
+
+        single = time_draw(per_ball) if count <= 5000 else float('nan')
+        blits = time_draw(lambda s: draw_ball_batch(s, positions, BALL_RADIUS, colors, splat=False))
+        splat = time_draw(lambda s: draw_ball_batch(s, positions, BALL_RADIUS, colors, splat=True))
+        print(f"{count:>6} {layers:>6} {single * 1e3:>12.2f} {blits * 1e3:>9.2f} {splat * 1e3:>9.2f}")
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
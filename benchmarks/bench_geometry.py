@@ -0,0 +1,44 @@
+import os
+import sys
+import timeit
+import numpy as np
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from geometry import ConvexPolygon
+from utils import get_hex_points, point_in_polygon
+
+POINT_COUNT = 10000
+
+
+def per_call(statement, number: int) -> float:
+    """返回每次调用的平均耗时（微秒）"""
+    return min(timeit.repeat(statement, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    points = get_hex_points(17.5)
+    polygon = ConvexPolygon(points)
+    rng = np.random.default_rng(0)
+    samples = rng.uniform((150, 50), (650, 550), (POINT_COUNT, 2))
+    sample_list = [tuple(p) for p in samples]
+    point = sample_list[0]
+
+    print("单点查询（微秒/次）")
+    print(f"  point_in_polygon         {per_call(lambda: point_in_polygon(point, points), 20000):8.3f}")
+    print(f"  ConvexPolygon.contains   {per_call(lambda: polygon.contains(point), 20000):8.3f}")
+    print(f"  ConvexPolygon 构造+查询  "
+          f"{per_call(lambda: ConvexPolygon(points).contains(point), 5000):8.3f}")
+    print(f"  regular 构造+查询        "
+          f"{per_call(lambda: ConvexPolygon.regular((400, 300), 200, 6, 17.5).contains(point), 5000):8.3f}")
+
+    print(f"批量查询 {POINT_COUNT} 个点（微秒/点）")
+    loop = per_call(lambda: [point_in_polygon(p, points) for p in sample_list], 5) / POINT_COUNT
+    batch = per_call(lambda: polygon.contains_many(samples), 50) / POINT_COUNT
+    print(f"  point_in_polygon 循环    {loop:8.3f}")
+    print(f"  contains_many            {batch:8.3f}")
+
+
+if __name__ == '__main__':
+    main()
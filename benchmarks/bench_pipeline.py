@@ -0,0 +1,89 @@
+import os
+import sys
+import time
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# 不需要真实窗口
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from config import GAME_CONFIG
+from game import Game
+from game_engine import FixedTimestep
+from pipeline import PhysicsThread, TripleBuffer, capture_snapshot, make_views, render_snapshot
+
+DURATION = 3.0  # 每种模式运行的秒数
+
+
+def make_game(substeps: int) -> Game:
+    game = Game(seed=0)
+    # 增加子步数来模拟更重的物理负载
+    game.timestep = FixedTimestep(GAME_CONFIG['TIMESTEP']['PHYSICS_HZ'], substeps,
+                                  GAME_CONFIG['TIMESTEP']['MAX_STEPS_PER_FRAME'])
+    return game
+
+
+def summarize(latencies: list, frames: int, elapsed: float) -> tuple:
+    ordered = sorted(latencies)
+    return (frames / elapsed,
+            sum(ordered) / len(ordered) * 1e3,
+            ordered[int(len(ordered) * 0.95)] * 1e3)
+
+
+def run_serial(substeps: int) -> tuple:
+    """与 Game.run 相同的串行循环（不限帧率）：追赶物理步，再绘制
+
+    延迟为最后一个物理步完成到画面提交的时间。
+    """
+    game = make_game(substeps)
+    latencies, frames = [], 0
+    start = last = produced = time.perf_counter()
+    while time.perf_counter() - start < DURATION:
+        now = time.perf_counter()
+        frame_time, last = now - last, now
+        steps = game.timestep.advance(frame_time)
+        for _ in range(steps):
+            game.step()
+        if steps:
+            produced = time.perf_counter()
+        game.renderer.render([game.hexagon, game.ball])
+        latencies.append(time.perf_counter() - produced)
+        frames += 1
+    return summarize(latencies, frames, time.perf_counter() - start)
+
+
+def run_pipelined(substeps: int) -> tuple:
+    """物理在后台线程中运行，主线程不限帧率地绘制最新快照
+
+    延迟为快照发布到画面提交的时间。
+    """
+    game = make_game(substeps)
+    buffer = TripleBuffer(capture_snapshot(game))
+    hexagon, ball = make_views(game)
+    physics = PhysicsThread(game, buffer)
+    latencies, frames = [], 0
+    physics.start()
+    start = time.perf_counter()
+    while time.perf_counter() - start < DURATION:
+        snapshot, _ = buffer.latest()
+        render_snapshot(game.renderer, snapshot, hexagon, ball)
+        latencies.append(time.perf_counter() - snapshot.produced)
+        frames += 1
+    elapsed = time.perf_counter() - start
+    physics.stop()
+    return summarize(latencies, frames, elapsed)
+
+
+def main():
+    pygame.init()
+    print(f"{'substeps':>8} {'mode':>10} {'frames/s':>10} {'latency ms':>11} {'p95 ms':>8}")
+    for substeps in (1, 256):
+        for name, run in (('serial', run_serial), ('pipelined', run_pipelined)):
+            fps, mean, p95 = run(substeps)
+            print(f"{substeps:>8} {name:>10} {fps:>10.1f} {mean:>11.2f} {p95:>8.2f}")
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
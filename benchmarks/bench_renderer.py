@@ -0,0 +1,57 @@
+import os
+import sys
+import random
+import time
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# 不需要真实窗口
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from pygame.math import Vector2
+from config import GAME_CONFIG
+from game_engine import PhysicsEngine, Renderer
+from game_objects import Ball, Hexagon
+
+FRAMES = 300
+
+
+def time_frames(dirty_rects: bool) -> float:
+    """返回每帧平均渲染耗时（秒），物理更新不计入"""
+    renderer = Renderer(
+        (GAME_CONFIG['WINDOW']['WIDTH'], GAME_CONFIG['WINDOW']['HEIGHT']),
+        GAME_CONFIG['WINDOW']['RENDER_SCALE'],
+        dirty_rects=dirty_rects
+    )
+    physics = PhysicsEngine(
+        GAME_CONFIG['PHYSICS']['GRAVITY'],
+        GAME_CONFIG['PHYSICS']['ELASTICITY'],
+        GAME_CONFIG['PHYSICS']['FRICTION']
+    )
+    ball = Ball(Vector2(400, 250), 10, GAME_CONFIG['COLORS']['BALL_COLORS'][0])
+    hexagon = Hexagon(Vector2(400, 300), 200, GAME_CONFIG['COLORS']['HEXAGON'],
+                      rng=random.Random(0))
+    renderer.render([hexagon, ball])  # 预热缓存
+    elapsed = 0.0
+    for _ in range(FRAMES):
+        hexagon.update(GAME_CONFIG['HEXAGON']['ROTATION_ACCELERATION'])
+        physics.update(ball, hexagon)
+        start = time.perf_counter()
+        renderer.render([hexagon, ball])
+        elapsed += time.perf_counter() - start
+    return elapsed / FRAMES
+
+
+def main():
+    pygame.init()
+    full = time_frames(False)
+    dirty = time_frames(True)
+    print(f"{'mode':>8} {'ms/frame':>10}")
+    print(f"{'full':>8} {full * 1e3:>10.3f}")
+    print(f"{'dirty':>8} {dirty * 1e3:>10.3f}")
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
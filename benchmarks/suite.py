@@ -0,0 +1,240 @@
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import random
+import sys
+import time
+import timeit
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# 不需要真实窗口
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import numpy as np
+import pygame
+from pygame.math import Vector2
+from ball_system import BallSystem
+from config import GAME_CONFIG
+from frame_export import HeadlessRenderer
+from game_engine import PhysicsEngine
+from game_objects import Ball, Hexagon
+from utils import (draw_glowing_circle, draw_smooth_hexagon, get_closest_point_on_line,
+                   get_hex_points, point_in_polygon)
+
+BALL_COUNTS = (1, 100, 1000)
+RENDER_SCALES = (1, 2)
+DEFAULT_TOLERANCE = 0.25  # 允许比基线慢 25%
+HEX_BORDER_WIDTH = 4  # 与 Hexagon.draw 的边框宽度相同
+
+
+def make_physics() -> PhysicsEngine:
+    return PhysicsEngine(GAME_CONFIG['PHYSICS']['GRAVITY'],
+                         GAME_CONFIG['PHYSICS']['ELASTICITY'],
+                         GAME_CONFIG['PHYSICS']['FRICTION'])
+
+
+def make_hexagon() -> Hexagon:
+    return Hexagon(Vector2(400, 300), 200, GAME_CONFIG['COLORS']['HEXAGON'], rng=random.Random(0))
+
+
+def random_positions(count: int, seed: int = 0) -> np.ndarray:
+    """六边形内切圆中的随机位置"""
+    rng = np.random.default_rng(seed)
+    angle = rng.uniform(0, 2 * np.pi, count)
+    distance = 160 * np.sqrt(rng.uniform(0, 1, count))
+    return np.stack([400 + distance * np.cos(angle), 300 + distance * np.sin(angle)], axis=1)
+
+
+def physics_case(count: int):
+    """count 个独立的球各调用一次 PhysicsEngine.update"""
+    physics, hexagon = make_physics(), make_hexagon()
+    colors = GAME_CONFIG['COLORS']['BALL_COLORS']
+    balls = [Ball(Vector2(*p), 10, colors[i % len(colors)])
+             for i, p in enumerate(random_positions(count))]
+
+    def run():
+        hexagon.update(GAME_CONFIG['HEXAGON']['ROTATION_ACCELERATION'])
+        for ball in balls:
+            physics.update(ball, hexagon)
+    return run
+
+
+def geometry_cases() -> dict:
+    points = get_hex_points(17.5)
+    inside, outside = (400.0, 300.0), (700.0, 50.0)
+    start, end = points[0], points[1]
+    return {
+        'point_in_polygon/inside': lambda: point_in_polygon(inside, points),
+        'point_in_polygon/outside': lambda: point_in_polygon(outside, points),
+        'get_closest_point_on_line': lambda: get_closest_point_on_line(inside, start, end),
+        'get_hex_points': lambda: get_hex_points(17.5),
+    }
+
+
+def draw_hexagon_case(scale: int):
+    surface = pygame.Surface((800 * scale, 600 * scale), pygame.SRCALPHA)
+    points = get_hex_points(17.5)
+    color = GAME_CONFIG['COLORS']['HEXAGON']
+    return lambda: draw_smooth_hexagon(surface, color, points, HEX_BORDER_WIDTH, scale)
+
+
+def draw_glow_case(scale: int):
+    surface = pygame.Surface((800 * scale, 600 * scale))
+    color = GAME_CONFIG['COLORS']['BALL_COLORS'][0]
+    draw_glowing_circle(surface, color, (400.3, 300.7), 10, scale)  # 预热精灵缓存
+    return lambda: draw_glowing_circle(surface, color, (400.3, 300.7), 10, scale)
+
+
+def render_case(count: int, scale: int):
+    """无窗口渲染一整帧：六边形加 count 个球（单球时与游戏相同，用 Ball）"""
+    renderer = HeadlessRenderer((GAME_CONFIG['WINDOW']['WIDTH'], GAME_CONFIG['WINDOW']['HEIGHT']),
+                                scale)
+    hexagon = make_hexagon()
+    positions = random_positions(count)
+    if count == 1:
+        balls = Ball(Vector2(*positions[0]), 10, GAME_CONFIG['COLORS']['BALL_COLORS'][0])
+    else:
+        colors = np.array(GAME_CONFIG['COLORS']['BALL_COLORS'], dtype=np.uint8)
+        balls = BallSystem.from_arrays(positions, np.zeros_like(positions), 10,
+                                       colors[np.arange(count) % len(colors)])
+    objects = [hexagon, balls]
+    renderer.render(objects)  # 预热缓存
+
+    def run():
+        hexagon.update(GAME_CONFIG['HEXAGON']['ROTATION_ACCELERATION'])
+        renderer.render(objects)
+    return run
+
+
+def build_cases() -> dict:
+    """所有用例：名称 -> 无参数的可调用对象"""
+    cases = {}
+    for count in BALL_COUNTS:
+        cases[f'physics_update/balls={count}'] = lambda count=count: physics_case(count)
+    for name, fn in geometry_cases().items():
+        cases[name] = lambda fn=fn: fn
+    for scale in RENDER_SCALES:
+        cases[f'draw_smooth_hexagon/scale={scale}'] = lambda scale=scale: draw_hexagon_case(scale)
+        cases[f'draw_glowing_circle/scale={scale}'] = lambda scale=scale: draw_glow_case(scale)
+    for scale in RENDER_SCALES:
+        for count in BALL_COUNTS:
+            cases[f'render_frame/balls={count}/scale={scale}'] = (
+                lambda count=count, scale=scale: render_case(count, scale))
+    return cases
+
+
+def measure(fn, repeat: int, min_time: float) -> dict:
+    """每次调用的耗时（微秒）
+
+    先按 min_time 确定每轮的调用次数，再重复 repeat 轮；最小值受干扰最少，用于比较。
+    """
+    timer = timeit.Timer(fn)
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 2
+    runs = np.array(timer.repeat(repeat=repeat, number=number)) / number * 1e6
+    return {'min_us': float(runs.min()), 'median_us': float(np.median(runs)),
+            'number': number, 'repeat': repeat}
+
+
+def run_suite(pattern: str = '*', repeat: int = 5, min_time: float = 0.05) -> dict:
+    pygame.init()
+    results = {}
+    try:
+        for name, setup in build_cases().items():
+            if not fnmatch.fnmatch(name, pattern):
+                continue
+            results[name] = measure(setup(), repeat, min_time)
+            print(f"{name:<36} {results[name]['min_us']:>12.2f} us", flush=True)
+    finally:
+        pygame.quit()
+    return {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'machine': {'platform': platform.platform(), 'processor': platform.machine(),
+                    'python': platform.python_version(), 'pygame': pygame.version.ver,
+                    'numpy': np.__version__},
+        'results': results,
+    }
+
+
+def compare(baseline: dict, current: dict, tolerance: float) -> list:
+    """逐个用例比较最小耗时，返回 (名称, 基线, 当前, 比值, 是否退化)
+
+    只比较两边都有的用例；比值超过 1 + tolerance 视为退化。
+    """
+    rows = []
+    for name, base in baseline['results'].items():
+        if name not in current['results']:
+            continue
+        now = current['results'][name]
+        ratio = now['min_us'] / base['min_us']
+        rows.append((name, base['min_us'], now['min_us'], ratio, ratio > 1 + tolerance))
+    return rows
+
+
+def missing_cases(baseline: dict, current: dict, pattern: str = '*') -> list:
+    """基线中有、当前结果中却没有的用例名称（只看匹配 pattern 的用例）
+
+    用例被改名、删除或构造时出错都会表现为缺失，视为失败，不能静默跳过。
+    """
+    return sorted(name for name in baseline['results']
+                  if fnmatch.fnmatch(name, pattern) and name not in current['results'])
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="性能基准套件：保存基线并检查退化")
+    sub = parser.add_subparsers(dest='command', required=True)
+    run = sub.add_parser('run', help="运行所有用例，可以保存为 JSON 基线")
+    check = sub.add_parser('compare', help="与基线比较，有用例退化或缺失时返回 1")
+    for p in (run, check):
+        p.add_argument('--filter', default='*', help="只运行名称匹配的用例（通配符）")
+        p.add_argument('--repeat', type=int, default=5, help="每个用例重复的轮数")
+        p.add_argument('--min-time', type=float, default=0.05, help="每轮的最短时间（秒）")
+    run.add_argument('--output', metavar='PATH', help="把结果写入 JSON 文件")
+    check.add_argument('baseline', help="基线 JSON 文件")
+    check.add_argument('current', nargs='?',
+                       help="与之比较的结果 JSON 文件；省略时现场运行")
+    check.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                       help="允许的相对变慢比例")
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        report = run_suite(args.filter, args.repeat, args.min_time)
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(report, f, indent=2)
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if args.current:
+        with open(args.current) as f:
+            current = json.load(f)
+    else:
+        current = run_suite(args.filter, args.repeat, args.min_time)
+    rows = compare(baseline, current, args.tolerance)
+    missing = missing_cases(baseline, current, args.filter)
+    print(f"\n{'case':<36} {'baseline us':>12} {'current us':>12} {'ratio':>7}")
+    for name, base, now, ratio, regressed in rows:
+        print(f"{name:<36} {base:>12.2f} {now:>12.2f} {ratio:>7.2f}"
+              f"{'  REGRESSED' if regressed else ''}")
+    for name in missing:
+        print(f"{name:<36} {baseline['results'][name]['min_us']:>12.2f} {'-':>12} {'-':>7}"
+              f"  MISSING")
+    failures = [row for row in rows if row[4]]
+    if failures or missing:
+        if failures:
+            print(f"\n{len(failures)} of {len(rows)} cases regressed by more than "
+                  f"{args.tolerance:.0%}")
+        if missing:
+            print(f"\n{len(missing)} baseline cases missing from the current run")
+        return 1
+    print(f"\nall {len(rows)} cases within {args.tolerance:.0%} of baseline")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
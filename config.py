@@ -6,14 +6,61 @@ GAME_CONFIG: GameConfig = {
         'WIDTH': 800,
         'HEIGHT': 600,
         'RENDER_SCALE': 2,
-        'FPS': 60
+        'FPS': 60,
+        'IDLE_TIMEOUT_MS': 500,         # 暂停时阻塞等待事件的最长时间
+        'GLOW_CACHE_MB': 8,             # 发光精灵缓存的内存上限
+        'DIRTY_RECTS': False,           # 只重绘和提交有物体移动的区域（仅 supersample）
+        'AA_STRATEGY': 'supersample',   # 抗锯齿方式：supersample、gfxdraw 或 local_supersample
+        'ADAPTIVE_SCALE': False,        # 按每帧渲染耗时在 MIN_RENDER_SCALE 与 RENDER_SCALE 之间调整（仅 supersample）
+        'MIN_RENDER_SCALE': 1.0,
+        'SCALE_STEP': 0.25,             # 每次调整的倍数
+        'FRAME_BUDGET_MS': 12.0,        # 每帧渲染耗时的目标上限
+        'SCALE_WINDOW': 30,             # 按最近多少帧的平均耗时决定是否调整
+        # 批量绘制多球时的细节层次：(球数下限, 光晕层数)，球越多层数越少
+        'GLOW_LOD': ((0, 8), (1000, 4), (3000, 2), (8000, 1)),
+        'SPLAT_MIN_BALLS': 40000        # 球数达到此值时改用 NumPy 直接合成光晕（固定开销较大，只在球很多时更快）
     },
+    # 物理使用固定步长，与渲染帧率解耦
+    'TIMESTEP': {
+        'PHYSICS_HZ': 60,             # 物理更新频率（步/秒）
+        'SUBSTEPS': 1,                # 每个物理步拆分的子步数
+        'MAX_STEPS_PER_FRAME': 5,     # 单帧最多追赶的步数，防止死亡螺旋
+        'INTERPOLATE': True           # 在最近两个物理状态之间插值绘制，物理频率低于帧率时也平滑
+    },
+    # 以下物理量均以秒为时间单位
     'PHYSICS': {
-        'GRAVITY': Vector2(0, 0.5),
+        'GRAVITY': Vector2(0, 1800),  # 像素/秒²（原 0.5 像素/帧²）
         'ELASTICITY': 0.8,
-        'FRICTION': 0.99,
-        'MAX_BALL_SPEED': 20.0,
-        'COLLISION_BUFFER': 14
+        'FRICTION': 0.99 ** 60,       # 每秒保留的速度比例（原每帧 0.99）
+        'MAX_BALL_SPEED': 1200.0,     # 像素/秒（原 20 像素/帧）
+        'COLLISION_BUFFER': 14,
+        'CONTINUOUS_COLLISION': False,  # 使用扫掠式连续碰撞检测
+        'MAX_IMPACTS_PER_STEP': 4,      # 连续碰撞检测时单步内最多处理的碰撞次数
+        'MIN_IMPACT_SPEED': 30.0,       # 低于此法向速度（像素/秒）的接触不计为碰撞
+        'ROTATING_FRAME': False,        # 在六边形的共转参考系中积分
+        'SLEEP_ENABLED': False,         # 多球模式下让静止贴墙的球休眠
+        'SLEEP_VELOCITY': 40.0,         # 相对墙壁的平均速度（像素/秒）低于此值视为静止
+        'SLEEP_STEPS': 30,              # 连续静止多少步后休眠
+        'SLEEP_CONTACT_SLACK': 10.0     # 所需的支撑力偏出接触方向超过此角度（度）时唤醒
+    },
+    # 分阶段的帧耗时统计（运行中按 F3 开关，F4 显示分位数）
+    'PROFILER': {
+        'ENABLED': False,
+        'CAPACITY': 600,              # 环形缓冲区保留的帧数
+        'OVERLAY': False,             # 在画面左上角显示各阶段的 p50/p95/p99
+        'DUMP_PATH': ''               # 退出时把缓冲区写到此文件（.csv 或 .json），为空则不写
+    },
+    # Prometheus 文本格式的指标导出（碰撞、速度截断、推出修正、缓存命中等）
+    'METRICS': {
+        'EXPORT_PATH': '',            # 定期写入此文件（供 node_exporter textfile 收集），为空则不写
+        'EXPORT_PORT': 0,             # 在 127.0.0.1 的此端口上提供 /metrics，为 0 则不开
+        'EXPORT_INTERVAL': 5.0        # 写文件的间隔（秒）
+    },
+    # 日志在后台线程中写出；同一条消息模板按时间窗口限流
+    'LOGGING': {
+        'LEVEL': 'INFO',
+        'RATE_LIMIT_BURST': 5,        # 每个窗口内同一条消息最多输出的条数
+        'RATE_LIMIT_PERIOD': 10.0     # 限流窗口（秒），被抑制的条数在下一个窗口开始时汇总输出
     },
     'COLORS': {
         'BACKGROUND': (20, 31, 31),
@@ -30,10 +77,12 @@ GAME_CONFIG: GameConfig = {
         ]
     },
     'HEXAGON': {
-        'MIN_ROTATION_SPEED': 0.5,
-        'MAX_ROTATION_SPEED': 5.0,
-        'ROTATION_ACCELERATION': 0.1,
-        'SPEED_CHANGE_INTERVAL': 60,
-        'INITIAL_SPEED': 2.0
+        'MIN_ROTATION_SPEED': 30.0,       # 度/秒（原 0.5 度/帧）
+        'MAX_ROTATION_SPEED': 300.0,      # 度/秒（原 5 度/帧）
+        'ROTATION_ACCELERATION': 6.32,    # 趋近目标速度的速率（1/秒，原每帧 0.1）
+        'SPEED_CHANGE_INTERVAL': 1.0,     # 秒（原 60 帧）
+        'INITIAL_SPEED': 120.0,           # 度/秒（原 2 度/帧）
+        'SPRITE_ANGLE_STEP': 0.25,        # 预渲染轮廓的角度量化步长（度）
+        'SPRITE_CACHE_MB': 64             # 预渲染轮廓缓存的内存上限
     }
 } 
\ No newline at end of file
@@ -0,0 +1,214 @@
+import os
+import queue
+import struct
+import sys
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pygame
+from config import GAME_CONFIG
+from game_engine import Renderer
+from typing import BinaryIO, Optional, Union
+
+
+class HeadlessRenderer(Renderer):
+    """离屏渲染器
+
+    使用 SDL 的 dummy 视频驱动，不打开窗口：screen 是普通的内存表面，
+    render() 之后直接从中读取像素。
+    """
+
+    def __init__(self, screen_size: tuple, render_scale: int, **kwargs):
+        if not pygame.display.get_init():
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
+            pygame.display.init()
+        # 导出的每一帧都要完整，不使用脏矩形和动态分辨率
+        kwargs.setdefault('dirty_rects', False)
+        kwargs.setdefault('adaptive_scale', False)
+        super().__init__(screen_size, render_scale, **kwargs)
+
+    def _create_screen(self) -> pygame.Surface:
+        return pygame.Surface(self.screen_size)
+
+    def _present(self, rects: Optional[list] = None):
+        pass
+
+
+class FramePool:
+    """可复用的 RGB 帧缓冲池
+
+    缓冲区在创建时一次分配好。acquire() 在没有空闲缓冲时阻塞，直到
+    写盘线程 release() 归还一块，因此内存占用固定为 count 帧。
+    """
+
+    def __init__(self, size: tuple, count: int = 8) -> None:
+        width, height = size
+        self.shape = (height, width, 3)
+        self._free = queue.Queue()
+        for _ in range(count):
+            self._free.put(np.empty(self.shape, dtype=np.uint8))
+
+    def acquire(self) -> np.ndarray:
+        return self._free.get()
+
+    def release(self, buffer: np.ndarray) -> None:
+        self._free.put(buffer)
+
+    def capture(self, surface: pygame.Surface) -> np.ndarray:
+        """取一块缓冲并复制 surface 的像素（按行存储的 RGB）"""
+        buffer = self.acquire()
+        pixels = pygame.surfarray.pixels3d(surface)
+        np.copyto(buffer, pixels.transpose(1, 0, 2))
+        del pixels  # 解除对表面的锁定
+        return buffer
+
+
+def encode_png(rgb: np.ndarray, compress_level: int = 6) -> bytes:
+    """把 (高, 宽, 3) 的 uint8 数组编码为 PNG
+
+    每行使用 None 滤波，数据整体交给 zlib 压缩。zlib 压缩时会释放 GIL，
+    多个线程可以同时编码。
+    """
+    height, width, _ = rgb.shape
+    rows = np.empty((height, width * 3 + 1), dtype=np.uint8)
+    rows[:, 0] = 0  # 每行开头的滤波类型
+    rows[:, 1:] = rgb.reshape(height, width * 3)
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return (struct.pack('>I', len(data)) + kind + data +
+                struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff))
+
+    # 8 位深度、RGB 真彩色、无隔行
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header) +
+            chunk(b'IDAT', zlib.compress(rows.tobytes(), compress_level)) +
+            chunk(b'IEND', b''))
+
+
+class _PooledWriter:
+    """从帧缓冲池取缓冲、交给线程池处理的公共部分
+
+    任务完成后缓冲归还到池中。后台任务出错时，异常会在下一次 write()
+    或 close() 时抛出。
+    """
+
+    def __init__(self, size: tuple, workers: int, pool_size: int) -> None:
+        self.pool = FramePool(size, pool_size)
+        self.count = 0
+        self._executor = ThreadPoolExecutor(max_workers=workers,
+                                            thread_name_prefix='frame-writer')
+        self._pending = []
+
+    def write(self, surface: pygame.Surface) -> None:
+        """复制 surface 的当前内容并排队写出，池中没有空闲缓冲时阻塞"""
+        self._collect()
+        buffer = self.pool.capture(surface)
+        self._pending.append(self._executor.submit(self._run, buffer, self.count))
+        self.count += 1
+
+    def _run(self, buffer: np.ndarray, index: int) -> None:
+        try:
+            self._write_frame(buffer, index)
+        finally:
+            self.pool.release(buffer)
+
+    def _write_frame(self, buffer: np.ndarray, index: int) -> None:
+        raise NotImplementedError
+
+    def _collect(self) -> None:
+        """清理已完成的任务，重新抛出其中的异常"""
+        pending = []
+        for future in self._pending:
+            if future.done():
+                future.result()
+            else:
+                pending.append(future)
+        self._pending = pending
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        futures, self._pending = self._pending, []
+        for future in futures:
+            future.result()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class PngSequenceWriter(_PooledWriter):
+    """把每帧编码为 PNG，写到 directory 下的 frame_000000.png、frame_000001.png……
+
+    编码在 workers 个线程中并行进行，帧的编号与写入顺序无关。
+    """
+
+    def __init__(self, directory: str, size: tuple, workers: int = 4, pool_size: int = 8,
+                 compress_level: int = 6, pattern: str = 'frame_{:06d}.png') -> None:
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.pattern = pattern
+        self.compress_level = compress_level
+        super().__init__(size, workers, pool_size)
+
+    def _write_frame(self, buffer: np.ndarray, index: int) -> None:
+        data = encode_png(buffer, self.compress_level)
+        with open(os.path.join(self.directory, self.pattern.format(index)), 'wb') as f:
+            f.write(data)
+
+
+class RawVideoWriter(_PooledWriter):
+    """按顺序把每帧的 RGB24 像素写入文件或管道
+
+    target 为路径、'-'（标准输出）或已打开的二进制流，例如 ffmpeg 的 stdin：
+    ffmpeg -f rawvideo -pix_fmt rgb24 -s 800x600 -r 60 -i - out.mp4
+    只用一个写线程，保证帧的顺序。
+    """
+
+    def __init__(self, target: Union[str, BinaryIO], size: tuple, pool_size: int = 8) -> None:
+        if target == '-':
+            self._stream, self._owns_stream = sys.stdout.buffer, False
+        elif isinstance(target, str):
+            self._stream, self._owns_stream = open(target, 'wb'), True
+        else:
+            self._stream, self._owns_stream = target, False
+        super().__init__(size, 1, pool_size)
+
+    def _write_frame(self, buffer: np.ndarray, index: int) -> None:
+        self._stream.write(buffer.data)
+
+    def close(self) -> None:
+        try:
+            super().close()
+        finally:
+            if self._owns_stream:
+                self._stream.close()
+            else:
+                self._stream.flush()
+
+
+def open_writer(target: str, size: tuple, **kwargs) -> _PooledWriter:
+    """'-' 或以 .rgb/.raw 结尾时写原始视频流，否则视为 PNG 序列的目录"""
+    if target == '-' or target.endswith(('.rgb', '.raw')):
+        return RawVideoWriter(target, size, **kwargs)
+    return PngSequenceWriter(target, size, **kwargs)
+
+
+def export_frames(game, writer: _PooledWriter, frames: int,
+                  renderer: Optional[Renderer] = None) -> int:
+    """每帧推进一个物理步并离屏渲染，把画面交给 writer，返回导出的帧数
+
+    不等待时钟，渲染速度只受 CPU 限制；导出的帧率等于物理频率。
+    """
+    if renderer is None:
+        renderer = HeadlessRenderer(
+            (GAME_CONFIG['WINDOW']['WIDTH'], GAME_CONFIG['WINDOW']['HEIGHT']),
+            GAME_CONFIG['WINDOW']['RENDER_SCALE'])
+    for _ in range(frames):
+        game.step()
+        if game.physics.rotating_frame:
+            game.physics.sync_to_world(game.ball, game.hexagon)
+        renderer.render([game.hexagon, game.ball])
+        writer.write(renderer.screen)
+    return frames
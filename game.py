@@ -1,15 +1,23 @@
+import argparse
 import pygame
 from pygame.math import Vector2
 from config import GAME_CONFIG
 from game_objects import Ball, Hexagon
-from game_engine import GameState, PhysicsEngine, Renderer
+from game_engine import FixedTimestep, GameState, PhysicsEngine, Renderer
+from pipeline import capture_snapshot, make_views
+from profiler import FrameProfiler
+from replay import FLAG_COLLISION, ReplayReader, ReplayWriter
+from utils import GlowSurfaceCache
+from typing import Optional
 import random
 
 class Game:
-    def __init__(self):
-        pygame.init()
+    def __init__(self, seed: Optional[int] = None, headless: bool = False):
+        # 无界面模式不初始化显示，只用于模拟和录制
+        if not headless:
+            pygame.init()
         self.state = GameState()
-        self.renderer = Renderer(
+        self.renderer = None if headless else Renderer(
             (GAME_CONFIG['WINDOW']['WIDTH'], GAME_CONFIG['WINDOW']['HEIGHT']),
             GAME_CONFIG['WINDOW']['RENDER_SCALE']
         )
@@ -19,9 +27,21 @@ class Game:
             GAME_CONFIG['PHYSICS']['FRICTION']
         )
         self.clock = pygame.time.Clock()
+        self.timestep = FixedTimestep(
+            GAME_CONFIG['TIMESTEP']['PHYSICS_HZ'],
+            GAME_CONFIG['TIMESTEP']['SUBSTEPS'],
+            GAME_CONFIG['TIMESTEP']['MAX_STEPS_PER_FRAME']
+        )
+        # 所有随机选择都来自这一个生成器，相同种子得到相同的运行
+        self.rng = random.Random(seed)
+        self.tick = 0
+        self.recorder: Optional[ReplayWriter] = None
         
         # 初始化游戏对象
         self._init_game_objects()
+        if not headless:
+            # 预先生成所有球颜色的发光精灵，碰撞换色时不必临时合成
+            GlowSurfaceCache.warm_up(self.ball.radius)
         
     def _init_game_objects(self):
         window_config = GAME_CONFIG['WINDOW']
@@ -33,37 +53,194 @@ class Game:
         self.hexagon = Hexagon(
             Vector2(window_config['WIDTH']//2, window_config['HEIGHT']//2),
             200,  # hex radius
-            GAME_CONFIG['COLORS']['HEXAGON']
+            GAME_CONFIG['COLORS']['HEXAGON'],
+            rng=self.rng
         )
         
-    def run(self):
+    def run(self, recorder: Optional[ReplayWriter] = None):
+        self.recorder = recorder
+        interpolate = GAME_CONFIG['TIMESTEP']['INTERPOLATE']
+        if interpolate:
+            # 保留最近两个物理状态，在绘制用的对象上按 alpha 插值
+            previous = current = capture_snapshot(self)
+            hexagon, ball = make_views(self)
+        profiler = FrameProfiler.get_profiler()
+        idle_timeout = GAME_CONFIG['WINDOW']['IDLE_TIMEOUT_MS']
+        self.clock.tick()
         while self.state.running:
-            # 处理事件
-            self.state.handle_events()
-            
-            # 只在非暂停状态更新物理
-            if not self.state.paused:
-                # 更新游戏状态
-                self.hexagon.update(GAME_CONFIG['HEXAGON']['ROTATION_ACCELERATION'])
-                collision = self.physics.update(self.ball, self.hexagon)
+            if self.state.paused:
+                # 暂停时不推进也不重绘，阻塞等待事件，几乎不占 CPU
+                redraw = self.state.wait_events(idle_timeout)
+                # 暂停的时长不计入帧耗时统计
+                profiler.reset_frame()
+                if not self.state.paused:
+                    # 恢复：丢弃暂停期间经过的时间，不追赶物理步
+                    self.timestep.reset()
+                    self.clock.tick()
+                if not redraw:
+                    continue
+                steps = 0
+            else:
+                # 处理事件
+                with profiler.scope('events'):
+                    self.state.handle_events()
+                redraw = False
                 
-                # 处理碰撞后的颜色变化
-                if collision:
-                    self._handle_collision()
-            
-            # 渲染总是进行
-            self.renderer.render([self.hexagon, self.ball])
-            self.clock.tick(GAME_CONFIG['WINDOW']['FPS'])
+                # 只在非暂停状态更新物理，按固定步长追赶本帧经过的时间
+                steps = 0
+                if not self.state.paused:
+                    frame_time = self.clock.get_time() / 1000.0
+                    steps = self.timestep.advance(frame_time)
+                for _ in range(steps):
+                    self.step()
+                    if interpolate:
+                        previous, current = current, capture_snapshot(self)
+                    
+            # 画面不变的帧不重绘、不提交；暂停中只需重新提交上一帧
+            if redraw and not self.renderer.overlay_active:
+                self.renderer.present_cached()
+            elif interpolate:
+                self.renderer.render_interpolated(previous, current, self.timestep.alpha,
+                                                  hexagon, ball, force=redraw)
+            elif steps or redraw or self.renderer.overlay_active:
+                # 共转参考系模式下只在渲染前换算回世界坐标
+                if self.physics.rotating_frame:
+                    self.physics.sync_to_world(self.ball, self.hexagon)
+                self.renderer.render([self.hexagon, self.ball])
+            with profiler.scope('wait'):
+                self.clock.tick(GAME_CONFIG['WINDOW']['FPS'])
+            profiler.end_frame()
             
+        self.recorder = None
+        if GAME_CONFIG['PROFILER']['DUMP_PATH'] and profiler.frames:
+            profiler.dump(GAME_CONFIG['PROFILER']['DUMP_PATH'])
         pygame.quit()
         
+    def run_headless(self, steps: int, recorder: Optional[ReplayWriter] = None):
+        """不渲染、不等待时钟，直接推进 steps 个物理步"""
+        self.recorder = recorder
+        for _ in range(steps):
+            self.step()
+        self.recorder = None
+        
+    def step(self):
+        """推进一个固定物理步（可拆分为多个子步），返回本步的 flags"""
+        dt = self.timestep.substep_dt
+        flags = 0
+        profiler = FrameProfiler.get_profiler()
+        for _ in range(self.timestep.substeps):
+            with profiler.scope('hexagon'):
+                self.hexagon.update(GAME_CONFIG['HEXAGON']['ROTATION_ACCELERATION'], dt)
+            with profiler.scope('physics'):
+                collision = self.physics.update(self.ball, self.hexagon, dt)
+            
+            # 处理碰撞后的颜色变化
+            if collision:
+                self._handle_collision()
+                flags |= FLAG_COLLISION
+                
+        self.tick += 1
+        if self.recorder is not None:
+            self.recorder.write(*self.snapshot(flags))
+        return flags
+            
+    def snapshot(self, flags: int = 0):
+        """本步结束时的状态：(tick, rotation, position, velocity, color_index, flags)"""
+        if self.physics.rotating_frame:
+            self.physics.sync_to_world(self.ball, self.hexagon)
+        return (
+            self.tick,
+            self.hexagon.rotation,
+            (self.ball.position.x, self.ball.position.y),
+            (self.ball.velocity.x, self.ball.velocity.y),
+            GAME_CONFIG['COLORS']['BALL_COLORS'].index(self.ball.color),
+            flags
+        )
+        
     def _handle_collision(self):
         """处理碰撞后的颜色变化"""
         current_color = self.ball.color
         available_colors = [c for c in GAME_CONFIG['COLORS']['BALL_COLORS'] 
                            if c != current_color]
-        self.ball.color = random.choice(available_colors)
-
+        self.ball.color = self.rng.choice(available_colors)
+        
+    def playback(self, path: str):
+        """按录制时的物理频率播放回放文件，不运行物理"""
+        with ReplayReader(path) as replay:
+            timestep = FixedTimestep(replay.physics_hz, 1, GAME_CONFIG['TIMESTEP']['MAX_STEPS_PER_FRAME'])
+            frame = 0
+            self.clock.tick()
+            while self.state.running and len(replay):
+                self.state.handle_events()
+                
+                if not self.state.paused:
+                    frame_time = self.clock.get_time() / 1000.0
+                    frame = min(frame + timestep.advance(frame_time), len(replay) - 1)
+                    
+                self.apply_frame(replay[frame])
+                self.renderer.render([self.hexagon, self.ball])
+                self.clock.tick(GAME_CONFIG['WINDOW']['FPS'])
+        pygame.quit()
+        
+    def apply_frame(self, record):
+        """用回放记录覆盖六边形和球的状态"""
+        self.tick = int(record['tick'])
+        self.hexagon.rotation = float(record['rotation'])
+        self.ball.position = Vector2(*record['position'])
+        self.ball.velocity = Vector2(*record['velocity'])
+        self.ball.color = GAME_CONFIG['COLORS']['BALL_COLORS'][record['color_index']]
+        
 if __name__ == "__main__":
-    game = Game()
-    game.run() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="旋转六边形与弹跳球")
+    parser.add_argument('--seed', type=int, help="随机种子，使运行可复现")
+    parser.add_argument('--record', metavar='PATH', help="把每个物理步录制到回放文件")
+    parser.add_argument('--replay', metavar='PATH', help="播放回放文件")
+    parser.add_argument('--pipelined', action='store_true', help="物理在后台线程中运行，与渲染重叠")
+    parser.add_argument('--export', metavar='TARGET',
+                        help="离屏渲染并导出：目录写 PNG 序列，.rgb/.raw 文件或 - 写原始 RGB 流")
+    parser.add_argument('--frames', type=int, default=600, help="导出的帧数")
+    parser.add_argument('--profile', metavar='PATH',
+                        help="统计每帧各阶段耗时，退出时写入 PATH（.csv 或 .json）")
+    parser.add_argument('--metrics', metavar='PATH', help="定期把指标以 Prometheus 文本格式写入 PATH")
+    parser.add_argument('--metrics-port', type=int, metavar='PORT',
+                        help="在 127.0.0.1:PORT/metrics 上提供指标")
+    args = parser.parse_args()
+    
+    if args.profile:
+        GAME_CONFIG['PROFILER']['DUMP_PATH'] = args.profile
+        FrameProfiler.get_profiler().enabled = True
+    
+    if args.export:
+        from frame_export import export_frames, open_writer
+        size = (GAME_CONFIG['WINDOW']['WIDTH'], GAME_CONFIG['WINDOW']['HEIGHT'])
+        with open_writer(args.export, size) as writer:
+            export_frames(Game(seed=args.seed, headless=True), writer, args.frames)
+        raise SystemExit
+    
+    metrics_config = GAME_CONFIG['METRICS']
+    metrics_path = args.metrics or metrics_config['EXPORT_PATH']
+    metrics_port = args.metrics_port or metrics_config['EXPORT_PORT']
+    exporter = None
+    if metrics_path or metrics_port:
+        from metrics import MetricsExporter
+        exporter = MetricsExporter(path=metrics_path or None, port=metrics_port or None,
+                                   interval=metrics_config['EXPORT_INTERVAL']).start()
+    
+    game = Game(seed=args.seed)
+    if args.pipelined:
+        from functools import partial
+        from pipeline import run_pipelined
+        run = partial(run_pipelined, game)
+    else:
+        run = game.run
+    try:
+        if args.replay:
+            game.playback(args.replay)
+        elif args.record:
+            with ReplayWriter(args.record, GAME_CONFIG['TIMESTEP']['PHYSICS_HZ']) as recorder:
+                run(recorder)
+        else:
+            run()
+    finally:
+        if exporter is not None:
+            exporter.stop()
@@ -3,12 +3,40 @@ from pygame.math import Vector2
 from config import GAME_CONFIG
 from game_objects import Ball, Hexagon
 import math
-from utils import point_in_polygon, get_closest_point_on_line
+import time
+import numpy as np
+from collections import deque
+from ball_system import (BallSystem, SleepState, as_array, centripetal_acceleration,
+                         clamp_speed, contain_in_polygon, force_in_contact_cone,
+                         grid_candidate_pairs, integrate,
+                         resolve_ball_collisions, resolve_wall_collisions)
+from utils import fixed_dt
 from logger import GameLogger
-from typing import Optional
+from metrics import MetricsRegistry
+from profiler import FrameProfiler
+from typing import Optional, Tuple
 
 logger = GameLogger.get_logger()
 
+# 物理与渲染的指标，热路径上每次只做一次加法
+_metrics = MetricsRegistry.get_registry()
+_COLLISIONS_HELP = "计入统计的碰撞次数（墙壁与球、球与球）"
+_CLAMPS_HELP = "速度超过 MAX_BALL_SPEED 被截断的次数，按位置区分"
+_PUSH_OUTS_HELP = "球嵌入墙壁后被推回的次数"
+_collisions = {path: _metrics.counter('physics_collisions_total', _COLLISIONS_HELP, path=path)
+               for path in ('discrete', 'rotating', 'continuous', 'batch')}
+_speed_clamps = {site: _metrics.counter('physics_speed_clamps_total', _CLAMPS_HELP, site=site)
+                 for site in ('pre_update', 'post_update', 'collision', 'rotating', 'continuous',
+                              'batch')}
+_push_outs = {path: _metrics.counter('physics_push_outs_total', _PUSH_OUTS_HELP, path=path)
+              for path in ('discrete', 'rotating', 'continuous', 'batch')}
+_update_errors = _metrics.counter('physics_update_errors_total',
+                                  "PhysicsEngine.update 中捕获的异常次数")
+
+# 空闲时收到这些事件需要重新提交画面：按键可能切换叠加层，其余为窗口被遮挡、缩放后重新显示
+REDRAW_EVENTS = frozenset((pygame.KEYDOWN, pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED,
+                           pygame.WINDOWSHOWN, pygame.WINDOWRESTORED, pygame.WINDOWSIZECHANGED))
+
 class GameState:
     def __init__(self):
         self.running = True
@@ -17,29 +45,124 @@ class GameState:
         
     def handle_events(self):
         for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                self.running = False
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE:
-                    self.paused = not self.paused
+            self._handle_event(event)
+
+    def wait_events(self, timeout_ms: int) -> bool:
+        """阻塞等待事件（最多 timeout_ms 毫秒）并处理，空闲时代替 handle_events
+
+        线程在 SDL 中睡眠，不占用 CPU。返回是否收到了需要重绘画面的事件
+        （按键、窗口重新显示等），超时返回 False。
+        """
+        event = pygame.event.wait(timeout_ms)
+        if event.type == pygame.NOEVENT:
+            return False
+        redraw = False
+        for event in [event] + pygame.event.get():
+            self._handle_event(event)
+            redraw = redraw or event.type in REDRAW_EVENTS
+        return redraw
+
+    def _handle_event(self, event):
+        if event.type == pygame.QUIT:
+            self.running = False
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_SPACE:
+                self.paused = not self.paused
+            elif event.key == pygame.K_F3:
+                FrameProfiler.get_profiler().toggle()
+            elif event.key == pygame.K_F4:
+                profiler = FrameProfiler.get_profiler()
+                profiler.overlay = not profiler.overlay
+                if profiler.overlay and not profiler.enabled:
+                    profiler.toggle()
+
+class FixedTimestep:
+    """固定步长的物理时钟
+
+    把每帧实际经过的时间累积起来，按固定的 dt 切分成若干物理步，
+    渲染帧率的变化不会影响物理结果。
+    """
+
+    def __init__(self, hz: float, substeps: int = 1, max_steps: int = 5):
+        self.dt = 1.0 / hz
+        self.substeps = max(1, substeps)
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.dropped_steps = 0  # 因超过上限而丢弃的步数
+
+    @property
+    def substep_dt(self) -> float:
+        return self.dt / self.substeps
+
+    @property
+    def alpha(self) -> float:
+        """剩余时间占一步的比例，可用于渲染插值"""
+        return self.accumulator / self.dt
+
+    def advance(self, frame_time: float) -> int:
+        """累积一帧的时间，返回本帧需要执行的物理步数"""
+        self.accumulator += frame_time
+        # 加一个极小量，避免 1/60 累加的舍入误差导致少算一步
+        steps = int((self.accumulator + 1e-9) // self.dt)
+        self.accumulator = max(0.0, self.accumulator - steps * self.dt)
+        if steps > self.max_steps:
+            # 死亡螺旋保护：丢弃追不上的时间
+            self.dropped_steps += steps - self.max_steps
+            steps = self.max_steps
+        return steps
+
+    def reset(self) -> None:
+        self.accumulator = 0.0
+
+class CoRotatingState:
+    """球在六边形共转参考系中的状态
+
+    position 相对六边形中心、velocity 为相对旋转系的速度，
+    omega 记录上一步的角速度（弧度/秒），用于计算欧拉力。
+    """
+    __slots__ = ('position', 'velocity', 'omega')
+
+    def __init__(self, position: Vector2, velocity: Vector2, omega: float):
+        self.position = position
+        self.velocity = velocity
+        self.omega = omega
 
 class PhysicsEngine:
-    def __init__(self, gravity: Vector2, elasticity: float, friction: float):
+    def __init__(self, gravity: Vector2, elasticity: float, friction: float,
+                 dt: Optional[float] = None):
         self.gravity = gravity
         self.elasticity = elasticity
         self.friction = friction
+        self.dt = fixed_dt() if dt is None else dt  # 默认物理步长（秒）
         self.state = GameState()  # 添加状态引用
+        self.ball_collisions = True  # 批量模式下是否处理球与球的碰撞
+        self.continuous = GAME_CONFIG['PHYSICS']['CONTINUOUS_COLLISION']
+        self.rotating_frame = GAME_CONFIG['PHYSICS']['ROTATING_FRAME']
+        self._local_geometry = {}  # 共转参考系下静止的六边形，按半径缓存
+        self.sleeping = GAME_CONFIG['PHYSICS']['SLEEP_ENABLED']
+        # 休眠统计（累计）：入睡次数、唤醒次数、跳过的单球更新次数
+        self.sleep_events = 0
+        self.wake_events = 0
+        self.skipped_updates = 0
         
-    def update(self, ball: Ball, hexagon: Optional[Hexagon]) -> bool:
+    def update(self, ball: Ball, hexagon: Optional[Hexagon],
+               dt: Optional[float] = None) -> bool:
         try:
             if not ball:
                 return False
+            if dt is None:
+                dt = self.dt
                 
             if not self.state.paused:
+                # 共转参考系模式：墙壁静止，不需要向心力近似
+                if self.rotating_frame and hexagon:
+                    return self._update_rotating(ball, hexagon, dt)
+                
                 # 速度限制
                 if ball.velocity.length() > GAME_CONFIG['PHYSICS']['MAX_BALL_SPEED']:
                     ball.velocity = (ball.velocity.normalize() * 
                                    GAME_CONFIG['PHYSICS']['MAX_BALL_SPEED'])
+                    _speed_clamps['pre_update'].inc()
                 
                 # 计算向心力
                 centripetal_force = Vector2(0, 0)  # 默认无向心力
@@ -49,26 +172,293 @@ class PhysicsEngine:
                         hexagon.rotation_speed
                     )
                 
+                # 连续碰撞检测：只更新速度，位置由扫掠求解推进
+                if self.continuous and hexagon:
+                    ball.apply_forces(self.gravity + centripetal_force, self.friction, dt)
+                    return self._sweep_collision(ball, hexagon, dt) > 0
+                
                 # 更新球的物理状态
-                ball.update(self.gravity + centripetal_force, self.friction)
+                ball.update(self.gravity + centripetal_force, self.friction, dt)
                 
                 # 再次检查速度限制（因为更新可能导致速度变化）
                 if ball.velocity.length() > GAME_CONFIG['PHYSICS']['MAX_BALL_SPEED']:
                     ball.velocity = (ball.velocity.normalize() * 
                                    GAME_CONFIG['PHYSICS']['MAX_BALL_SPEED'])
+                    _speed_clamps['post_update'].inc()
                 
                 # 只在有六边形时进行碰撞检测
                 if hexagon:
-                    return self._handle_collision(ball, hexagon)
+                    return self._handle_collision(ball, hexagon, dt)
                 
             return True
                 
         except Exception as e:
-            logger.error(f"Physics update error: {e}")
+            _update_errors.inc()
+            # 惰性格式化：消息模板不变，限流按模板分组，格式化在日志线程中进行
+            logger.error("Physics update error: %s", e)
             return False
         
+    def update_system(self, system: BallSystem, hexagon: Optional[Hexagon],
+                      dt: Optional[float] = None) -> np.ndarray:
+        """批量更新 BallSystem 中的所有球，返回发生碰撞的掩码
+
+        逐步骤与 update() 一致，只是以整体数组运算代替逐球的 Vector2 计算。
+        """
+        collided = np.zeros(len(system), dtype=bool)
+        if self.state.paused or len(system) == 0:
+            return collided
+
+        if dt is None:
+            dt = self.dt
+        max_speed = GAME_CONFIG['PHYSICS']['MAX_BALL_SPEED']
+        positions = system.positions
+        velocities = system.velocities
+        radii = system.radii
+
+        # 休眠模式下只对醒着的球积分和处理墙壁碰撞（active 为它们的下标）
+        active = self._update_sleeping(system, hexagon) if self.sleeping and hexagon else None
+        if active is not None:
+            positions, velocities, radii = positions[active], velocities[active], radii[active]
+
+        # 速度限制
+        clamped = int(np.count_nonzero(clamp_speed(velocities, max_speed)))
+
+        # 重力与向心力
+        acceleration = as_array(self.gravity)
+        if hexagon:
+            center = as_array(hexagon.position)
+            acceleration = acceleration + centripetal_acceleration(
+                positions, center, hexagon.rotation_speed)
+
+        clamped += integrate(positions, velocities, acceleration, self.friction, max_speed, dt)
+        if active is not None:
+            system.positions[active] = positions
+            system.velocities[active] = velocities
+
+        # 球与球的碰撞，先于墙壁处理，让墙壁的反弹和推出修正最后生效
+        if self.ball_collisions:
+            pairs_i, pairs_j = self.find_ball_pairs(system, hexagon)
+            if active is not None:
+                # 两个都在休眠的球对不需要处理
+                asleep = system.sleep.asleep
+                keep = ~(asleep[pairs_i] & asleep[pairs_j])
+                pairs_i, pairs_j = pairs_i[keep], pairs_j[keep]
+                sleeping = np.flatnonzero(asleep)
+                before = system.velocities[sleeping]
+            collided |= resolve_ball_collisions(
+                system.positions, system.velocities, system.radii, pairs_i, pairs_j, self.elasticity)
+            if active is not None and len(sleeping):
+                # 只是挨着不会唤醒；被撞得速度明显变化的休眠球，撞击也要由它的接触承受，
+                # 承受不住（例如从墙边被撞开）时才醒来
+                change = system.velocities[sleeping] - before
+                struck = (np.hypot(change[:, 0], change[:, 1]) >
+                          GAME_CONFIG['PHYSICS']['SLEEP_VELOCITY'])
+                if struck.any():
+                    struck_index = sleeping[struck]
+                    held = self._contact_holds(system, hexagon, struck_index, change[struck] / dt)
+                    hit = np.zeros(len(system), dtype=bool)
+                    hit[struck_index[~held]] = True
+                    self._wake(system.sleep, hit)
+
+        if hexagon:
+            vertices = np.array(hexagon.geometry().vertices)
+            if active is None:
+                walls = resolve_wall_collisions(
+                    system.positions, system.velocities, radii, vertices, center,
+                    hexagon.rotation_speed, self.elasticity, max_speed, dt)
+                collided |= walls.collided
+            else:
+                positions, velocities = system.positions[active], system.velocities[active]
+                walls = resolve_wall_collisions(
+                    positions, velocities, radii, vertices, center,
+                    hexagon.rotation_speed, self.elasticity, max_speed, dt)
+                collided[active] |= walls.collided
+                system.positions[active] = positions
+                system.velocities[active] = velocities
+                self._update_rest(system, hexagon, active, dt)
+            clamped += walls.clamped
+            _push_outs['batch'].inc(walls.pushed)
+            if self.ball_collisions:
+                # 球间的位置修正可能把球挤到墙外，墙壁碰撞只推回刚越过墙的球，
+                # 最后把所有中心推回六边形内
+                pushed = contain_in_polygon(system.positions, system.radii, hexagon.geometry())
+                _push_outs['batch'].inc(int(np.count_nonzero(pushed)))
+        _speed_clamps['batch'].inc(clamped)
+        _collisions['batch'].inc(int(np.count_nonzero(collided)))
+        return collided
+
+    def _update_sleeping(self, system: BallSystem, hexagon: Hexagon) -> np.ndarray:
+        """唤醒需要醒来的球，让其余休眠的球跟随墙壁转动，返回醒着的球的下标"""
+        sleep = system.sleep
+        if sleep is None or len(sleep) != len(system):
+            # 第一次使用或球数变化时全部从醒着开始
+            sleep = system.sleep = SleepState(len(system))
+
+        if sleep.asleep.any():
+            # 休眠的球固定在六边形局部坐标系中，速度等于该处的墙速
+            sleeping = np.flatnonzero(sleep.asleep)
+            theta = math.radians(hexagon.rotation)
+            cos, sin = math.cos(theta), math.sin(theta)
+            local = sleep.local[sleeping]
+            offset = np.stack([local[:, 0] * cos - local[:, 1] * sin,
+                               local[:, 0] * sin + local[:, 1] * cos], axis=1)
+            omega = math.radians(hexagon.rotation_speed)
+            system.positions[sleeping] = as_array(hexagon.position) + offset
+            system.velocities[sleeping] = omega * np.stack([-offset[:, 1], offset[:, 0]], axis=1)
+
+            # 接触托不住的球醒来，本步照常积分
+            held = self._contact_holds(system, hexagon, sleeping)
+            wake = np.zeros(len(system), dtype=bool)
+            wake[sleeping[~held]] = True
+            self._wake(sleep, wake)
+            self.skipped_updates += int(np.count_nonzero(held))
+
+        return np.flatnonzero(~sleep.asleep)
+
+    def _update_rest(self, system: BallSystem, hexagon: Hexagon,
+                     active: np.ndarray, dt: float) -> None:
+        """更新醒着的球的静止计数，连续静止 SLEEP_STEPS 步的球入睡
+
+        贴墙的球会因推出修正而持续小幅弹跳，瞬时速度并不小，因此用局部坐标系中
+        相对参照点的位移判断：SLEEP_STEPS 步内始终不超过 SLEEP_VELOCITY 对应的
+        距离，即相对墙壁的平均速度低于阈值。球心在墙内 r + border 的范围内陷入、
+        推出是墙壁碰撞本身的来回，沿最近墙壁法线方向的位移扣除这一段后再比较。
+        """
+        physics = GAME_CONFIG['PHYSICS']
+        sleep = system.sleep
+        steps = physics['SLEEP_STEPS']
+        tolerance = physics['SLEEP_VELOCITY'] * steps * dt
+        border = 4
+
+        center = as_array(hexagon.position)
+        theta = math.radians(hexagon.rotation)
+        cos, sin = math.cos(theta), math.sin(theta)
+        offset = system.positions[active] - center
+        local = np.stack([offset[:, 0] * cos + offset[:, 1] * sin,
+                          -offset[:, 0] * sin + offset[:, 1] * cos], axis=1)
+
+        geometry = hexagon.geometry()
+        distances = geometry.edge_distances_many(system.positions[active])
+        nearest = np.argmin(distances, axis=1)
+        rows = np.arange(len(active))
+        gap = distances[rows, nearest] - system.radii[active] - border
+        touching = gap < tolerance
+
+        rest = sleep.rest_steps[active]
+        moved = local - sleep.anchor[active]
+        # 最近墙壁的法线换算到局部坐标系，分成沿法线和沿墙面的位移
+        normal = np.array(geometry.normals)[nearest]
+        normal = np.stack([normal[:, 0] * cos + normal[:, 1] * sin,
+                           -normal[:, 0] * sin + normal[:, 1] * cos], axis=1)
+        along = np.sum(moved * normal, axis=1)
+        sliding = moved - along[:, None] * normal
+        bounce = np.maximum(np.abs(along) - system.radii[active] - border, 0.0)
+        drift = np.hypot(np.hypot(sliding[:, 0], sliding[:, 1]), bounce)
+        reset = ~touching | ((rest > 0) & (drift > tolerance))
+        fresh = reset | (rest == 0)
+        sleep.anchor[active[fresh]] = local[fresh]
+        rest = np.where(reset, 0, rest + 1)
+        sleep.rest_steps[active] = rest
+
+        falling = rest >= steps
+        if not falling.any():
+            return
+        # 接触托不住的球即使暂时静止也不休眠，否则下一步就会醒来
+        falling[falling] = self._contact_holds(system, hexagon, active[falling])
+        if not falling.any():
+            return
+        index = active[falling]
+        # 贴到推出修正后的位置上休眠，并换算为局部坐标
+        normals = np.array(geometry.normals)[nearest[falling]]
+        system.positions[index] -= normals * gap[falling][:, None]
+        offset = system.positions[index] - center
+        sleep.local[index] = np.stack([offset[:, 0] * cos + offset[:, 1] * sin,
+                                       -offset[:, 0] * sin + offset[:, 1] * cos], axis=1)
+        omega = math.radians(hexagon.rotation_speed)
+        system.velocities[index] = omega * np.stack([-offset[:, 1], offset[:, 0]], axis=1)
+        sleep.asleep[index] = True
+        self.sleep_events += len(index)
+
+    def _contact_holds(self, system: BallSystem, hexagon: Hexagon, index: np.ndarray,
+                       struck: Optional[np.ndarray] = None) -> np.ndarray:
+        """接触能否让 index 中的球继续跟随六边形转动
+
+        跟随转动的球需要的加速度为 -ω²r + α×r，扣除重力、向心力和被撞击的加速度
+        struck 后的部分由接触提供。墙壁碰撞不计摩擦，墙壁只能沿内法线推球，挨着的球
+        只能沿连心线推球：所需的力落在这些方向张成的锥内（放宽 SLEEP_CONTACT_SLACK 度）
+        时才托得住，否则球会滑开或离开墙面。六边形一直在转，但贴在角落里、被离心力
+        压在墙上或被球堆托住的球可以一直跟着转。
+        """
+        border = 4
+        positions = system.positions[index]
+        center = as_array(hexagon.position)
+        offset = positions - center
+        omega = math.radians(hexagon.rotation_speed)
+        # Hexagon.update 按指数趋近目标速度，角加速度为 k·(目标 - 当前)
+        alpha = math.radians(GAME_CONFIG['HEXAGON']['ROTATION_ACCELERATION'] *
+                             (hexagon.target_rotation_speed - hexagon.rotation_speed))
+        required = -omega ** 2 * offset + alpha * np.stack([-offset[:, 1], offset[:, 0]], axis=1)
+        force = required - as_array(self.gravity) - centripetal_acceleration(
+            positions, center, hexagon.rotation_speed)
+        if struck is not None:
+            force -= struck
+
+        # 墙壁接触：沿内法线
+        geometry = hexagon.geometry()
+        gaps = geometry.edge_distances_many(positions) - system.radii[index][:, None] - border
+        rows, edges = np.nonzero(gaps < border)
+        all_rows = [rows]
+        all_directions = [np.array(geometry.normals)[edges].reshape(-1, 2)]
+
+        # 球与球的接触：从邻球指向本球
+        if self.ball_collisions:
+            row_of = np.full(len(system), -1)
+            row_of[index] = np.arange(len(index))
+            pairs_i, pairs_j = self.find_ball_pairs(system, hexagon)
+            delta = system.positions[pairs_i] - system.positions[pairs_j]
+            dist = np.hypot(delta[:, 0], delta[:, 1])
+            near = (dist > 0) & (dist < system.radii[pairs_i] + system.radii[pairs_j] + border)
+            for ball, sign in ((pairs_i, 1.0), (pairs_j, -1.0)):
+                keep = near & (row_of[ball] >= 0)
+                all_rows.append(row_of[ball[keep]])
+                all_directions.append(sign * delta[keep] / dist[keep][:, None])
+
+        slack = math.radians(GAME_CONFIG['PHYSICS']['SLEEP_CONTACT_SLACK'])
+        return force_in_contact_cone(force, np.concatenate(all_rows),
+                                     np.concatenate(all_directions), slack)
+
+    def _wake(self, sleep: SleepState, mask: np.ndarray) -> None:
+        """唤醒 mask 中的球，静止计数从零开始"""
+        if mask.any():
+            sleep.asleep[mask] = False
+            sleep.rest_steps[mask] = 0
+            self.wake_events += int(mask.sum())
+
+    def sleep_stats(self, system: BallSystem) -> dict:
+        """当前休眠球数与累计的入睡、唤醒和跳过的更新次数"""
+        asleep = int(system.sleep.asleep.sum()) if system.sleep is not None else 0
+        return {
+            'asleep': asleep,
+            'awake': len(system) - asleep,
+            'sleep_events': self.sleep_events,
+            'wake_events': self.wake_events,
+            'skipped_updates': self.skipped_updates,
+        }
+
+    def find_ball_pairs(self, system: BallSystem,
+                        hexagon: Optional[Hexagon]) -> Tuple[np.ndarray, np.ndarray]:
+        """用均匀网格找出可能相撞的球对，网格范围取六边形的外接正方形"""
+        if hexagon:
+            center = as_array(hexagon.position)
+            bounds_min = center - hexagon.radius
+            bounds_max = center + hexagon.radius
+        else:
+            bounds_min = system.positions.min(axis=0)
+            bounds_max = system.positions.max(axis=0)
+        return grid_candidate_pairs(system.positions, system.radii, bounds_min, bounds_max)
+
     def _calculate_centripetal_force(self, pos, rotation_speed):
-        """计算向心力"""
+        """计算向心加速度（rotation_speed 单位为度/秒）"""
         from config import GAME_CONFIG
         
         hex_center = Vector2(GAME_CONFIG['WINDOW']['WIDTH'] // 2, 
@@ -82,88 +472,529 @@ class PhysicsEngine:
         centripetal_acc = (angular_velocity ** 2) * r_length
         return -r.normalize() * centripetal_acc * 0.1
         
-    def _handle_collision(self, ball, hexagon):
+    def _handle_collision(self, ball, hexagon, dt):
         """处理碰撞"""
         from config import GAME_CONFIG
         
-        next_pos = ball.position + ball.velocity
-        hex_points = hexagon.get_points()
+        next_pos = ball.position + ball.velocity * dt
+        # 使用六边形当前角度的几何快照：法线、偏移和中心都已预先算好
+        container = hexagon.geometry()
         
-        if not point_in_polygon((next_pos.x, next_pos.y), hex_points):
-            min_dist = float('inf')
-            closest_point = None
-            normal = None
+        if not container.contains(next_pos):
+            index, closest, min_dist = container.closest_edge(next_pos)
+            closest_point = Vector2(closest)
+            normal = Vector2(container.normals[index])
+
+            hex_center = container.center
+            radius_vec = closest_point - hex_center
             
-            for i in range(len(hex_points)):
-                line_start = Vector2(hex_points[i])
-                line_end = Vector2(hex_points[(i + 1) % len(hex_points)])
-                
-                closest = get_closest_point_on_line((next_pos.x, next_pos.y), 
-                                                  line_start, line_end)
-                dist = (next_pos - closest).length()
-                
-                if dist < min_dist:
-                    min_dist = dist
-                    closest_point = closest
-                    wall_vec = line_end - line_start
-                    normal = Vector2(-wall_vec.y, wall_vec.x).normalize()
-
-            if closest_point is not None:
-                hex_center = Vector2(GAME_CONFIG['WINDOW']['WIDTH'] // 2, 
-                                   GAME_CONFIG['WINDOW']['HEIGHT'] // 2)
-                radius_vec = closest_point - hex_center
-                
-                if radius_vec.length() == 0:
-                    return False
-                    
-                tangential_speed = (math.radians(abs(hexagon.rotation_speed)) * 
-                                  radius_vec.length() * 
-                                  (hexagon.rotation_speed / abs(hexagon.rotation_speed)))
-                tangent = Vector2(-radius_vec.y, radius_vec.x).normalize()
-                wall_vel = tangent * tangential_speed
-                
-                rel_vel = ball.velocity - wall_vel
-                reflection = rel_vel.reflect(normal)
-                ball.velocity = wall_vel + reflection * self.elasticity
+            if radius_vec.length() == 0:
+                return False
                 
-                if ball.velocity.length() > GAME_CONFIG['PHYSICS']['MAX_BALL_SPEED']:
-                    ball.velocity = (ball.velocity.normalize() * 
-                                   GAME_CONFIG['PHYSICS']['MAX_BALL_SPEED'])
+            tangential_speed = (math.radians(abs(hexagon.rotation_speed)) * 
+                              radius_vec.length() * 
+                              (hexagon.rotation_speed / abs(hexagon.rotation_speed)))
+            tangent = Vector2(-radius_vec.y, radius_vec.x).normalize()
+            wall_vel = tangent * tangential_speed
+            
+            rel_vel = ball.velocity - wall_vel
+            reflection = rel_vel.reflect(normal)
+            ball.velocity = wall_vel + reflection * self.elasticity
+            
+            if ball.velocity.length() > GAME_CONFIG['PHYSICS']['MAX_BALL_SPEED']:
+                ball.velocity = (ball.velocity.normalize() * 
+                               GAME_CONFIG['PHYSICS']['MAX_BALL_SPEED'])
+                _speed_clamps['collision'].inc()
+            
+            collision_buffer = ball.radius + 4  # HEX_BORDER_WIDTH/2
+            push_distance = collision_buffer - min_dist
+            if push_distance > 0:
+                ball.position = next_pos + normal * push_distance
+                _push_outs['discrete'].inc()
                 
-                collision_buffer = ball.radius + 4  # HEX_BORDER_WIDTH/2
-                push_distance = collision_buffer - min_dist
-                if push_distance > 0:
-                    ball.position = next_pos + normal * push_distance
-                    
-                return True
+            _collisions['discrete'].inc()
+            return True
                 
         return False
 
+    def _update_rotating(self, ball, hexagon, dt) -> bool:
+        """在六边形的共转参考系中推进一步
+
+        旋转系中的加速度为
+            a' = R(-θ)g + 摩擦 - 2ω×v' + ω²r' - ω̇×r'
+        依次是重力、作用于惯性系速度的摩擦、科里奥利力、离心力和欧拉力。
+        墙壁在此参考系中静止，几何只需计算一次。位置只在 sync_to_world 时
+        才转换回世界坐标。
+        """
+        max_speed = GAME_CONFIG['PHYSICS']['MAX_BALL_SPEED']
+        state = self._get_frame_state(ball, hexagon)
+        omega = math.radians(hexagon.rotation_speed)
+        omega_dot = (omega - state.omega) / dt
+        state.omega = omega
+        
+        r = state.position
+        v = state.velocity
+        # ω×x 在二维中为 ω·(-x.y, x.x)
+        spin_r = Vector2(-r.y, r.x)
+        inertial_vel = v + spin_r * omega
+        gravity = self.gravity.rotate_rad(-math.radians(hexagon.rotation))
+        drag = inertial_vel * math.log(self.friction)
+        coriolis = Vector2(-v.y, v.x) * (-2 * omega)
+        centrifugal = r * (omega * omega)
+        euler = spin_r * (-omega_dot)
+        v = v + (gravity + drag + coriolis + centrifugal + euler) * dt
+        
+        # 速度限制作用于惯性系速度
+        inertial_vel = v + spin_r * omega
+        if inertial_vel.length() > max_speed:
+            v = inertial_vel.normalize() * max_speed - spin_r * omega
+            _speed_clamps['rotating'].inc()
+        r = r + v * dt
+        
+        # 与静止墙壁的碰撞
+        collided = False
+        geometry = self._get_local_geometry(hexagon.radius)
+        buffer = ball.radius + 4
+        for (nx, ny), offset in zip(geometry.normals, geometry.offsets):
+            depth = buffer - (nx * r.x + ny * r.y - offset)
+            if depth > 0:
+                normal = Vector2(nx, ny)
+                if v.dot(normal) < 0:
+                    v = v.reflect(normal) * self.elasticity
+                    collided = True
+                r = r + normal * depth
+                _push_outs['rotating'].inc()
+        
+        state.position = r
+        state.velocity = v
+        if collided:
+            _collisions['rotating'].inc()
+        return collided
+
+    def _get_frame_state(self, ball, hexagon) -> CoRotatingState:
+        """取出球的共转参考系状态，第一次使用时由世界坐标换算"""
+        if ball.frame_state is None:
+            theta = math.radians(hexagon.rotation)
+            omega = math.radians(hexagon.rotation_speed)
+            r = (ball.position - hexagon.position).rotate_rad(-theta)
+            v = ball.velocity.rotate_rad(-theta) - Vector2(-r.y, r.x) * omega
+            ball.frame_state = CoRotatingState(r, v, omega)
+        return ball.frame_state
+
+    def _get_local_geometry(self, radius):
+        """共转参考系中以原点为中心、角度为零的六边形"""
+        if radius not in self._local_geometry:
+            from geometry import ConvexPolygon
+            self._local_geometry[radius] = ConvexPolygon.regular((0.0, 0.0), radius, 6, 0.0)
+        return self._local_geometry[radius]
+
+    def sync_to_world(self, ball, hexagon) -> None:
+        """把共转参考系中的状态转换回世界坐标（渲染前调用）"""
+        state = ball.frame_state
+        if state is None:
+            return
+        theta = math.radians(hexagon.rotation)
+        omega = math.radians(hexagon.rotation_speed)
+        r = state.position
+        ball.position = hexagon.position + r.rotate_rad(theta)
+        ball.velocity = (state.velocity + Vector2(-r.y, r.x) * omega).rotate_rad(theta)
+
+    def _sweep_collision(self, ball, hexagon, dt) -> int:
+        """连续碰撞检测：在整个时间步内扫掠球与旋转的墙壁
+
+        墙壁在步内按 rotation_speed 匀速转动（hexagon.rotation 已是步末角度），
+        逐次求首次接触时间并反弹，直到用完本步时间或达到单步碰撞上限。
+        返回计入统计的碰撞次数。
+        """
+        physics_config = GAME_CONFIG['PHYSICS']
+        max_speed = physics_config['MAX_BALL_SPEED']
+        min_impact_speed = physics_config['MIN_IMPACT_SPEED']
+        
+        omega = math.radians(hexagon.rotation_speed)
+        inradius = hexagon.radius * math.cos(math.pi / 6)
+        buffer = ball.radius + 4  # 与离散检测的推出距离一致
+        position = ball.position - hexagon.position
+        velocity = ball.velocity
+        angle = math.radians(hexagon.rotation) - omega * dt  # 步开始时的墙壁角度
+        remaining = dt
+        impacts = 0
+        resolved = 0
+        
+        while remaining > 0 and resolved < physics_config['MAX_IMPACTS_PER_STEP']:
+            hit = self._time_of_impact(position, velocity, angle, omega,
+                                       inradius, buffer, remaining)
+            if hit is None:
+                break
+            t, edge = hit
+            position += velocity * t
+            angle += omega * t
+            remaining -= t
+            
+            # 接触边的外法线，墙面上对应点的切向速度 ω × r
+            phi = angle + math.radians(edge * 60 + 30)
+            outward = Vector2(math.cos(phi), math.sin(phi))
+            normal = -outward
+            wall_point = position + outward * (inradius - position.dot(outward))
+            wall_vel = Vector2(-wall_point.y, wall_point.x) * omega
+            
+            rel_vel = velocity - wall_vel
+            approach_speed = -rel_vel.dot(normal)
+            if approach_speed > 0:
+                velocity = wall_vel + rel_vel.reflect(normal) * self.elasticity
+                if velocity.length() > max_speed:
+                    velocity = velocity.normalize() * max_speed
+                    _speed_clamps['continuous'].inc()
+                if approach_speed >= min_impact_speed:
+                    impacts += 1
+            resolved += 1
+        
+        position += velocity * remaining
+        angle += omega * remaining
+        
+        # 数值兜底：把仍在墙内的球推回有效区域
+        for edge in range(6):
+            phi = angle + math.radians(edge * 60 + 30)
+            outward = Vector2(math.cos(phi), math.sin(phi))
+            depth = position.dot(outward) - (inradius - buffer)
+            if depth > 0:
+                position -= outward * depth
+                _push_outs['continuous'].inc()
+        
+        ball.position = position + hexagon.position
+        ball.velocity = velocity
+        _collisions['continuous'].inc(impacts)
+        return impacts
+
+    @staticmethod
+    def _time_of_impact(position, velocity, angle, omega, inradius, buffer, duration):
+        """求球心到任一旋转边的距离降到 buffer 的最早时间
+
+        第 k 条边到球心的有向距离为 d_k(t) = a - (p + v t)·u(θ + ω t + 60k + 30)，
+        对每条边分段采样寻找变号区间后二分。返回 (t, 边序号) 或 None。
+        """
+        px, py = position.x, position.y
+        vx, vy = velocity.x, velocity.y
+        speed = math.hypot(vx, vy)
+        reach = math.hypot(px, py) + speed * duration
+        travel = (speed + abs(omega) * reach) * duration
+        samples = max(1, min(64, math.ceil(travel / (0.5 * buffer))))
+        eps = 1e-6
+        
+        best = None
+        for edge in range(6):
+            base = angle + math.radians(edge * 60 + 30)
+            
+            def gap(t):
+                phi = base + omega * t
+                return (inradius - buffer
+                        - (px + vx * t) * math.cos(phi) - (py + vy * t) * math.sin(phi))
+            
+            if gap(0.0) <= eps:
+                # 已接触：只有相对墙面正在靠近时才算碰撞
+                ux, uy = math.cos(base), math.sin(base)
+                rate = vx * ux + vy * uy + omega * (py * ux - px * uy)
+                if rate > 0:
+                    return 0.0, edge
+                continue
+            
+            t_prev = 0.0
+            limit = duration if best is None else best[0]
+            for j in range(1, samples + 1):
+                t = duration * j / samples
+                if t_prev >= limit:
+                    break
+                if gap(t) <= 0:
+                    lo, hi = t_prev, t
+                    for _ in range(40):
+                        mid = 0.5 * (lo + hi)
+                        if gap(mid) > 0:
+                            lo = mid
+                        else:
+                            hi = mid
+                        if hi - lo < 1e-9:
+                            break
+                    if best is None or lo < best[0]:
+                        best = (lo, edge)
+                    break
+                t_prev = t
+        return best
+
+def lerp_angle(start: float, end: float, alpha: float) -> float:
+    """沿较短的方向在两个角度（度）之间插值，结果在 [0, 360) 内"""
+    delta = (end - start + 180.0) % 360.0 - 180.0
+    return (start + delta * alpha) % 360.0
+
+# 可选的抗锯齿方式：
+#   supersample        整帧以 render_scale 倍绘制，再整体 smoothscale 缩小
+#   gfxdraw            原始分辨率下直接用 pygame.gfxdraw 的抗锯齿图元绘制
+#   local_supersample  只对每个物体自己的精灵做超采样并缓存缩小结果，按原始分辨率合成
+AA_STRATEGIES = ('supersample', 'gfxdraw', 'local_supersample')
+
+class ResolutionController:
+    """按最近若干帧的渲染耗时，在 [min_scale, max_scale] 之间逐档调整渲染倍数
+
+    超采样的开销大致与倍数的平方成正比。窗口内平均耗时超过预算时降一档；
+    按平方关系估算升一档后的耗时仍低于预算的 headroom 倍时才升一档，
+    两个阈值之间的空档避免在相邻两档之间来回切换。每次调整后清空样本，
+    在新倍数下攒满一个窗口再做下一次判断。
+    """
+
+    def __init__(self, min_scale: float, max_scale: float, step: float, budget: float,
+                 window: int = 30, headroom: float = 0.8):
+        levels = [max_scale]
+        while levels[-1] - step >= min_scale - 1e-9:
+            levels.append(round(levels[-1] - step, 6))
+        if levels[-1] > min_scale:
+            levels.append(min_scale)
+        self.levels = levels[::-1]
+        self.index = len(self.levels) - 1  # 从最高倍数开始
+        self.budget = budget
+        self.headroom = headroom
+        self.samples = deque(maxlen=max(1, window))
+        self.changes = 0
+
+    @property
+    def scale(self) -> float:
+        return self.levels[self.index]
+
+    def record(self, frame_time: float) -> bool:
+        """记录一帧的耗时（秒），倍数因此改变时返回 True"""
+        self.samples.append(frame_time)
+        if len(self.samples) < self.samples.maxlen:
+            return False
+        mean = sum(self.samples) / len(self.samples)
+        if mean > self.budget and self.index > 0:
+            self.index -= 1
+        elif self.index < len(self.levels) - 1:
+            ratio = self.levels[self.index + 1] / self.scale
+            if mean * ratio * ratio >= self.budget * self.headroom:
+                return False
+            self.index += 1
+        else:
+            return False
+        self.samples.clear()
+        self.changes += 1
+        return True
+
 class Renderer:
-    def __init__(self, screen_size: tuple, render_scale: int):
+    # 每种抗锯齿方式保留最近多少帧的耗时
+    COST_WINDOW = 240
+
+    def __init__(self, screen_size: tuple, render_scale: int, dirty_rects: Optional[bool] = None,
+                 aa_strategy: Optional[str] = None, adaptive_scale: Optional[bool] = None):
         self.screen_size = screen_size
         self.render_scale = render_scale
-        self.screen = pygame.display.set_mode(screen_size, pygame.HWSURFACE | pygame.DOUBLEBUF)
+        self.aa_strategy = GAME_CONFIG['WINDOW']['AA_STRATEGY'] if aa_strategy is None else aa_strategy
+        if self.aa_strategy not in AA_STRATEGIES:
+            raise ValueError(f"Unknown AA strategy: {self.aa_strategy}")
+        # 脏矩形模式：只重绘、缩放和提交上一帧与本帧物体所在的区域
+        self.dirty_rects = (GAME_CONFIG['WINDOW']['DIRTY_RECTS']
+                            if dirty_rects is None else dirty_rects)
+        # 动态分辨率：按渲染耗时在 MIN_RENDER_SCALE 与 render_scale 之间调整超采样倍数
+        if adaptive_scale is None:
+            adaptive_scale = GAME_CONFIG['WINDOW']['ADAPTIVE_SCALE']
+        self.scaler = None
+        if adaptive_scale and self.aa_strategy == 'supersample':
+            config = GAME_CONFIG['WINDOW']
+            self.scaler = ResolutionController(
+                min(config['MIN_RENDER_SCALE'], render_scale), render_scale,
+                config['SCALE_STEP'], config['FRAME_BUDGET_MS'] / 1000.0, config['SCALE_WINDOW'])
+        self.screen = self._create_screen()
+        self._overlay_shown = False
+        self._overlay_cleared = False
+        self._last_state = None  # 上一次 render_interpolated 绘制的状态
+        self._allocate_surface()
+        self.frame_costs = {name: deque(maxlen=self.COST_WINDOW) for name in AA_STRATEGIES}
+        self._frame_seconds = {
+            name: _metrics.histogram('render_frame_seconds', "Renderer.render 每帧的耗时（秒）",
+                                     strategy=name)
+            for name in AA_STRATEGIES}
+        self._scale_gauge = _metrics.gauge('render_scale', "当前的超采样倍数")
+        self._scale_gauge.set(self.render_scale)
+        
+    def _create_screen(self) -> pygame.Surface:
+        return pygame.display.set_mode(self.screen_size, pygame.HWSURFACE | pygame.DOUBLEBUF)
+        
+    def _present(self, rects: Optional[list] = None):
+        """把 screen 提交到窗口，rects 为 None 时提交整帧"""
+        profiler = FrameProfiler.get_profiler()
+        overlay = profiler.enabled and profiler.overlay
+        if overlay:
+            area = profiler.draw_overlay(self.screen)
+            if rects is not None:
+                rects = rects + [area]
+        elif self._overlay_shown:
+            # 关闭叠加层后下一帧整帧重绘，清掉脏矩形模式下残留的叠加层
+            self._overlay_cleared = True
+        self._overlay_shown = overlay
+        with profiler.scope('present'):
+            if rects is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(rects)
+        
+    @property
+    def overlay_active(self) -> bool:
+        """剖析叠加层正在显示或刚被关闭，画面不变时也需要重绘"""
+        profiler = FrameProfiler.get_profiler()
+        return (profiler.enabled and profiler.overlay) or self._overlay_shown
+
+    def present_cached(self):
+        """不重绘，把上一帧重新提交到窗口（例如窗口被遮挡后重新显示）"""
+        self._present()
+        
+    def _allocate_surface(self):
+        """按当前倍数分配绘制表面"""
+        # supersample 在放大的表面上绘制，local_supersample 在原始尺寸的透明图层上合成
+        surface_scale = self.render_scale if self.aa_strategy == 'supersample' else 1
         self.drawing_surface = pygame.Surface(
-            (screen_size[0] * render_scale, screen_size[1] * render_scale),
+            (round(self.screen_size[0] * surface_scale), round(self.screen_size[1] * surface_scale)),
             pygame.SRCALPHA
         )
+        self._previous_bounds = None  # None 表示下一帧需要整帧绘制
         
     def clear(self):
         self.drawing_surface.fill((0, 0, 0, 0))
         self.screen.fill(GAME_CONFIG['COLORS']['BACKGROUND'])
         
     def render(self, game_objects: list):
-        self.clear()
+        start = time.perf_counter()
+        if self.aa_strategy == 'gfxdraw':
+            self._render_gfxdraw(game_objects)
+        elif self.aa_strategy == 'local_supersample':
+            self._render_local(game_objects)
+        else:
+            # 非整数倍时区域无法与像素对齐，只能整帧绘制
+            dirty = self.dirty_rects and float(self.render_scale).is_integer()
+            bounds = [obj.get_bounds() for obj in game_objects] if dirty else None
+            if bounds is None or self._previous_bounds is None or None in bounds:
+                self._render_full(game_objects)
+            else:
+                self._render_dirty(game_objects, bounds)
+            self._previous_bounds = bounds if bounds is not None and None not in bounds else None
+            if self._overlay_cleared:
+                self._previous_bounds = None
+                self._overlay_cleared = False
+        cost = time.perf_counter() - start
+        self.frame_costs[self.aa_strategy].append(cost)
+        self._frame_seconds[self.aa_strategy].observe(cost)
+        if self.scaler is not None and self.scaler.record(cost):
+            # 只在倍数确实变化时重新分配表面；精灵缓存按倍数区分，不需要清空
+            self.render_scale = self.scaler.scale
+            self._scale_gauge.set(self.render_scale)
+            self._allocate_surface()
+        
+    def render_interpolated(self, previous, current, alpha: float, hexagon: Hexagon, ball: Ball,
+                            force: bool = False) -> bool:
+        """在前后两个物理状态之间按 alpha 插值后绘制
+
+        previous、current 为 pipeline.StateSnapshot，alpha 通常为 FixedTimestep.alpha。
+        hexagon 和 ball 是只用于绘制的对象，位置和角度会被覆盖。
+        插值结果与上一次绘制的完全相同时（例如暂停后）不绘制也不提交，返回 False；
+        force 为 True 时总是绘制。
+        """
+        alpha = min(max(alpha, 0.0), 1.0)
+        (x0, y0), (x1, y1) = previous.position, current.position
+        state = (lerp_angle(previous.rotation, current.rotation, alpha),
+                 x0 + (x1 - x0) * alpha, y0 + (y1 - y0) * alpha, current.color)
+        if state == self._last_state and not force and not self.overlay_active:
+            return False
+        self._last_state = state
+        hexagon.rotation = state[0]
+        ball.position = Vector2(state[1], state[2])
+        ball.color = current.color
+        self.render([hexagon, ball])
+        return True
         
-        # 渲染所有游戏对象
-        for obj in game_objects:
-            obj.draw(self.drawing_surface)
+    def cost_stats(self) -> dict:
+        """各抗锯齿方式最近若干帧的耗时统计（毫秒）"""
+        stats = {}
+        for name, costs in self.frame_costs.items():
+            if costs:
+                ordered = sorted(costs)
+                stats[name] = {
+                    'frames': len(ordered),
+                    'mean_ms': sum(ordered) / len(ordered) * 1e3,
+                    'p95_ms': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1e3,
+                    'max_ms': ordered[-1] * 1e3,
+                }
+        return stats
+        
+    def _render_full(self, game_objects: list):
+        profiler = FrameProfiler.get_profiler()
+        with profiler.scope('draw'):
+            self.clear()
+            
+            # 渲染所有游戏对象
+            for obj in game_objects:
+                obj.draw(self.drawing_surface, self.render_scale)
             
         # 最终缩放和显示
-        scaled_surface = pygame.transform.smoothscale(
-            self.drawing_surface, 
-            self.screen_size
-        )
-        self.screen.blit(scaled_surface, (0, 0))
-        pygame.display.flip() 
\ No newline at end of file
+        with profiler.scope('scale'):
+            scaled_surface = pygame.transform.smoothscale(
+                self.drawing_surface, 
+                self.screen_size
+            )
+            self.screen.blit(scaled_surface, (0, 0))
+        self._present()
+        
+    def _render_dirty(self, game_objects: list, bounds: list):
+        """只处理上一帧和本帧物体覆盖的区域，结果与整帧绘制相同"""
+        scale = int(self.render_scale)
+        screen_rect = self.screen.get_rect()
+        rects = self._merge_rects([r.clip(screen_rect) for r in self._previous_bounds + bounds])
+        background = GAME_CONFIG['COLORS']['BACKGROUND']
+        profiler = FrameProfiler.get_profiler()
+        
+        for rect in rects:
+            # 在高分辨率表面上清空并重绘该区域，只画与之相交的物体
+            with profiler.scope('draw'):
+                area = pygame.Rect(rect.x * scale, rect.y * scale, rect.w * scale, rect.h * scale)
+                self.drawing_surface.fill((0, 0, 0, 0), area)
+                self.drawing_surface.set_clip(area)
+                for obj, obj_bounds in zip(game_objects, bounds):
+                    if obj_bounds.colliderect(rect):
+                        obj.draw(self.drawing_surface, self.render_scale)
+                self.drawing_surface.set_clip(None)
+            
+            # 区域与缩放倍数对齐，单独缩小的结果与整帧缩小一致
+            with profiler.scope('scale'):
+                scaled = pygame.transform.smoothscale(self.drawing_surface.subsurface(area), rect.size)
+                self.screen.fill(background, rect)
+                self.screen.blit(scaled, rect.topleft)
+        self._present(rects)
+        
+    def _render_gfxdraw(self, game_objects: list):
+        """原始分辨率下直接在屏幕上用抗锯齿图元绘制，不需要缩放"""
+        with FrameProfiler.get_profiler().scope('draw'):
+            self.screen.fill(GAME_CONFIG['COLORS']['BACKGROUND'])
+            for obj in game_objects:
+                obj.draw_aa(self.screen)
+        self._present()
+        
+    def _render_local(self, game_objects: list):
+        """物体的精灵各自超采样后缩小并缓存，每帧只在原始分辨率下合成"""
+        with FrameProfiler.get_profiler().scope('draw'):
+            self.drawing_surface.fill((0, 0, 0, 0))
+            for obj in game_objects:
+                obj.draw(self.drawing_surface, 1, self.render_scale)
+            self.screen.fill(GAME_CONFIG['COLORS']['BACKGROUND'])
+            self.screen.blit(self.drawing_surface, (0, 0))
+        self._present()
+        
+    @staticmethod
+    def _merge_rects(rects: list) -> list:
+        """合并相互重叠的矩形，避免同一区域被处理多次"""
+        merged = [r for r in rects if r.w > 0 and r.h > 0]
+        changed = True
+        while changed:
+            changed = False
+            for i in range(len(merged)):
+                for j in range(i + 1, len(merged)):
+                    if merged[i].colliderect(merged[j]):
+                        merged[i] = merged[i].union(merged.pop(j))
+                        changed = True
+                        break
+                if changed:
+                    break
+        return merged
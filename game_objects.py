@@ -1,8 +1,17 @@
 from pygame.math import Vector2
 from config import GAME_CONFIG
-from typing import Tuple
+from utils import fixed_dt
+from metrics import MetricsRegistry
+from typing import Optional, Tuple
+import math
+import random
 import pygame
 
+# 与 PhysicsEngine 的其他截断位置共用同一个指标
+_apply_forces_clamps = MetricsRegistry.get_registry().counter(
+    'physics_speed_clamps_total', "速度超过 MAX_BALL_SPEED 被截断的次数，按位置区分",
+    site='apply_forces')
+
 class GameObject:
     position: Vector2
 
@@ -12,13 +21,24 @@ class GameObject:
     def update(self) -> None:
         pass
         
-    def draw(self, surface: pygame.Surface) -> None:
+    def draw(self, surface: pygame.Surface, render_scale: Optional[int] = None,
+             supersample: int = 1) -> None:
+        """以 render_scale 倍绘制；supersample > 1 时只对物体自身的精灵做超采样"""
+        pass
+        
+    def draw_aa(self, surface: pygame.Surface) -> None:
+        """在原始分辨率下用抗锯齿图元绘制"""
         pass
+        
+    def get_bounds(self) -> Optional[pygame.Rect]:
+        """draw 会影响的屏幕区域（未缩放坐标），None 表示无法确定"""
+        return None
 
 class Ball(GameObject):
     velocity: Vector2
     radius: float
     color: Tuple[int, int, int]
+    frame_state = None  # 共转参考系求解器的内部状态
 
     def __init__(self, position: Vector2, radius: float, color: Tuple[int, int, int]) -> None:
         super().__init__(position)
@@ -26,68 +46,128 @@ class Ball(GameObject):
         self.radius = radius
         self.color = color
         
-    def update(self, gravity: Vector2, friction: float) -> None:
-        self.velocity += gravity
-        self.velocity *= friction
+    def update(self, gravity: Vector2, friction: float, dt: Optional[float] = None) -> None:
+        """推进 dt 秒：gravity 为加速度（像素/秒²），friction 为每秒保留的速度比例"""
+        if dt is None:
+            dt = fixed_dt()
+        self.apply_forces(gravity, friction, dt)
+        self.position += self.velocity * dt
+
+    def apply_forces(self, gravity: Vector2, friction: float, dt: float) -> None:
+        """只更新速度（加速度、摩擦和速度限制），不移动位置"""
+        self.velocity += gravity * dt
+        self.velocity *= friction ** dt
         
         # 使用配置的速度限制
         if self.velocity.length() > GAME_CONFIG['PHYSICS']['MAX_BALL_SPEED']:
             self.velocity = (self.velocity.normalize() * 
                            GAME_CONFIG['PHYSICS']['MAX_BALL_SPEED'])
-            
-        self.position += self.velocity
+            _apply_forces_clamps.inc()
         
-    def draw(self, surface: pygame.Surface) -> None:
+    def draw(self, surface: pygame.Surface, render_scale: Optional[int] = None,
+             supersample: int = 1) -> None:
         from utils import draw_glowing_circle
-        draw_glowing_circle(surface, self.color, 
-                          (int(self.position.x), int(self.position.y)), 
-                          self.radius)
+        # 保留亚像素位置，放大后再取整
+        draw_glowing_circle(surface, self.color, (self.position.x, self.position.y),
+                            self.radius, render_scale, supersample)
+        
+    def draw_aa(self, surface: pygame.Surface) -> None:
+        from utils import draw_aa_glowing_circle
+        draw_aa_glowing_circle(surface, self.color, (self.position.x, self.position.y),
+                               self.radius)
+        
+    def get_bounds(self) -> pygame.Rect:
+        from utils import GLOW_LAYERS
+        # 最外层光晕加 1 像素，覆盖缩放时的取整
+        reach = math.ceil(self.radius + max(offset for offset, _ in GLOW_LAYERS)) + 1
+        x, y = math.floor(self.position.x), math.floor(self.position.y)
+        return pygame.Rect(x - reach, y - reach, reach * 2 + 1, reach * 2 + 1)
 
 class Hexagon(GameObject):
     radius: float
     color: Tuple[int, int, int]
-    rotation: float
     rotation_speed: float
     target_rotation_speed: float
-    frame_count: int
+    speed_change_timer: float
 
-    def __init__(self, center: Vector2, radius: float, color: Tuple[int, int, int]) -> None:
+    def __init__(self, center: Vector2, radius: float, color: Tuple[int, int, int],
+                 rng: Optional[random.Random] = None) -> None:
         super().__init__(center)
         self.radius = radius
         self.color = color
+        # 随机旋转速度的来源，传入带种子的 random.Random 可使运行可复现
+        self.rng = rng if rng is not None else random
+        self._geometry = None
         self.rotation = 0
         self.rotation_speed = GAME_CONFIG['HEXAGON']['INITIAL_SPEED']
         self.target_rotation_speed = self.rotation_speed
-        self.frame_count = 0
+        self.speed_change_timer = 0.0
         
-    def update(self, acceleration: float):
-        # 更新帧计数
-        self.frame_count += 1
-        if self.frame_count >= GAME_CONFIG['HEXAGON']['SPEED_CHANGE_INTERVAL']:
-            self.frame_count = 0
+    @property
+    def rotation(self) -> float:
+        return self._rotation
+
+    @rotation.setter
+    def rotation(self, value: float) -> None:
+        # 角度变化时几何快照失效
+        self._rotation = value
+        self._geometry = None
+
+    def geometry(self):
+        """当前角度下的几何快照（顶点、边向量、内法线、中心）
+
+        同一角度内物理和渲染共享同一个不可变快照，只在 rotation 改变时重建。
+        """
+        if self._geometry is None:
+            from geometry import ConvexPolygon
+            self._geometry = ConvexPolygon.regular(
+                self.position, self.radius, 6, self._rotation)
+        return self._geometry
+
+    def update(self, acceleration: float, dt: Optional[float] = None):
+        """推进 dt 秒：acceleration 为趋近目标速度的速率（1/秒）"""
+        if dt is None:
+            dt = fixed_dt()
+
+        # 更新速度变化计时
+        self.speed_change_timer += dt
+        if self.speed_change_timer >= GAME_CONFIG['HEXAGON']['SPEED_CHANGE_INTERVAL'] - 1e-9:
+            self.speed_change_timer = 0.0
             self.target_rotation_speed = self._get_random_rotation_speed()
         
-        # 平滑过渡到目标速度
+        # 平滑过渡到目标速度（指数趋近，与步长无关）
         speed_diff = self.target_rotation_speed - self.rotation_speed
-        self.rotation_speed += speed_diff * GAME_CONFIG['HEXAGON']['ROTATION_ACCELERATION']
+        self.rotation_speed += speed_diff * (1 - math.exp(-acceleration * dt))
         
-        # 更新旋转角度
-        self.rotation = (self.rotation + self.rotation_speed) % 360
+        # 更新旋转角度（rotation_speed 单位为度/秒）
+        self.rotation = (self.rotation + self.rotation_speed * dt) % 360
         
     def _get_random_rotation_speed(self):
         """获取随机旋转速度和方向"""
-        import random
-        speed = random.uniform(
+        speed = self.rng.uniform(
             GAME_CONFIG['HEXAGON']['MIN_ROTATION_SPEED'],
             GAME_CONFIG['HEXAGON']['MAX_ROTATION_SPEED']
         )
-        direction = random.choice([-1, 1])
+        direction = self.rng.choice([-1, 1])
         return speed * direction
         
     def get_points(self):
-        from utils import get_hex_points
-        return get_hex_points(self.rotation)
+        return list(self.geometry().vertices)
+        
+    def draw(self, surface, render_scale: Optional[int] = None, supersample: int = 1):
+        from utils import draw_cached_hexagon
+        draw_cached_hexagon(surface, self.color, self.position, self.radius,
+                            self.rotation, 4, render_scale, supersample)  # HEX_BORDER_WIDTH = 4
+        
+    def draw_aa(self, surface):
+        from utils import draw_aa_hexagon
+        draw_aa_hexagon(surface, self.color, self.position, self.radius, self.rotation, 4)
         
-    def draw(self, surface):
-        from utils import draw_smooth_hexagon
-        draw_smooth_hexagon(surface, self.color, self.get_points(), 4)  # HEX_BORDER_WIDTH = 4 
\ No newline at end of file
+    def get_bounds(self) -> pygame.Rect:
+        # 顶点外包矩形，向外留出加粗边框和顶点圆的宽度
+        xs = [x for x, _ in self.geometry().vertices]
+        ys = [y for _, y in self.geometry().vertices]
+        margin = 4 + 2 + 2
+        left, top = math.floor(min(xs)) - margin, math.floor(min(ys)) - margin
+        return pygame.Rect(left, top, math.ceil(max(xs)) + margin - left,
+                           math.ceil(max(ys)) + margin - top) 
\ No newline at end of file
@@ -7,6 +7,23 @@ class WindowConfig(Protocol):
     HEIGHT: int
     RENDER_SCALE: int
     FPS: int
+    IDLE_TIMEOUT_MS: int
+    GLOW_CACHE_MB: float
+    DIRTY_RECTS: bool
+    AA_STRATEGY: str
+    ADAPTIVE_SCALE: bool
+    MIN_RENDER_SCALE: float
+    SCALE_STEP: float
+    FRAME_BUDGET_MS: float
+    SCALE_WINDOW: int
+    GLOW_LOD: Tuple[Tuple[int, int], ...]
+    SPLAT_MIN_BALLS: int
+
+class TimestepConfig(Protocol):
+    PHYSICS_HZ: int
+    SUBSTEPS: int
+    MAX_STEPS_PER_FRAME: int
+    INTERPOLATE: bool
 
 class PhysicsConfig(Protocol):
     GRAVITY: Vector2
@@ -14,13 +31,39 @@ class PhysicsConfig(Protocol):
     FRICTION: float
     MAX_BALL_SPEED: float
     COLLISION_BUFFER: int
+    CONTINUOUS_COLLISION: bool
+    MAX_IMPACTS_PER_STEP: int
+    MIN_IMPACT_SPEED: float
+    ROTATING_FRAME: bool
+    SLEEP_ENABLED: bool
+    SLEEP_VELOCITY: float
+    SLEEP_STEPS: int
+    SLEEP_CONTACT_SLACK: float
 
 class HexagonConfig(Protocol):
     MIN_ROTATION_SPEED: float
     MAX_ROTATION_SPEED: float
     ROTATION_ACCELERATION: float
-    SPEED_CHANGE_INTERVAL: int
+    SPEED_CHANGE_INTERVAL: float
     INITIAL_SPEED: float
+    SPRITE_ANGLE_STEP: float
+    SPRITE_CACHE_MB: float
+
+class ProfilerConfig(Protocol):
+    ENABLED: bool
+    CAPACITY: int
+    OVERLAY: bool
+    DUMP_PATH: str
+
+class MetricsConfig(Protocol):
+    EXPORT_PATH: str
+    EXPORT_PORT: int
+    EXPORT_INTERVAL: float
+
+class LoggingConfig(Protocol):
+    LEVEL: str
+    RATE_LIMIT_BURST: int
+    RATE_LIMIT_PERIOD: float
 
 class ColorsConfig(Protocol):
     BACKGROUND: Tuple[int, int, int]
@@ -29,6 +72,10 @@ class ColorsConfig(Protocol):
 
 class GameConfig(Protocol):
     WINDOW: WindowConfig
+    TIMESTEP: TimestepConfig
     PHYSICS: PhysicsConfig
+    PROFILER: ProfilerConfig
+    METRICS: MetricsConfig
+    LOGGING: LoggingConfig
     COLORS: ColorsConfig
     HEXAGON: HexagonConfig 
\ No newline at end of file
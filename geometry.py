@@ -0,0 +1,148 @@
+import math
+import numpy as np
+from typing import Sequence, Tuple
+
+Point = Tuple[float, float]
+
+
+class ConvexPolygon:
+    """凸多边形容器
+
+    构造时一次性计算每条边的单位内法线 n_k 和偏移 o_k（每个旋转角度一次），
+    点 p 到第 k 条边所在直线的有向距离为 n_k·p - o_k（内部为正）。
+    包含判断和最近边查询都只需要几次点积，另提供 (N, 2) 数组的批量版本。
+    创建后不应再修改。
+    """
+    __slots__ = ('vertices', 'center', 'normals', 'offsets',
+                 '_edges', '_segments', '_normal_array', '_offset_array')
+
+    def __init__(self, vertices: Sequence[Point]) -> None:
+        points = [(float(x), float(y)) for x, y in vertices]
+        count = len(points)
+        # 凸多边形任意相邻两条边的叉积符号即为绕向，从而决定哪一侧是内侧
+        (x0, y0), (x1, y1), (x2, y2) = points[0], points[1], points[2]
+        cross = (x1 - x0) * (y2 - y1) - (y1 - y0) * (x2 - x1)
+        sign = 1.0 if cross >= 0 else -1.0
+
+        normals, offsets = [], []
+        for i in range(count):
+            ax, ay = points[i]
+            bx, by = points[(i + 1) % count]
+            ex, ey = bx - ax, by - ay
+            scale = sign / math.hypot(ex, ey)
+            nx, ny = -ey * scale, ex * scale
+            normals.append((nx, ny))
+            offsets.append(nx * ax + ny * ay)
+
+        self._init(tuple(points),
+                   (sum(x for x, _ in points) / count, sum(y for _, y in points) / count),
+                   tuple(normals), tuple(offsets))
+
+    def _init(self, vertices, center, normals, offsets) -> None:
+        self.vertices = vertices
+        self.center = center
+        self.normals = normals
+        self.offsets = offsets
+        # 边向量、最近边查询和批量查询用的数据在第一次使用时才创建
+        self._edges = None
+        self._segments = None
+        self._normal_array = None
+        self._offset_array = None
+
+    @classmethod
+    def regular(cls, center: Point, radius: float, sides: int = 6,
+                rotation: float = 0.0) -> 'ConvexPolygon':
+        """正多边形，顶点顺序与 utils.get_hex_points 相同（rotation 单位为度）
+
+        法线和偏移直接由角度算出：第 i 条边的内法线指向 -(θ + (i + 0.5)·step)，
+        到中心的距离为内切圆半径。
+        """
+        cx, cy = center[0], center[1]
+        step = 360.0 / sides
+        apothem = radius * math.cos(math.pi / sides)
+        vertices, normals, offsets = [], [], []
+        for i in range(sides):
+            theta = math.radians(rotation + i * step)
+            vertices.append((cx + radius * math.cos(theta), cy + radius * math.sin(theta)))
+            phi = math.radians(rotation + (i + 0.5) * step)
+            nx, ny = -math.cos(phi), -math.sin(phi)
+            normals.append((nx, ny))
+            offsets.append(nx * cx + ny * cy - apothem)
+        polygon = cls.__new__(cls)
+        polygon._init(tuple(vertices), (cx, cy), tuple(normals), tuple(offsets))
+        return polygon
+
+    @property
+    def edges(self) -> Tuple[Point, ...]:
+        """各边向量（起点到终点）"""
+        if self._edges is None:
+            count = len(self.vertices)
+            self._edges = tuple(
+                (self.vertices[(i + 1) % count][0] - x, self.vertices[(i + 1) % count][1] - y)
+                for i, (x, y) in enumerate(self.vertices))
+        return self._edges
+
+    def _get_segments(self):
+        """每条边的起点、单位方向和长度"""
+        if self._segments is None:
+            segments = []
+            for (ax, ay), (ex, ey) in zip(self.vertices, self.edges):
+                length = math.hypot(ex, ey)
+                segments.append((ax, ay, ex / length, ey / length, length))
+            self._segments = tuple(segments)
+        return self._segments
+
+    def edge_distances(self, point: Point) -> Tuple[float, ...]:
+        """点到各边所在直线的有向距离（内部为正）"""
+        x, y = point[0], point[1]
+        return tuple(nx * x + ny * y - o for (nx, ny), o in zip(self.normals, self.offsets))
+
+    def contains(self, point: Point) -> bool:
+        """判断点是否在多边形内（含边界）"""
+        x, y = point[0], point[1]
+        for (nx, ny), o in zip(self.normals, self.offsets):
+            if nx * x + ny * y < o:
+                return False
+        return True
+
+    def signed_distance(self, point: Point) -> float:
+        """到边界的有向距离：内部为正且精确，外部为负（最大越界量）"""
+        return min(self.edge_distances(point))
+
+    def closest_edge(self, point: Point) -> Tuple[int, Point, float]:
+        """点到各条线段的最近点，返回 (边序号, 最近点, 距离)"""
+        x, y = point[0], point[1]
+        best = (-1, (x, y), float('inf'))
+        for i, (ax, ay, dx, dy, length) in enumerate(self._get_segments()):
+            t = (x - ax) * dx + (y - ay) * dy
+            t = 0.0 if t < 0 else (length if t > length else t)
+            qx, qy = ax + dx * t, ay + dy * t
+            dist = math.hypot(x - qx, y - qy)
+            if dist < best[2]:
+                best = (i, (qx, qy), dist)
+        return best
+
+    def edge_distances_many(self, points: np.ndarray) -> np.ndarray:
+        """批量计算 (N, 2) 个点到各边的有向距离，返回 (N, K)"""
+        if self._normal_array is None:
+            self._normal_array = np.array(self.normals, dtype=np.float64)
+            self._offset_array = np.array(self.offsets, dtype=np.float64)
+        return np.asarray(points, dtype=np.float64) @ self._normal_array.T - self._offset_array
+
+    def contains_many(self, points: np.ndarray) -> np.ndarray:
+        """批量包含判断，返回 (N,) 布尔数组"""
+        return np.all(self.edge_distances_many(points) >= 0, axis=1)
+
+    def closest_edges_many(self, points: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """批量最近边查询，返回 (边序号 (N,), 最近点 (N, 2), 距离 (N,))"""
+        points = np.asarray(points, dtype=np.float64)
+        segments = np.array(self._get_segments(), dtype=np.float64)
+        starts, directions, lengths = segments[:, 0:2], segments[:, 2:4], segments[:, 4]
+        rel = points[:, None, :] - starts
+        t = np.clip(np.sum(rel * directions, axis=-1), 0, lengths)
+        closest = starts + t[..., None] * directions
+        delta = points[:, None, :] - closest
+        dist = np.hypot(delta[..., 0], delta[..., 1])
+        index = np.argmin(dist, axis=1)
+        rows = np.arange(len(points))
+        return index, closest[rows, index], dist[rows, index]
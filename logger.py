@@ -1,22 +1,139 @@
+import atexit
 import logging
-from typing import Optional
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Callable, Optional
+
+
+class RateLimitedQueueHandler(QueueHandler):
+    """把日志记录放进队列的处理器，按消息分组限流
+
+    同一个键（默认为记录器名、级别和未格式化的消息模板，也可以用
+    extra={'rate_key': ...} 指定）在每 period 秒内最多放行 burst 条，其余的
+    只计数；下一个时间窗口放行第一条之前，先补发一条汇总记录。
+
+    分组最多保留 max_windows 个：超过时先淘汰已过期的窗口，仍然超过则淘汰最早的，
+    被淘汰的窗口中未汇报的抑制计数会先输出汇总。消息本身各不相同（例如预先拼接了
+    异常文本）时，内存占用也不会无限增长。
+
+    prepare() 不格式化消息：调用线程只做一次入队，msg % args 留给
+    后台线程的 QueueListener。因此 args 在记录后不应再被修改。
+    """
+
+    SUMMARY = "Suppressed %d similar messages in the last %.1f s: %s"
+
+    def __init__(self, log_queue, burst: int = 5, period: float = 10.0,
+                 clock: Callable[[], float] = time.monotonic, max_windows: int = 256) -> None:
+        super().__init__(log_queue)
+        self.burst = burst
+        self.period = period
+        self.clock = clock
+        self.max_windows = max_windows
+        self._windows = {}  # 键 -> [窗口开始时间, 已放行条数, 已抑制条数, 最后一条被抑制的记录]
+        self._windows_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        key = getattr(record, 'rate_key', None) or (record.name, record.levelno, record.msg)
+        now = self.clock()
+        summaries = []
+        with self._windows_lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.period:
+                if window is not None:
+                    if window[2]:
+                        summaries.append(self._summary(window, now))
+                    # 重新插入到末尾，字典保持按窗口开始时间排列
+                    del self._windows[key]
+                self._windows[key] = [now, 1, 0, None]
+                if len(self._windows) > self.max_windows:
+                    summaries.extend(self._evict(now))
+            elif window[1] < self.burst:
+                window[1] += 1
+            else:
+                window[2] += 1
+                window[3] = record
+                return False
+        for summary in summaries:
+            super().handle(summary)
+        return super().handle(record)
+
+    def _evict(self, now: float) -> list:
+        """淘汰过期的窗口，仍超过上限时淘汰最早的，返回需要补发的汇总
+
+        窗口按开始时间排列，过期的窗口都在开头，从头弹出即可。
+        """
+        summaries = []
+        while self._windows:
+            key = next(iter(self._windows))
+            window = self._windows[key]
+            if now - window[0] < self.period and len(self._windows) <= self.max_windows:
+                break
+            del self._windows[key]
+            if window[2]:
+                summaries.append(self._summary(window, now))
+        return summaries
+
+    def _summary(self, window: list, now: float) -> logging.LogRecord:
+        last = window[3]
+        return logging.LogRecord(last.name, last.levelno, last.pathname, last.lineno,
+                                 self.SUMMARY, (window[2], now - window[0], last.msg), None)
+
+    def flush_suppressed(self) -> None:
+        """为仍有未汇报的抑制计数的分组补发汇总（退出前调用）"""
+        now = self.clock()
+        with self._windows_lock:
+            summaries = [self._summary(window, now) for window in self._windows.values()
+                         if window[2]]
+            for window in self._windows.values():
+                window[2] = 0
+        for summary in summaries:
+            super().handle(summary)
 
 
 class GameLogger:
+    """游戏的日志记录器
+
+    记录器只挂一个 RateLimitedQueueHandler，写 stderr 的 StreamHandler 由
+    QueueListener 在后台线程中调用，帧循环中记录日志不会被 I/O 阻塞。
+    进程退出时 shutdown() 补发抑制汇总并清空队列。
+    """
     _instance: Optional[logging.Logger] = None
+    _handler: Optional[RateLimitedQueueHandler] = None
+    _listener: Optional[QueueListener] = None
 
     @classmethod
     def get_logger(cls) -> logging.Logger:
         if cls._instance is None:
+            from config import GAME_CONFIG
+            config = GAME_CONFIG['LOGGING']
             cls._instance = logging.getLogger('game')
-            cls._instance.setLevel(logging.INFO)
+            cls._instance.setLevel(config['LEVEL'])
 
-            # 添加控制台处理器
+            # 添加控制台处理器，由后台线程写出
             handler = logging.StreamHandler()
             formatter = logging.Formatter(
                 '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
             )
             handler.setFormatter(formatter)
-            cls._instance.addHandler(handler)
+            log_queue = queue.SimpleQueue()
+            cls._handler = RateLimitedQueueHandler(log_queue, config['RATE_LIMIT_BURST'],
+                                                   config['RATE_LIMIT_PERIOD'])
+            cls._listener = QueueListener(log_queue, handler)
+            cls._listener.start()
+            cls._instance.addHandler(cls._handler)
+            atexit.register(cls.shutdown)
 
-        return cls._instance 
\ No newline at end of file
+        return cls._instance
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """补发抑制汇总，等后台线程写完队列中的记录后停止"""
+        if cls._listener is not None:
+            cls._handler.flush_suppressed()
+            cls._listener.stop()
+            cls._listener = None
@@ -0,0 +1,229 @@
+import bisect
+import math
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+# 帧耗时一类的默认桶（秒）
+DEFAULT_BUCKETS = (0.001, 0.002, 0.004, 0.008, 0.016, 0.033, 0.066, 0.1, 0.25)
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int):
+        return str(value)
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value))
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+               for _, v in labels)
+    return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(labels, escaped)) + '}'
+
+
+class Counter:
+    """只增不减的计数
+
+    inc() 只做一次加法，不加锁：每个计数只应由一个线程写入。
+    fn 不为 None 时值在导出时由 fn() 读取（例如缓存已有的命中次数），热路径上没有开销。
+    """
+    kind = 'counter'
+    __slots__ = ('value', 'fn')
+
+    def __init__(self, fn: Optional[Callable[[], float]] = None) -> None:
+        self.value = 0
+        self.fn = fn
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+    def get(self) -> float:
+        return self.fn() if self.fn is not None else self.value
+
+    def samples(self, name: str, labels: tuple):
+        yield name, labels, self.get()
+
+
+class Gauge(Counter):
+    """可增可减的当前值"""
+    kind = 'gauge'
+    __slots__ = ()
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def dec(self, amount: float = 1) -> None:
+        self.value -= amount
+
+
+class Histogram:
+    """固定桶的分布，observe() 为一次二分查找和两次加法"""
+    kind = 'histogram'
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # 最后一个为 +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self, name: str, labels: tuple):
+        cumulative = 0
+        for bound, count in zip(self.buckets + (math.inf,), self.counts):
+            cumulative += count
+            yield f'{name}_bucket', labels + (('le', _format_value(bound)),), cumulative
+        yield f'{name}_sum', labels, self.sum
+        yield f'{name}_count', labels, self.count
+
+
+class MetricsRegistry:
+    """按名称和标签登记的指标，render() 生成 Prometheus 文本格式
+
+    同名同标签的指标只创建一次，模块可以在导入时取得自己的指标对象，之后直接更新。
+    """
+    _instance: Optional['MetricsRegistry'] = None
+
+    def __init__(self) -> None:
+        self._families: Dict[str, Tuple[str, str, dict]] = {}  # 名称 -> (类型, 说明, 标签 -> 指标)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get_registry(cls) -> 'MetricsRegistry':
+        """全局共享的注册表"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def counter(self, name: str, help: str, fn: Optional[Callable[[], float]] = None,
+                **labels: str) -> Counter:
+        return self._get(name, help, labels, lambda: Counter(fn))
+
+    def gauge(self, name: str, help: str, fn: Optional[Callable[[], float]] = None,
+              **labels: str) -> Gauge:
+        return self._get(name, help, labels, lambda: Gauge(fn))
+
+    def histogram(self, name: str, help: str, buckets: Sequence[float] = DEFAULT_BUCKETS,
+                  **labels: str) -> Histogram:
+        return self._get(name, help, labels, lambda: Histogram(buckets))
+
+    def _get(self, name: str, help: str, labels: dict, factory):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            metric = factory()
+            kind, _, children = self._families.setdefault(name, (metric.kind, help, {}))
+            if kind != metric.kind:
+                raise ValueError(f"Metric {name} already registered as {kind}")
+            return children.setdefault(key, metric)
+
+    def get(self, name: str, **labels: str):
+        """已登记的指标，不存在时返回 None"""
+        family = self._families.get(name)
+        return family[2].get(tuple(sorted(labels.items()))) if family else None
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            families = [(name, kind, help, list(children.items()))
+                        for name, (kind, help, children) in sorted(self._families.items())]
+        for name, kind, help, children in families:
+            lines.append(f'# HELP {name} {help}')
+            lines.append(f'# TYPE {name} {kind}')
+            for labels, metric in children:
+                for sample, sample_labels, value in metric.samples(name, labels):
+                    lines.append(f'{sample}{_format_labels(sample_labels)} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+class MetricsExporter:
+    """定期把注册表写成 Prometheus 文本文件，或在本机 HTTP 端口上提供 /metrics
+
+    文件先写到临时文件再替换，node_exporter 的 textfile 收集器不会读到半个文件。
+    port 为 0 时由系统分配端口，实际端口见 port 属性。
+    """
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None, path: Optional[str] = None,
+                 port: Optional[int] = None, interval: float = 5.0,
+                 host: str = '127.0.0.1') -> None:
+        self.registry = registry if registry is not None else MetricsRegistry.get_registry()
+        self.path = path
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self._threads = []
+        self._server = None
+        if port is not None:
+            self._server = ThreadingHTTPServer((host, port), self._make_handler())
+            self._server.daemon_threads = True
+
+    @property
+    def port(self) -> Optional[int]:
+        return self._server.server_address[1] if self._server is not None else None
+
+    def _make_handler(self):
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # 抓取很频繁，不写访问日志
+
+        return Handler
+
+    def write(self) -> None:
+        """立即写一次文件"""
+        temp = f'{self.path}.tmp'
+        with open(temp, 'w') as f:
+            f.write(self.registry.render())
+        os.replace(temp, self.path)
+
+    def _write_loop(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            self.write()
+
+    def start(self) -> 'MetricsExporter':
+        if self.path:
+            self._threads.append(threading.Thread(target=self._write_loop,
+                                                  name='metrics-file', daemon=True))
+        if self._server is not None:
+            self._threads.append(threading.Thread(target=self._server.serve_forever,
+                                                  name='metrics-http', daemon=True))
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self) -> None:
+        """停止后台线程；写文件模式下最后再写一次"""
+        self._stop_event.set()
+        if self._server is not None:
+            if self._threads:
+                self._server.shutdown()
+            self._server.server_close()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        if self.path:
+            self.write()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
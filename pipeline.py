@@ -0,0 +1,192 @@
+import random
+import threading
+import time
+import pygame
+from pygame.math import Vector2
+from config import GAME_CONFIG
+from game_objects import Ball, Hexagon
+from profiler import FrameProfiler
+from typing import NamedTuple, Optional, Tuple
+
+
+class StateSnapshot(NamedTuple):
+    """物理线程在某一步结束时发布的只读状态
+
+    只包含绘制需要的几个数值（六边形的中心、半径和颜色在运行中不变，不放进快照），
+    发布一次只需构造一个小元组。produced 为发布时的 perf_counter()，用于统计延迟。
+    """
+    tick: int
+    rotation: float
+    position: Tuple[float, float]
+    color: Tuple[int, int, int]
+    produced: float
+
+
+def capture_snapshot(game) -> StateSnapshot:
+    """在物理线程中取得当前状态"""
+    if game.physics.rotating_frame:
+        game.physics.sync_to_world(game.ball, game.hexagon)
+    return StateSnapshot(game.tick, game.hexagon.rotation,
+                         (game.ball.position.x, game.ball.position.y),
+                         game.ball.color, time.perf_counter())
+
+
+class TripleBuffer:
+    """三缓冲
+
+    生产者写入后台槽后与中间槽交换，消费者取数时把中间槽换到前台。
+    两边只在交换下标时短暂持锁，生产者总能写入，消费者总能拿到最新完成的一份，
+    双方都不等待对方。没被取走就被覆盖的份数记在 dropped 中。
+    """
+
+    def __init__(self, initial=None) -> None:
+        self._slots = [initial, initial, initial]
+        self._back, self._middle, self._front = 0, 1, 2
+        self._fresh = False
+        self._lock = threading.Lock()
+        self.published = 0
+        self.dropped = 0
+
+    def publish(self, item) -> None:
+        self._slots[self._back] = item
+        with self._lock:
+            self._back, self._middle = self._middle, self._back
+            if self._fresh:
+                self.dropped += 1
+            self._fresh = True
+            self.published += 1
+
+    def latest(self):
+        """返回 (最新的一份, 是否是上次调用之后新发布的)"""
+        with self._lock:
+            fresh = self._fresh
+            if fresh:
+                self._front, self._middle = self._middle, self._front
+                self._fresh = False
+        return self._slots[self._front], fresh
+
+
+class PhysicsThread(threading.Thread):
+    """按固定步长推进 game 的后台线程，每推进一批步就发布一份快照
+
+    线程启动后 game 的对象只由这个线程修改；渲染线程只读取快照。
+    暂停时线程阻塞等待，不再按步长醒来：取消暂停后由主线程调用 resume() 唤醒。
+    """
+
+    def __init__(self, game, buffer: TripleBuffer) -> None:
+        super().__init__(name='physics', daemon=True)
+        self.game = game
+        self.buffer = buffer
+        self._stop_event = threading.Event()
+        self._resume_event = threading.Event()
+        self.error: Optional[BaseException] = None
+
+    def run(self) -> None:
+        timestep = self.game.timestep
+        last = time.perf_counter()
+        try:
+            while not self._stop_event.is_set():
+                now = time.perf_counter()
+                frame_time, last = now - last, now
+                if self.game.state.paused:
+                    timestep.reset()
+                    # 先清除再检查，resume() 在两者之间被调用也不会错过
+                    self._resume_event.clear()
+                    if self.game.state.paused and not self._stop_event.is_set():
+                        self._resume_event.wait()
+                    # 暂停的时长不计入下一步的帧时间
+                    last = time.perf_counter()
+                    continue
+                steps = timestep.advance(frame_time)
+                for _ in range(steps):
+                    self.game.step()
+                if steps:
+                    self.buffer.publish(capture_snapshot(self.game))
+                # 睡到下一步到期
+                self._stop_event.wait(max(0.0, timestep.dt - timestep.accumulator))
+        except BaseException as e:
+            self.error = e
+
+    def resume(self) -> None:
+        """取消暂停后唤醒等待中的线程"""
+        self._resume_event.set()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self._resume_event.set()
+        self.join()
+        if self.error is not None:
+            raise self.error
+
+
+def make_views(game) -> Tuple[Hexagon, Ball]:
+    """渲染线程自己的六边形和球，只用于按快照绘制"""
+    hexagon = Hexagon(Vector2(game.hexagon.position), game.hexagon.radius,
+                      game.hexagon.color, rng=random.Random(0))
+    ball = Ball(Vector2(game.ball.position), game.ball.radius, game.ball.color)
+    return hexagon, ball
+
+
+def render_snapshot(renderer, snapshot: StateSnapshot, hexagon: Hexagon, ball: Ball) -> None:
+    """把快照写入渲染线程的对象后绘制一帧"""
+    hexagon.rotation = snapshot.rotation
+    ball.position = Vector2(snapshot.position)
+    ball.color = snapshot.color
+    renderer.render([hexagon, ball])
+
+
+def run_pipelined(game, recorder=None) -> None:
+    """流水线版的 Game.run：物理在后台线程中运行，主线程处理事件并绘制最新快照
+
+    pygame 的缩放和 blit 在执行期间会释放 GIL，物理步可以与之重叠。
+    剖析器每绘制一帧结束一帧；物理线程中的 hexagon、physics 阶段计入它们完成时所在的帧。
+    """
+    game.recorder = recorder
+    buffer = TripleBuffer(capture_snapshot(game))
+    hexagon, ball = make_views(game)
+    physics = PhysicsThread(game, buffer)
+    physics.start()
+    interpolate = GAME_CONFIG['TIMESTEP']['INTERPOLATE']
+    idle_timeout = GAME_CONFIG['WINDOW']['IDLE_TIMEOUT_MS']
+    profiler = FrameProfiler.get_profiler()
+    previous = current = buffer.latest()[0]
+    resumed = False
+    try:
+        while game.state.running and physics.is_alive():
+            if game.state.paused:
+                # 暂停时物理线程不发布快照，主线程阻塞等待事件，只在需要时重新提交上一帧
+                redraw = game.state.wait_events(idle_timeout)
+                # 暂停的时长不计入帧耗时统计
+                profiler.reset_frame()
+                if redraw:
+                    if game.renderer.overlay_active:
+                        render_snapshot(game.renderer, current, hexagon, ball)
+                    else:
+                        game.renderer.present_cached()
+                resumed = not game.state.paused
+                if resumed:
+                    physics.resume()
+                continue
+            with profiler.scope('events'):
+                game.state.handle_events()
+            snapshot, fresh = buffer.latest()
+            if fresh:
+                # 恢复后的第一份快照与暂停前的相隔整个暂停时长，不在两者之间插值
+                previous, current = (snapshot if resumed else current), snapshot
+                resumed = False
+            span = current.produced - previous.produced
+            if interpolate and span > 0:
+                # 按最近一份快照发布后经过的时间，在前后两份之间插值
+                alpha = (time.perf_counter() - current.produced) / span
+                game.renderer.render_interpolated(previous, current, alpha, hexagon, ball)
+            else:
+                render_snapshot(game.renderer, current, hexagon, ball)
+            with profiler.scope('wait'):
+                game.clock.tick(GAME_CONFIG['WINDOW']['FPS'])
+            profiler.end_frame()
+    finally:
+        physics.stop()
+        game.recorder = None
+        if GAME_CONFIG['PROFILER']['DUMP_PATH'] and profiler.frames:
+            profiler.dump(GAME_CONFIG['PROFILER']['DUMP_PATH'])
+        pygame.quit()
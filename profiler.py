@@ -0,0 +1,179 @@
+import csv
+import json
+import time
+import numpy as np
+import pygame
+from config import GAME_CONFIG
+from typing import Dict, Optional, Sequence
+
+# Game.run 每帧依次经过的阶段；frame 为两次 end_frame 之间的总时间
+STAGES = ('events', 'hexagon', 'physics', 'draw', 'scale', 'present', 'wait', 'frame')
+PERCENTILES = (50, 95, 99)
+
+
+class _NullScope:
+    """关闭时返回的空作用域，进入和退出都不做任何事"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SCOPE = _NullScope()
+
+
+class _Scope:
+    __slots__ = ('row', 'index', 'start')
+
+    def __init__(self, row: list, index: int) -> None:
+        self.row = row
+        self.index = index
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        # 同一帧内多次进入（例如多个物理步）时累加
+        self.row[self.index] += time.perf_counter() - self.start
+        return False
+
+
+class FrameProfiler:
+    """按阶段统计每帧耗时
+
+    with profiler.scope('physics'): ... 把耗时累加到当前帧，end_frame() 时
+    写入容量为 capacity 的环形缓冲区（最旧的帧被覆盖）。关闭时 scope()
+    直接返回共享的空作用域，不读时钟，开销只有一次方法调用。
+    """
+    _instance: Optional['FrameProfiler'] = None
+
+    def __init__(self, stages: Sequence[str] = STAGES, capacity: int = 600,
+                 enabled: bool = False) -> None:
+        self.stages = tuple(stages)
+        self._index = {name: i for i, name in enumerate(self.stages)}
+        self.samples = np.zeros((capacity, len(self.stages)), dtype=np.float64)
+        self.frames = 0  # 累计记录的帧数
+        self.enabled = enabled
+        self.overlay = False
+        self._row = [0.0] * len(self.stages)
+        self._frame_start: Optional[float] = None
+        self._overlay_surface: Optional[pygame.Surface] = None
+        self._overlay_frame = -1
+        self._font: Optional[pygame.font.Font] = None
+
+    @classmethod
+    def get_profiler(cls) -> 'FrameProfiler':
+        """全局共享的实例，按 GAME_CONFIG['PROFILER'] 初始化"""
+        if cls._instance is None:
+            config = GAME_CONFIG['PROFILER']
+            cls._instance = cls(capacity=config['CAPACITY'], enabled=config['ENABLED'])
+            cls._instance.overlay = config['OVERLAY']
+        return cls._instance
+
+    @property
+    def capacity(self) -> int:
+        return len(self.samples)
+
+    def scope(self, name: str):
+        if not self.enabled:
+            return _NULL_SCOPE
+        return _Scope(self._row, self._index[name])
+
+    def toggle(self) -> None:
+        self.enabled = not self.enabled
+        self._frame_start = None
+
+    def reset_frame(self) -> None:
+        """丢弃当前帧已累计的时间，例如暂停恢复后不把暂停时长计入 frame"""
+        self._frame_start = None
+        self._row[:] = [0.0] * len(self.stages)
+
+    def end_frame(self) -> None:
+        """结束当前帧：把各阶段的累计耗时写入环形缓冲区"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if 'frame' in self._index and self._frame_start is not None:
+            self._row[self._index['frame']] = now - self._frame_start
+        self._frame_start = now
+        self.samples[self.frames % self.capacity] = self._row
+        self.frames += 1
+        self._row[:] = [0.0] * len(self.stages)
+
+    def recorded(self) -> np.ndarray:
+        """缓冲区中的帧，按时间先后排列（秒）"""
+        if self.frames <= self.capacity:
+            return self.samples[:self.frames]
+        start = self.frames % self.capacity
+        return np.concatenate([self.samples[start:], self.samples[:start]])
+
+    def percentiles(self, q: Sequence[float] = PERCENTILES) -> Dict[str, Dict[str, float]]:
+        """各阶段耗时的分位数（毫秒）"""
+        data = self.recorded()
+        if len(data) == 0:
+            return {}
+        values = np.percentile(data, q, axis=0) * 1e3
+        return {name: {f'p{p:g}': float(values[j, i]) for j, p in enumerate(q)}
+                for i, name in enumerate(self.stages)}
+
+    def dump(self, path: str) -> None:
+        """把缓冲区写成 CSV（每帧一行）或 JSON（附带分位数），单位为毫秒"""
+        data = self.recorded() * 1e3
+        first = self.frames - len(data)
+        if path.endswith('.json'):
+            with open(path, 'w') as f:
+                json.dump({
+                    'stages': list(self.stages),
+                    'first_frame': first,
+                    'frames_ms': data.round(4).tolist(),
+                    'percentiles_ms': self.percentiles(),
+                }, f)
+        elif path.endswith('.csv'):
+            with open(path, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(('frame',) + self.stages)
+                for i, row in enumerate(data.round(4).tolist()):
+                    writer.writerow([first + i] + row)
+        else:
+            raise ValueError(f"Unsupported profile format: {path}")
+
+    def draw_overlay(self, surface: pygame.Surface, refresh: int = 15) -> pygame.Rect:
+        """在 surface 左上角绘制各阶段的 p50/p95/p99，返回覆盖的区域
+
+        文字每 refresh 帧重新排版一次，其余帧直接 blit 缓存的表面。
+        """
+        if self._overlay_surface is None or self.frames - self._overlay_frame >= refresh:
+            self._overlay_surface = self._render_overlay()
+            self._overlay_frame = self.frames
+        return surface.blit(self._overlay_surface, (4, 4))
+
+    def _render_overlay(self) -> pygame.Surface:
+        if self._font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            self._font = pygame.font.Font(None, 18)
+        stats = self.percentiles()
+        rows = [('stage',) + tuple(f'p{p}' for p in PERCENTILES)]
+        for name in self.stages:
+            values = stats.get(name)
+            rows.append((name,) + tuple(f"{values[f'p{p}']:.2f}" if values else '-'
+                                        for p in PERCENTILES))
+        # 默认字体不是等宽的，按列排版：首列左对齐，数值列右对齐
+        cells = [[self._font.render(text, True, (230, 230, 230)) for text in row] for row in rows]
+        widths = [max(row[i].get_width() for row in cells) for i in range(len(rows[0]))]
+        line_height = self._font.get_linesize()
+        gap = 10
+        overlay = pygame.Surface((sum(widths) + gap * (len(widths) - 1) + 8,
+                                  line_height * len(rows) + 8))
+        overlay.fill((0, 0, 0))
+        for r, row in enumerate(cells):
+            x = 4
+            for i, cell in enumerate(row):
+                left = x if i == 0 else x + widths[i] - cell.get_width()
+                overlay.blit(cell, (left, 4 + r * line_height))
+                x += widths[i] + gap
+        return overlay
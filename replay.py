@@ -0,0 +1,163 @@
+import mmap
+import struct
+import zlib
+import numpy as np
+from typing import Optional
+
+# 每个物理步一条定长记录（小端、紧凑排列，46 字节）
+RECORD_DTYPE = np.dtype([
+    ('tick', '<u4'),
+    ('rotation', '<f8'),
+    ('position', '<f8', (2,)),
+    ('velocity', '<f8', (2,)),
+    ('color_index', 'u1'),
+    ('flags', 'u1'),
+])
+
+# flags 位
+FLAG_COLLISION = 1
+
+MAGIC = b'HEXRPLY1'
+# 文件头：魔数、记录长度、每块记录数、物理频率、是否压缩
+_HEADER = struct.Struct('<8sIIdB3x')
+# 文件尾：索引偏移、帧数、块数、魔数
+_FOOTER = struct.Struct('<QQI8s')
+# 索引项：块偏移、块字节数、块内记录数
+_INDEX_DTYPE = np.dtype([('offset', '<u8'), ('size', '<u4'), ('count', '<u4')])
+
+
+class ReplayWriter:
+    """回放录制器
+
+    记录先缓存在定长数组中，每满 chunk_records 条写出一块（可选 zlib 压缩），
+    close() 时在文件末尾写入块索引。相同的输入总是得到逐字节相同的文件。
+    """
+
+    def __init__(self, path: str, physics_hz: float, chunk_records: int = 1024,
+                 compress: bool = True) -> None:
+        self.path = path
+        self.chunk_records = chunk_records
+        self.compress = compress
+        self.frame_count = 0
+        self._buffer = np.zeros(chunk_records, dtype=RECORD_DTYPE)
+        self._buffered = 0
+        self._index = []
+        self._file = open(path, 'wb')
+        self._file.write(_HEADER.pack(MAGIC, RECORD_DTYPE.itemsize, chunk_records,
+                                      float(physics_hz), int(compress)))
+
+    def write(self, tick: int, rotation: float, position, velocity,
+              color_index: int, flags: int = 0) -> None:
+        """追加一帧"""
+        record = self._buffer[self._buffered]
+        record['tick'] = tick
+        record['rotation'] = rotation
+        record['position'] = (position[0], position[1])
+        record['velocity'] = (velocity[0], velocity[1])
+        record['color_index'] = color_index
+        record['flags'] = flags
+        self._buffered += 1
+        self.frame_count += 1
+        if self._buffered == self.chunk_records:
+            self._flush_chunk()
+
+    def _flush_chunk(self) -> None:
+        if self._buffered == 0:
+            return
+        data = self._buffer[:self._buffered].tobytes()
+        if self.compress:
+            data = zlib.compress(data)
+        self._index.append((self._file.tell(), len(data), self._buffered))
+        self._file.write(data)
+        self._buffered = 0
+
+    def close(self) -> None:
+        """写出剩余记录和索引"""
+        if self._file.closed:
+            return
+        self._flush_chunk()
+        index_offset = self._file.tell()
+        self._file.write(np.array(self._index, dtype=_INDEX_DTYPE).tobytes())
+        self._file.write(_FOOTER.pack(index_offset, self.frame_count, len(self._index), MAGIC))
+        self._file.close()
+
+    def __enter__(self) -> 'ReplayWriter':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class ReplayReader:
+    """回放读取器
+
+    文件以只读方式内存映射。除最后一块外每块的记录数相同，第 n 帧所在的块
+    可以直接算出，因此任意定位都是 O(1)：未压缩时直接在映射上取记录，
+    压缩时只解压该块（最近一块会被缓存，顺序播放时每块只解压一次）。
+    """
+
+    def __init__(self, path: str) -> None:
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, record_size, self.chunk_records, self.physics_hz, compressed = \
+            _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not a replay file: {path}")
+        if record_size != RECORD_DTYPE.itemsize:
+            raise ValueError(f"Unsupported record size: {record_size}")
+        self.compressed = bool(compressed)
+
+        index_offset, self.frame_count, chunk_count, magic = \
+            _FOOTER.unpack_from(self._map, len(self._map) - _FOOTER.size)
+        if magic != MAGIC:
+            raise ValueError(f"Replay file was not closed properly: {path}")
+        self.index = np.frombuffer(self._map, dtype=_INDEX_DTYPE,
+                                   count=chunk_count, offset=index_offset)
+        self._cached_chunk = -1
+        self._cached_records: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return self.frame_count
+
+    def __getitem__(self, frame: int) -> np.void:
+        """读取第 frame 帧（支持负索引）"""
+        if frame < 0:
+            frame += self.frame_count
+        if not 0 <= frame < self.frame_count:
+            raise IndexError(f"Frame {frame} out of range")
+        chunk, row = divmod(frame, self.chunk_records)
+        # 复制出来，避免返回值引用映射导致无法关闭文件
+        return self._chunk(chunk)[row:row + 1].copy()[0]
+
+    def _chunk(self, chunk: int) -> np.ndarray:
+        """取出一块记录"""
+        offset, size, count = self.index[chunk]
+        if not self.compressed:
+            return np.frombuffer(self._map, dtype=RECORD_DTYPE, count=int(count), offset=int(offset))
+        if chunk != self._cached_chunk:
+            data = zlib.decompress(self._map[int(offset):int(offset) + int(size)])
+            self._cached_records = np.frombuffer(data, dtype=RECORD_DTYPE)
+            self._cached_chunk = chunk
+        return self._cached_records
+
+    def frames(self) -> np.ndarray:
+        """全部帧（会读取并解压整个文件）"""
+        if self.frame_count == 0:
+            return np.zeros(0, dtype=RECORD_DTYPE)
+        return np.concatenate([self._chunk(i) for i in range(len(self.index))])
+
+    def close(self) -> None:
+        if self._map.closed:
+            return
+        # 释放对映射的引用后才能关闭
+        self.index = None
+        self._cached_records = None
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> 'ReplayReader':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,139 @@
+import numpy as np
+from config import GAME_CONFIG
+from utils import fixed_dt
+from ball_system import (as_array, centripetal_acceleration, clamp_speed, hexagon_vertices,
+                         integrate, resolve_wall_collisions)
+from typing import Optional
+
+# SplitMix64 常量
+_GOLDEN_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+
+
+class WorldRandom:
+    """每个世界一条独立的随机数流（向量化的 SplitMix64）
+
+    第 i 个世界的序列只由种子和 i 决定，与世界总数和其他世界的抽样无关。
+    """
+
+    def __init__(self, count: int, seed: Optional[int] = None) -> None:
+        self.state = np.random.SeedSequence(seed).generate_state(count, dtype=np.uint64)
+
+    def uniform(self, index: np.ndarray) -> np.ndarray:
+        """为指定世界各抽取一个 [0, 1) 的浮点数"""
+        state = self.state[index] + _GOLDEN_GAMMA
+        self.state[index] = state
+        z = (state ^ (state >> np.uint64(30))) * _MIX_1
+        z = (z ^ (z >> np.uint64(27))) * _MIX_2
+        z ^= z >> np.uint64(31)
+        return (z >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+
+
+class WorldBatch:
+    """无界面的批量模拟：M 个相互独立的（六边形，球）世界同步推进
+
+    所有状态按世界存放在数组中（第一维是世界），逐步规则与
+    Hexagon.update、PhysicsEngine.update 和 Game._handle_collision 一致，
+    不会接触 pygame 的显示或时钟。
+    """
+
+    def __init__(self, count: int, seed: Optional[int] = None,
+                 ball_radius: float = 10, hex_radius: float = 200,
+                 dt: Optional[float] = None) -> None:
+        window = GAME_CONFIG['WINDOW']
+        hexagon_config = GAME_CONFIG['HEXAGON']
+        physics_config = GAME_CONFIG['PHYSICS']
+
+        self.count = count
+        self.dt = fixed_dt() if dt is None else dt
+        self.center = np.array((window['WIDTH'] // 2, window['HEIGHT'] // 2), dtype=np.float64)
+        self.hex_radius = hex_radius
+        self.gravity = as_array(physics_config['GRAVITY'])
+        self.elasticity = physics_config['ELASTICITY']
+        self.friction = physics_config['FRICTION']
+        self.max_speed = physics_config['MAX_BALL_SPEED']
+        self.rng = WorldRandom(count, seed)
+
+        # 六边形状态
+        self.rotation = np.zeros(count, dtype=np.float64)
+        self.rotation_speed = np.full(count, hexagon_config['INITIAL_SPEED'], dtype=np.float64)
+        self.target_rotation_speed = self.rotation_speed.copy()
+        self.speed_change_timer = np.zeros(count, dtype=np.float64)
+
+        # 球状态，初始位置与 Game._init_game_objects 相同
+        self.positions = np.tile(self.center + (0, -50), (count, 1))
+        self.velocities = np.zeros((count, 2), dtype=np.float64)
+        self.radii = np.full(count, ball_radius, dtype=np.float64)
+        self.color_index = np.zeros(count, dtype=np.int64)
+
+        # 统计
+        self.tick = 0
+        self.collision_count = np.zeros(count, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def step(self) -> np.ndarray:
+        """所有世界推进一步，返回本步发生碰撞的世界掩码"""
+        self._update_hexagons()
+
+        # 物理更新，对应 PhysicsEngine.update
+        clamp_speed(self.velocities, self.max_speed)
+        acceleration = self.gravity + centripetal_acceleration(
+            self.positions, self.center, self.rotation_speed)
+        integrate(self.positions, self.velocities, acceleration, self.friction,
+                  self.max_speed, self.dt)
+        vertices = hexagon_vertices(self.rotation, self.center, self.hex_radius)
+        collided = resolve_wall_collisions(
+            self.positions, self.velocities, self.radii, vertices, self.center,
+            self.rotation_speed, self.elasticity, self.max_speed, self.dt).collided
+
+        if collided.any():
+            self._change_colors(np.nonzero(collided)[0])
+            self.collision_count += collided
+
+        self.tick += 1
+        return collided
+
+    def run(self, steps: int) -> np.ndarray:
+        """连续推进多步，返回每个世界在这段时间内的碰撞次数"""
+        before = self.collision_count.copy()
+        for _ in range(steps):
+            self.step()
+        return self.collision_count - before
+
+    def _update_hexagons(self) -> None:
+        """对应 Hexagon.update"""
+        hexagon_config = GAME_CONFIG['HEXAGON']
+        self.speed_change_timer += self.dt
+        due = np.nonzero(
+            self.speed_change_timer >= hexagon_config['SPEED_CHANGE_INTERVAL'] - 1e-9)[0]
+        if len(due):
+            self.speed_change_timer[due] = 0.0
+            self.target_rotation_speed[due] = self._random_rotation_speed(due)
+
+        speed_diff = self.target_rotation_speed - self.rotation_speed
+        approach = 1 - np.exp(-hexagon_config['ROTATION_ACCELERATION'] * self.dt)
+        self.rotation_speed += speed_diff * approach
+        self.rotation = (self.rotation + self.rotation_speed * self.dt) % 360
+
+    def _random_rotation_speed(self, index: np.ndarray) -> np.ndarray:
+        """对应 Hexagon._get_random_rotation_speed"""
+        hexagon_config = GAME_CONFIG['HEXAGON']
+        low = hexagon_config['MIN_ROTATION_SPEED']
+        high = hexagon_config['MAX_ROTATION_SPEED']
+        speed = low + (high - low) * self.rng.uniform(index)
+        direction = np.where(self.rng.uniform(index) < 0.5, -1.0, 1.0)
+        return speed * direction
+
+    def _change_colors(self, index: np.ndarray) -> None:
+        """对应 Game._handle_collision：换成另一种随机颜色"""
+        palette_size = len(GAME_CONFIG['COLORS']['BALL_COLORS'])
+        offset = 1 + (self.rng.uniform(index) * (palette_size - 1)).astype(np.int64)
+        self.color_index[index] = (self.color_index[index] + offset) % palette_size
+
+    def colors(self) -> np.ndarray:
+        """每个世界中球的 RGB 颜色 (M, 3)"""
+        palette = np.asarray(GAME_CONFIG['COLORS']['BALL_COLORS'], dtype=np.uint8)
+        return palette[self.color_index]
@@ -11,6 +11,16 @@ from test_physics_engine import TestPhysicsEngine
 from test_renderer import TestRenderer
 from test_game_state import TestGameState
 from test_integration import TestGameIntegration
+from test_ball_system import TestBallSystem
+from test_simulation import TestWorldBatch
+from test_geometry import TestConvexPolygon
+from test_replay import TestReplay
+from test_trajectory import TestTrajectory
+from test_frame_export import TestFrameExport
+from test_pipeline import TestPipeline
+from test_profiler import TestProfiler
+from test_metrics import TestMetrics
+from test_logger import TestLogger
 
 def run_tests():
     # 创建测试套件
@@ -22,7 +32,17 @@ def run_tests():
         TestPhysicsEngine,
         TestRenderer,
         TestGameState,
-        TestGameIntegration
+        TestGameIntegration,
+        TestBallSystem,
+        TestWorldBatch,
+        TestConvexPolygon,
+        TestReplay,
+        TestTrajectory,
+        TestFrameExport,
+        TestPipeline,
+        TestProfiler,
+        TestMetrics,
+        TestLogger
     ]
     
     for test_class in test_classes:
@@ -0,0 +1,268 @@
+import unittest
+import random
+import numpy as np
+from pygame.math import Vector2
+from ball_system import (BallSystem, BallView, clamp_speed, force_in_contact_cone,
+                         grid_candidate_pairs)
+from game_engine import PhysicsEngine
+from game_objects import Ball, Hexagon
+from config import GAME_CONFIG
+
+class TestBallSystem(unittest.TestCase):
+    def setUp(self):
+        self.physics = PhysicsEngine(
+            GAME_CONFIG['PHYSICS']['GRAVITY'],
+            GAME_CONFIG['PHYSICS']['ELASTICITY'],
+            GAME_CONFIG['PHYSICS']['FRICTION']
+        )
+
+    def test_add_and_view(self):
+        """测试添加球与单球视图"""
+        system = BallSystem()
+        view = system.add(Vector2(400, 250), 10, (255, 0, 0))
+
+        self.assertIsInstance(view, BallView)
+        self.assertIsInstance(view, Ball)
+        self.assertEqual(len(system), 1)
+        self.assertEqual(view.position, Vector2(400, 250))
+        self.assertEqual(view.color, (255, 0, 0))
+
+        # 视图写入直接作用于数组
+        view.velocity = Vector2(3, 4)
+        view.color = (0, 255, 0)
+        self.assertTrue(np.array_equal(system.velocities[0], [3, 4]))
+        self.assertTrue(np.array_equal(system.colors[0], [0, 255, 0]))
+
+    def test_add_grows_geometrically(self):
+        """测试逐个添加时缓冲区按倍数增长，已有数据和视图保持有效"""
+        system = BallSystem.from_arrays([(100, 100)], [(1, 2)], 5, (0, 0, 255))
+        first = system.view(0)
+        reallocations = 0
+        buffer = None
+        for i in range(1000):
+            system.add((i, i + 1), 10, (255, 0, 0), velocity=(i, 0))
+            if system.positions.base is not buffer:
+                buffer = system.positions.base
+                reallocations += 1
+        self.assertEqual(len(system), 1001)
+        self.assertLessEqual(reallocations, 10)
+        self.assertEqual(first.position, Vector2(100, 100))
+        self.assertEqual(first.color, (0, 0, 255))
+        self.assertTrue(np.array_equal(system.positions[-1], [999, 1000]))
+        self.assertTrue(np.array_equal(system.velocities[-1], [999, 0]))
+        self.assertEqual(system.radii.shape, (1001,))
+        system.extend([(1, 1), (2, 2)], np.zeros((2, 2)), 3, (0, 255, 0))
+        self.assertEqual(len(system), 1003)
+        self.assertTrue(np.array_equal(system.colors[-1], [0, 255, 0]))
+
+    def test_view_uses_scalar_api(self):
+        """测试视图可以直接使用单球物理接口"""
+        system = BallSystem()
+        view = system.add(Vector2(400, 250), 10, (255, 0, 0))
+        hexagon = Hexagon(Vector2(400, 300), 200, (200, 200, 255))
+
+        self.physics.update(view, hexagon)
+
+        self.assertNotEqual(system.positions[0, 1], 250)
+
+    def test_clamp_speed(self):
+        """测试批量速度限制"""
+        velocities = np.array([[2000.0, 0.0], [1.0, 1.0]])
+        clamped = clamp_speed(velocities, 1200.0)
+
+        self.assertTrue(np.array_equal(clamped, [True, False]))
+        self.assertAlmostEqual(np.hypot(*velocities[0]), 1200.0)
+        self.assertTrue(np.array_equal(velocities[1], [1.0, 1.0]))
+
+    def test_matches_scalar_update(self):
+        """测试批量更新与逐球更新结果一致"""
+        starts = [(400, 200, 0, 300), (350, 300, 480, -180), (450, 380, -360, 360)]
+        balls = []
+        for x, y, vx, vy in starts:
+            ball = Ball(Vector2(x, y), 10, (255, 0, 0))
+            ball.velocity = Vector2(vx, vy)
+            balls.append(ball)
+        system = BallSystem.from_arrays(
+            [(x, y) for x, y, _, _ in starts],
+            [(vx, vy) for _, _, vx, vy in starts],
+            10, (255, 0, 0)
+        )
+        hexagon = Hexagon(Vector2(400, 300), 200, (200, 200, 255))
+        self.physics.ball_collisions = False  # 逐球更新不包含球间碰撞
+
+        for _ in range(120):
+            expected = [self.physics.update(ball, hexagon) for ball in balls]
+            collided = self.physics.update_system(system, hexagon)
+            self.assertEqual(list(collided), expected)
+
+        for i, ball in enumerate(balls):
+            self.assertAlmostEqual(system.positions[i, 0], ball.position.x, places=6)
+            self.assertAlmostEqual(system.positions[i, 1], ball.position.y, places=6)
+            self.assertAlmostEqual(system.velocities[i, 0], ball.velocity.x, places=6)
+            self.assertAlmostEqual(system.velocities[i, 1], ball.velocity.y, places=6)
+
+    def test_paused(self):
+        """测试暂停时不更新"""
+        system = BallSystem.from_arrays([(400, 300)], [(1, 1)], 10, (255, 0, 0))
+        self.physics.state.paused = True
+        self.physics.update_system(system, None)
+        self.assertTrue(np.array_equal(system.positions[0], [400, 300]))
+
+    def test_grid_pairs_match_brute_force(self):
+        """测试网格广相不漏检且没有重复"""
+        rng = np.random.default_rng(7)
+        positions = rng.uniform(200, 600, (400, 2))
+        radii = rng.uniform(2, 8, 400)
+
+        pairs_i, pairs_j = grid_candidate_pairs(positions, radii, (200, 200), (600, 600))
+        candidates = set(zip(np.minimum(pairs_i, pairs_j), np.maximum(pairs_i, pairs_j)))
+        self.assertEqual(len(candidates), len(pairs_i))
+
+        delta = positions[:, None, :] - positions[None, :, :]
+        touching = np.hypot(delta[..., 0], delta[..., 1]) < radii[:, None] + radii[None, :]
+        expected = set(zip(*np.nonzero(np.triu(touching, 1))))
+        self.assertTrue(expected <= candidates)
+
+    def test_ball_ball_collision(self):
+        """测试两球正碰后按弹性系数反弹"""
+        system = BallSystem.from_arrays(
+            [(390, 300), (409, 300)], [(300, 0), (-300, 0)], 10, (255, 0, 0))
+        self.physics.gravity = Vector2(0, 0)
+        self.physics.friction = 1.0
+        hexagon = Hexagon(Vector2(400, 300), 200, (200, 200, 255))
+        hexagon.rotation_speed = 0.0
+
+        collided = self.physics.update_system(system, hexagon)
+
+        self.assertTrue(collided.all())
+        elasticity = GAME_CONFIG['PHYSICS']['ELASTICITY']
+        self.assertAlmostEqual(system.velocities[0, 0], -300 * elasticity)
+        self.assertAlmostEqual(system.velocities[1, 0], 300 * elasticity)
+        # 重叠部分被推开
+        gap = system.positions[1, 0] - system.positions[0, 0]
+        self.assertGreaterEqual(gap, 20 - 1e-9)
+
+    def test_ball_collisions_disabled(self):
+        """测试关闭球间碰撞后球互相穿过"""
+        system = BallSystem.from_arrays(
+            [(390, 300), (409, 300)], [(300, 0), (-300, 0)], 10, (255, 0, 0))
+        self.physics.ball_collisions = False
+        self.physics.gravity = Vector2(0, 0)
+
+        collided = self.physics.update_system(system, None)
+
+        self.assertFalse(collided.any())
+        self.assertGreater(system.velocities[0, 0], 0)
+
+    def test_crowded_balls_stay_inside(self):
+        """测试大量球互相挤压时，球间的位置修正不会把球推到六边形外"""
+        rng = np.random.default_rng(0)
+        angle = rng.uniform(0, 2 * np.pi, 200)
+        distance = 150 * np.sqrt(rng.uniform(0, 1, 200))
+        positions = np.stack([400 + distance * np.cos(angle),
+                              300 + distance * np.sin(angle)], axis=1)
+        system = BallSystem.from_arrays(positions, np.zeros_like(positions), 10, (255, 0, 0))
+        hexagon = Hexagon(Vector2(400, 300), 200, (200, 200, 255), rng=random.Random(0))
+
+        for _ in range(400):
+            hexagon.update(GAME_CONFIG['HEXAGON']['ROTATION_ACCELERATION'])
+            self.physics.update_system(system, hexagon)
+            margin = hexagon.geometry().edge_distances_many(system.positions).min(axis=1)
+            self.assertTrue(np.all(margin >= 0), f"{np.count_nonzero(margin < 0)} balls outside")
+
+    def _settle(self, steps=300):
+        """在静止的六边形底部放一排球并运行到全部休眠"""
+        self.physics.sleeping = True
+        hexagon = Hexagon(Vector2(400, 300), 200, (200, 200, 255))
+        hexagon.rotation_speed = 0.0
+        hexagon.target_rotation_speed = 0.0
+        positions = [(340 + 15 * k, 440) for k in range(6)]
+        system = BallSystem.from_arrays(positions, np.zeros((6, 2)), 5, (255, 0, 0))
+        for _ in range(steps):
+            self.physics.update_system(system, hexagon)
+        return system, hexagon
+
+    def test_sleep_disabled_by_default(self):
+        """测试默认不启用休眠"""
+        system = BallSystem.from_arrays([(400, 300)], [(0, 0)], 10, (255, 0, 0))
+        self.physics.update_system(system, Hexagon(Vector2(400, 300), 200, (200, 200, 255)))
+        self.assertIsNone(system.sleep)
+
+    def test_resting_balls_fall_asleep(self):
+        """测试贴墙静止的球进入休眠并停在墙内"""
+        system, hexagon = self._settle()
+        stats = self.physics.sleep_stats(system)
+
+        self.assertEqual(stats['asleep'], 6)
+        self.assertGreater(stats['skipped_updates'], 0)
+        self.assertTrue(np.all(system.velocities == 0))
+        margin = hexagon.geometry().edge_distances_many(system.positions).min(axis=1)
+        self.assertTrue(np.all(margin >= system.radii))
+
+    def test_sleeping_balls_follow_wall(self):
+        """测试休眠的球跟随墙壁转动，角加速度让墙壁托不住时醒来"""
+        system, hexagon = self._settle()
+        before = system.positions - (400, 300)
+
+        hexagon.rotation = 5.0
+        self.physics.update_system(system, hexagon)
+        after = system.positions - (400, 300)
+        self.assertEqual(self.physics.sleep_stats(system)['asleep'], 6)
+        self.assertTrue(np.allclose(np.hypot(*after.T), np.hypot(*before.T)))
+        turned = np.degrees(np.arctan2(after[:, 1], after[:, 0]) -
+                            np.arctan2(before[:, 1], before[:, 0]))
+        self.assertTrue(np.allclose(turned, 5.0))
+
+        hexagon.rotation_speed = 60.0
+        self.physics.update_system(system, hexagon)
+        self.assertEqual(self.physics.sleep_stats(system)['asleep'], 0)
+        self.assertEqual(self.physics.wake_events, self.physics.sleep_events)
+
+    def test_contact_cone(self):
+        """测试所需的支撑力是否落在接触方向张成的锥内"""
+        up, right = (0.0, -1.0), (1.0, 0.0)
+        lower_left, lower_right = (-0.866, 0.5), (0.866, 0.5)
+        force = np.array([(0.0, -1.0), (0.5, -1.0), (0.5, -1.0), (1.0, 0.0), (0.0, 1.0),
+                          (0.0, 1.0)])
+        rows = np.array([0, 1, 2, 2, 3, 4, 4, 4])
+        directions = np.array([up, up, up, right, up, up, lower_left, lower_right])
+        held = force_in_contact_cone(force, rows, directions, np.radians(10))
+        # 正对法线；偏出 26° 超过放宽量；落在两个接触之间；偏出 90°；
+        # 三个接触相隔 120°，覆盖整个平面；没有接触
+        self.assertEqual(list(held), [True, False, True, False, True, False])
+
+    def test_sleep_under_rotation(self):
+        """测试六边形按默认配置不停旋转、变速时，贴墙托住的球仍然可以休眠"""
+        self.physics.sleeping = True
+        rng = np.random.default_rng(0)
+        angle = rng.uniform(0, 2 * np.pi, 60)
+        distance = 150 * np.sqrt(rng.uniform(0, 1, 60))
+        positions = np.stack([400 + distance * np.cos(angle),
+                              300 + distance * np.sin(angle)], axis=1)
+        system = BallSystem.from_arrays(positions, np.zeros_like(positions), 10, (255, 0, 0))
+        hexagon = Hexagon(Vector2(400, 300), 200, (200, 200, 255), rng=random.Random(0))
+
+        steps = 600
+        for _ in range(steps):
+            hexagon.update(GAME_CONFIG['HEXAGON']['ROTATION_ACCELERATION'])
+            self.physics.update_system(system, hexagon)
+
+        stats = self.physics.sleep_stats(system)
+        self.assertGreater(stats['skipped_updates'] / (len(system) * steps), 0.02)
+        # 平均每次休眠持续多步，而不是入睡后立刻被唤醒
+        self.assertGreater(stats['skipped_updates'], 5 * stats['sleep_events'])
+        margin = hexagon.geometry().edge_distances_many(system.positions).min(axis=1)
+        self.assertTrue(np.all(margin >= 0))
+
+    def test_neighbor_hit_wakes(self):
+        """测试被醒着的球撞到的休眠球会醒来"""
+        system, hexagon = self._settle()
+        woken = np.zeros(6, dtype=bool)
+        woken[5] = True
+        self.physics._wake(system.sleep, woken)
+        system.velocities[5] = (-600, 0)
+
+        for _ in range(5):
+            self.physics.update_system(system, hexagon)
+
+        self.assertFalse(system.sleep.asleep[4])
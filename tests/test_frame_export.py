@@ -0,0 +1,99 @@
+import io
+import os
+import tempfile
+import threading
+import unittest
+import numpy as np
+import pygame
+from game import Game
+from frame_export import (FramePool, HeadlessRenderer, PngSequenceWriter, RawVideoWriter,
+                          encode_png, export_frames, open_writer)
+
+SIZE = (800, 600)
+
+class TestFrameExport(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.renderer = HeadlessRenderer(SIZE, 2)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_headless_renderer_offscreen(self):
+        """测试离屏渲染器在内存表面上绘制，不需要窗口"""
+        game = Game(seed=1, headless=True)
+        self.renderer.render([game.hexagon, game.ball])
+        self.assertEqual(self.renderer.screen.get_size(), SIZE)
+        center = self.renderer.screen.get_at((int(game.ball.position.x), int(game.ball.position.y)))
+        self.assertGreater(center[0], 200)
+
+    def test_encode_png_roundtrip(self):
+        """测试 PNG 编码能被 pygame 正确读回"""
+        rgb = np.random.default_rng(0).integers(0, 256, (30, 40, 3), dtype=np.uint8)
+        path = self._path('frame.png')
+        with open(path, 'wb') as f:
+            f.write(encode_png(rgb))
+        loaded = pygame.surfarray.array3d(pygame.image.load(path)).transpose(1, 0, 2)
+        self.assertTrue(np.array_equal(loaded, rgb))
+
+    def test_png_sequence_matches_screen(self):
+        """测试导出的 PNG 序列与离屏画面逐像素一致"""
+        game = Game(seed=2, headless=True)
+        with PngSequenceWriter(self._path('frames'), SIZE, workers=3, pool_size=2) as writer:
+            export_frames(game, writer, 5, self.renderer)
+        self.assertEqual(sorted(os.listdir(self._path('frames'))),
+                         [f'frame_{i:06d}.png' for i in range(5)])
+        last = pygame.image.load(self._path('frames/frame_000004.png'))
+        self.assertEqual(pygame.image.tobytes(last, 'RGB'),
+                         pygame.image.tobytes(self.renderer.screen, 'RGB'))
+
+    def test_raw_stream_in_order(self):
+        """测试原始视频流按帧顺序写出"""
+        stream = io.BytesIO()
+        stream.close = lambda: None
+        expected = []
+        game = Game(seed=3, headless=True)
+        with RawVideoWriter(stream, SIZE, pool_size=2) as writer:
+            for _ in range(4):
+                game.step()
+                self.renderer.render([game.hexagon, game.ball])
+                expected.append(pygame.image.tobytes(self.renderer.screen, 'RGB'))
+                writer.write(self.renderer.screen)
+        self.assertEqual(stream.getvalue(), b''.join(expected))
+
+    def test_pool_bounds_memory(self):
+        """测试缓冲池耗尽时 acquire 阻塞，直到有缓冲归还"""
+        pool = FramePool((4, 3), count=2)
+        first, second = pool.acquire(), pool.acquire()
+        self.assertEqual(first.shape, (3, 4, 3))
+        acquired = []
+        thread = threading.Thread(target=lambda: acquired.append(pool.acquire()))
+        thread.start()
+        thread.join(0.1)
+        self.assertEqual(acquired, [])
+        pool.release(first)
+        thread.join(1)
+        self.assertIs(acquired[0], first)
+
+    def test_writer_error_propagates(self):
+        """测试写出线程中的异常会在 close 时抛出"""
+        class Broken(io.RawIOBase):
+            def write(self, data):
+                raise OSError("disk full")
+        writer = RawVideoWriter(Broken(), SIZE, pool_size=1)
+        writer.write(self.renderer.screen)
+        with self.assertRaises(OSError):
+            writer.close()
+
+    def test_open_writer_by_target(self):
+        """测试按目标选择输出方式"""
+        with open_writer(self._path('clip.rgb'), SIZE) as writer:
+            self.assertIsInstance(writer, RawVideoWriter)
+        with open_writer(self._path('frames'), SIZE) as writer:
+            self.assertIsInstance(writer, PngSequenceWriter)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -37,19 +37,21 @@ class TestGameObjects(unittest.TestCase):
         gravity = Vector2(0, 0.5)
         friction = 0.99
         
+        dt = 1 / 60
+        
         initial_pos = ball.position.copy()
-        ball.update(gravity, friction)
+        ball.update(gravity, friction, dt)
         
-        # 验证位置和速度的变化
+        # 验证位置和速度的变化（加速度与摩擦都按秒计）
         self.assertNotEqual(ball.position, initial_pos)
-        self.assertEqual(ball.velocity.y, gravity.y * friction)
+        self.assertAlmostEqual(ball.velocity.y, gravity.y * dt * friction ** dt)
         
     def test_ball_velocity_limit(self):
         """测试球体速度限制"""
         ball = Ball(Vector2(100, 100), 10, (255, 0, 0))
         
         # 设置一个很大的速度
-        ball.velocity = Vector2(100, 100)
+        ball.velocity = Vector2(1000, 1000)
         
         # 应用重力和摩擦力
         gravity = Vector2(0, 0.5)
@@ -117,12 +119,39 @@ class TestGameObjects(unittest.TestCase):
         hex = Hexagon(Vector2(400, 300), 200, (200, 200, 255))
         initial_speed = hex.rotation_speed
         
-        # 运行足够的帧数触发速度变化
-        for _ in range(GAME_CONFIG['HEXAGON']['SPEED_CHANGE_INTERVAL'] + 1):
+        # 运行足够的步数触发速度变化
+        steps = round(GAME_CONFIG['HEXAGON']['SPEED_CHANGE_INTERVAL'] *
+                      GAME_CONFIG['TIMESTEP']['PHYSICS_HZ'])
+        for _ in range(steps + 1):
             hex.update(GAME_CONFIG['HEXAGON']['ROTATION_ACCELERATION'])
         
         # 验证速度在合理范围内
         self.assertGreaterEqual(hex.rotation_speed, 
                                GAME_CONFIG['HEXAGON']['MIN_ROTATION_SPEED'] * -1)
         self.assertLessEqual(hex.rotation_speed, 
-                            GAME_CONFIG['HEXAGON']['MAX_ROTATION_SPEED']) 
\ No newline at end of file
+                            GAME_CONFIG['HEXAGON']['MAX_ROTATION_SPEED'])
+
+    def test_hexagon_geometry_snapshot(self):
+        """测试六边形几何快照只在角度改变时重建"""
+        hex = Hexagon(Vector2(400, 300), 200, (200, 200, 255))
+        geometry = hex.geometry()
+        
+        # 同一角度下物理和渲染拿到同一个快照
+        self.assertIs(hex.geometry(), geometry)
+        hex.draw(self.test_surface)
+        self.assertIs(hex.geometry(), geometry)
+        self.assertEqual(len(geometry.edges), 6)
+        self.assertEqual(geometry.center, (400, 300))
+        
+        # 角度改变后快照失效
+        hex.update(GAME_CONFIG['HEXAGON']['ROTATION_ACCELERATION'])
+        self.assertIsNot(hex.geometry(), geometry)
+        
+    def test_hexagon_points_match_snapshot(self):
+        """测试顶点与 get_hex_points 一致"""
+        from utils import get_hex_points
+        hex = Hexagon(Vector2(400, 300), 200, (200, 200, 255))
+        hex.rotation = 33.0
+        for (x1, y1), (x2, y2) in zip(hex.get_points(), get_hex_points(33.0)):
+            self.assertAlmostEqual(x1, x2)
+            self.assertAlmostEqual(y1, y2)
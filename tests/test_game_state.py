@@ -1,3 +1,4 @@
+import time
 import unittest
 import pygame
 from game_engine import GameState
@@ -31,4 +32,18 @@ class TestGameState(unittest.TestCase):
         
         initial_pause_state = self.state.paused
         self.state.handle_events()
-        self.assertNotEqual(self.state.paused, initial_pause_state) 
\ No newline at end of file
+        self.assertNotEqual(self.state.paused, initial_pause_state)
+        
+    def test_wait_events_timeout(self):
+        """测试没有事件时阻塞到超时并返回 False"""
+        pygame.event.clear()
+        start = time.perf_counter()
+        self.assertFalse(self.state.wait_events(50))
+        self.assertGreaterEqual(time.perf_counter() - start, 0.04)
+        
+    def test_wait_events_handles_keys(self):
+        """测试等待到的按键照常处理，并要求重绘"""
+        self.state.paused = True
+        pygame.event.post(pygame.event.Event(KEYDOWN, {'key': K_SPACE}))
+        self.assertTrue(self.state.wait_events(1000))
+        self.assertFalse(self.state.paused)
@@ -0,0 +1,73 @@
+import unittest
+import numpy as np
+from pygame.math import Vector2
+from geometry import ConvexPolygon
+from utils import get_hex_points, point_in_polygon, get_closest_point_on_line
+
+class TestConvexPolygon(unittest.TestCase):
+    def setUp(self):
+        self.rotation = 17.5
+        self.points = get_hex_points(self.rotation)
+        self.polygon = ConvexPolygon(self.points)
+        rng = np.random.default_rng(11)
+        self.samples = rng.uniform((150, 50), (650, 550), (500, 2))
+
+    def test_regular_matches_hex_points(self):
+        """测试正多边形顶点与 get_hex_points 一致"""
+        regular = ConvexPolygon.regular((400, 300), 200, 6, self.rotation)
+        for (x1, y1), (x2, y2) in zip(regular.vertices, self.points):
+            self.assertAlmostEqual(x1, x2)
+            self.assertAlmostEqual(y1, y2)
+        # 解析法线与通用构造结果一致
+        for (n1, o1), (n2, o2) in zip(zip(regular.normals, regular.offsets),
+                                      zip(self.polygon.normals, self.polygon.offsets)):
+            self.assertAlmostEqual(n1[0], n2[0])
+            self.assertAlmostEqual(n1[1], n2[1])
+            self.assertAlmostEqual(o1, o2)
+
+    def test_contains_matches_ray_casting(self):
+        """测试包含判断与射线法结果一致"""
+        for x, y in self.samples:
+            self.assertEqual(self.polygon.contains((x, y)),
+                             point_in_polygon((x, y), self.points))
+
+    def test_winding_independent(self):
+        """测试顶点绕向不影响内外判断"""
+        reversed_polygon = ConvexPolygon(list(reversed(self.points)))
+        self.assertTrue(reversed_polygon.contains((400, 300)))
+        self.assertFalse(reversed_polygon.contains((400, 50)))
+
+    def test_contains_many(self):
+        """测试批量包含判断"""
+        expected = [self.polygon.contains(p) for p in self.samples]
+        self.assertEqual(list(self.polygon.contains_many(self.samples)), expected)
+
+    def test_closest_edge_matches_segments(self):
+        """测试最近边查询与逐段计算一致"""
+        indices, closest_many, dist_many = self.polygon.closest_edges_many(self.samples)
+        for n, point in enumerate(self.samples):
+            best_dist = float('inf')
+            best_index = -1
+            for i in range(6):
+                closest = get_closest_point_on_line(
+                    point, self.points[i], self.points[(i + 1) % 6])
+                dist = (Vector2(*point) - closest).length()
+                if dist < best_dist:
+                    best_dist, best_index = dist, i
+            index, _, dist = self.polygon.closest_edge(point)
+            self.assertEqual(index, best_index)
+            self.assertAlmostEqual(dist, best_dist)
+            self.assertEqual(indices[n], best_index)
+            self.assertAlmostEqual(dist_many[n], best_dist)
+
+    def test_signed_distance(self):
+        """测试中心点到边界的距离等于内切圆半径"""
+        self.assertAlmostEqual(self.polygon.signed_distance((400, 300)),
+                               200 * np.cos(np.pi / 6))
+        self.assertLess(self.polygon.signed_distance((400, 50)), 0)
+
+    def test_inward_normals(self):
+        """测试法线为单位长度且指向内部"""
+        for (nx, ny), (x, y) in zip(self.polygon.normals, self.points):
+            self.assertAlmostEqual(nx * nx + ny * ny, 1.0)
+            self.assertGreater(nx * (400 - x) + ny * (300 - y), 0)
@@ -40,4 +40,14 @@ class TestGameIntegration(unittest.TestCase):
         initial_pos = self.game.ball.position.copy()
         self.game.physics.state = self.game.state  # 同步状态
         self.game.physics.update(self.game.ball, self.game.hexagon)
-        self.assertEqual(self.game.ball.position, initial_pos) 
\ No newline at end of file
+        self.assertEqual(self.game.ball.position, initial_pos)
+        
+    def test_paused_run_idles(self):
+        """测试暂停时主循环不推进物理、不重绘"""
+        self.game.state.paused = True
+        renders = []
+        self.game.renderer.render = lambda objects: renders.append(objects)
+        pygame.time.set_timer(pygame.QUIT, 200, loops=1)
+        self.game.run()
+        self.assertEqual(self.game.tick, 0)
+        self.assertEqual(renders, [])
@@ -0,0 +1,135 @@
+import logging
+import queue
+import threading
+import unittest
+from logging.handlers import QueueListener
+from pygame.math import Vector2
+from config import GAME_CONFIG
+from game_engine import PhysicsEngine, logger as engine_logger
+from game_objects import Ball
+from logger import RateLimitedQueueHandler
+
+class _Collect(logging.Handler):
+    """记录收到的消息和处理所在的线程"""
+
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+        self.threads = set()
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+        self.threads.add(threading.current_thread().name)
+
+class _CountingStr:
+    def __init__(self):
+        self.calls = 0
+
+    def __str__(self):
+        self.calls += 1
+        return 'value'
+
+class TestLogger(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.queue = queue.SimpleQueue()
+        self.handler = RateLimitedQueueHandler(self.queue, burst=2, period=10.0,
+                                               clock=lambda: self.now)
+        self.logger = logging.getLogger(f'test.{self.id()}')
+        self.logger.propagate = False
+        self.logger.addHandler(self.handler)
+
+    def drain(self):
+        messages = []
+        while not self.queue.empty():
+            messages.append(self.queue.get().getMessage())
+        return messages
+
+    def test_rate_limit_and_summary(self):
+        """测试同一模板在窗口内超过 burst 的记录被抑制，下个窗口先输出汇总"""
+        for i in range(5):
+            self.logger.error("fault %d", i)
+        self.logger.error("other")
+        self.assertEqual(self.drain(), ['fault 0', 'fault 1', 'other'])
+        self.now = 12.0
+        self.logger.error("fault %d", 5)
+        messages = self.drain()
+        self.assertEqual(len(messages), 2)
+        self.assertIn('Suppressed 3 similar messages', messages[0])
+        self.assertIn('fault %d', messages[0])
+        self.assertEqual(messages[1], 'fault 5')
+
+    def test_rate_key(self):
+        """测试 extra 中的 rate_key 可以把不同模板归为一组"""
+        for text in ('a', 'b', 'c'):
+            self.logger.warning(text, extra={'rate_key': 'shared'})
+        self.assertEqual(self.drain(), ['a', 'b'])
+
+    def test_flush_suppressed(self):
+        """测试退出前补发未汇报的抑制计数"""
+        for _ in range(4):
+            self.logger.error("fault")
+        self.drain()
+        self.handler.flush_suppressed()
+        messages = self.drain()
+        self.assertEqual(len(messages), 1)
+        self.assertIn('Suppressed 2 similar messages', messages[0])
+        self.handler.flush_suppressed()
+        self.assertEqual(self.drain(), [])
+
+    def test_windows_stay_bounded(self):
+        """测试大量各不相同的消息不会让分组无限增长，被淘汰分组的抑制计数会补发汇总"""
+        self.handler.max_windows = 16
+        for _ in range(4):
+            self.logger.error("fault")
+        self.drain()
+
+        # 同一窗口内：超过上限时淘汰最早的分组
+        for i in range(1000):
+            self.logger.error(f"distinct {i}")
+            self.assertLessEqual(len(self.handler._windows), 16)
+        summaries = [m for m in self.drain() if m.startswith('Suppressed')]
+        self.assertEqual(len(summaries), 1)
+        self.assertIn('Suppressed 2 similar messages', summaries[0])
+
+        # 时间推进：过期的分组被淘汰
+        for i in range(1000):
+            self.now += 1.0
+            self.logger.error(f"later {i}")
+            self.assertLessEqual(len(self.handler._windows), 16)
+        self.assertEqual(len(self.drain()), 1000)
+
+    def test_lazy_formatting_on_listener_thread(self):
+        """测试调用线程不格式化消息，输出在监听线程中完成"""
+        collect = _Collect()
+        listener = QueueListener(self.queue, collect)
+        argument = _CountingStr()
+        self.logger.error("lazy %s", argument)
+        self.assertEqual(argument.calls, 0)
+        listener.start()
+        listener.stop()
+        self.assertEqual(collect.messages, ['lazy value'])
+        self.assertNotIn(threading.current_thread().name, collect.threads)
+
+    def test_physics_error_is_rate_limited(self):
+        """测试物理更新中反复出现的异常只按限流输出"""
+        handler = RateLimitedQueueHandler(self.queue, burst=1, period=60.0,
+                                          clock=lambda: self.now)
+        saved = engine_logger.handlers[:]
+        engine_logger.handlers[:] = [handler]
+        try:
+            physics = PhysicsEngine(GAME_CONFIG['PHYSICS']['GRAVITY'],
+                                    GAME_CONFIG['PHYSICS']['ELASTICITY'],
+                                    GAME_CONFIG['PHYSICS']['FRICTION'])
+            ball = Ball(Vector2(400, 300), 10, GAME_CONFIG['COLORS']['BALL_COLORS'][0])
+            ball.velocity = None  # 每次更新都会抛出异常
+            for _ in range(10):
+                self.assertFalse(physics.update(ball, None))
+        finally:
+            engine_logger.handlers[:] = saved
+        messages = self.drain()
+        self.assertEqual(len(messages), 1)
+        self.assertTrue(messages[0].startswith('Physics update error:'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import os
+import tempfile
+import unittest
+import urllib.request
+import numpy as np
+from pygame.math import Vector2
+from config import GAME_CONFIG
+from game_engine import PhysicsEngine
+from ball_system import BallSystem
+from game_objects import Ball, Hexagon
+from metrics import MetricsExporter, MetricsRegistry
+from utils import GlowSurfaceCache
+
+class TestMetrics(unittest.TestCase):
+    def test_counter_and_gauge(self):
+        """测试同名同标签只登记一次，计数和当前值按文本格式导出"""
+        registry = MetricsRegistry()
+        hits = registry.counter('hits_total', "命中", cache='glow')
+        self.assertIs(registry.counter('hits_total', "命中", cache='glow'), hits)
+        hits.inc()
+        hits.inc(2)
+        registry.counter('hits_total', "命中", cache='hexagon').inc()
+        level = registry.gauge('level', "当前值")
+        level.set(2.5)
+        level.dec()
+        text = registry.render()
+        self.assertIn('# TYPE hits_total counter', text)
+        self.assertIn('hits_total{cache="glow"} 3', text)
+        self.assertIn('hits_total{cache="hexagon"} 1', text)
+        self.assertIn('level 1.5', text)
+        with self.assertRaises(ValueError):
+            registry.gauge('hits_total', "命中")
+
+    def test_callback_metric(self):
+        """测试带 fn 的指标在导出时才读取值"""
+        registry = MetricsRegistry()
+        source = {'value': 1}
+        registry.counter('external_total', "外部计数", fn=lambda: source['value'])
+        source['value'] = 7
+        self.assertIn('external_total 7', registry.render())
+
+    def test_histogram(self):
+        """测试直方图的桶为累计计数，并输出 _sum 与 _count"""
+        registry = MetricsRegistry()
+        histogram = registry.histogram('frame_seconds', "帧耗时", buckets=(0.01, 0.1))
+        for value in (0.005, 0.01, 0.05, 1.0):
+            histogram.observe(value)
+        text = registry.render()
+        self.assertIn('frame_seconds_bucket{le="0.01"} 2', text)
+        self.assertIn('frame_seconds_bucket{le="0.1"} 3', text)
+        self.assertIn('frame_seconds_bucket{le="+Inf"} 4', text)
+        self.assertIn('frame_seconds_sum 1.065', text)
+        self.assertIn('frame_seconds_count 4', text)
+
+    def test_physics_counters(self):
+        """测试物理更新累加碰撞和速度截断计数"""
+        registry = MetricsRegistry.get_registry()
+        collisions = registry.get('physics_collisions_total', path='discrete')
+        clamps = registry.get('physics_speed_clamps_total', site='pre_update')
+        before = collisions.get(), clamps.get()
+        physics = PhysicsEngine(GAME_CONFIG['PHYSICS']['GRAVITY'],
+                                GAME_CONFIG['PHYSICS']['ELASTICITY'],
+                                GAME_CONFIG['PHYSICS']['FRICTION'])
+        hexagon = Hexagon(Vector2(400, 300), 200, GAME_CONFIG['COLORS']['HEXAGON'])
+        ball = Ball(Vector2(400, 300), 10, GAME_CONFIG['COLORS']['BALL_COLORS'][0])
+        ball.velocity = Vector2(5000, 0)
+        for _ in range(30):
+            physics.update(ball, hexagon)
+        self.assertGreater(collisions.get(), before[0])
+        self.assertGreater(clamps.get(), before[1])
+
+    def test_batch_physics_counters(self):
+        """测试批量更新累加碰撞、速度截断和推出修正计数"""
+        registry = MetricsRegistry.get_registry()
+        counters = [registry.get('physics_collisions_total', path='batch'),
+                    registry.get('physics_speed_clamps_total', site='batch'),
+                    registry.get('physics_push_outs_total', path='batch')]
+        before = [counter.get() for counter in counters]
+        physics = PhysicsEngine(GAME_CONFIG['PHYSICS']['GRAVITY'],
+                                GAME_CONFIG['PHYSICS']['ELASTICITY'],
+                                GAME_CONFIG['PHYSICS']['FRICTION'])
+        hexagon = Hexagon(Vector2(400, 300), 200, GAME_CONFIG['COLORS']['HEXAGON'])
+        # 超速冲向墙壁的球：第一步就被限速，之后撞墙并被推回
+        system = BallSystem.from_arrays([(400, 300), (420, 280)], [(5000, 0), (0, -5000)],
+                                        10, (255, 0, 0))
+        for _ in range(30):
+            physics.update_system(system, hexagon)
+        collisions, clamps, push_outs = [counter.get() - start
+                                         for counter, start in zip(counters, before)]
+        self.assertGreater(collisions, 0)
+        self.assertGreaterEqual(clamps, 2)
+        self.assertGreater(push_outs, 0)
+        self.assertTrue(np.all(np.hypot(*system.velocities.T) <= 1200.0 + 1e-6))
+
+    def test_cache_metrics(self):
+        """测试发光精灵缓存的命中次数通过回调导出"""
+        registry = MetricsRegistry.get_registry()
+        GlowSurfaceCache.get_sprite(10, (255, 0, 0), 1)
+        GlowSurfaceCache.get_sprite(10, (255, 0, 0), 1)
+        hits = registry.get('sprite_cache_hits_total', cache='glow').get()
+        self.assertEqual(hits, GlowSurfaceCache.stats()['hits'])
+        self.assertIn(f'sprite_cache_hits_total{{cache="glow"}} {hits}', registry.render())
+
+    def test_exporter_file_and_http(self):
+        """测试导出器写入文本文件并在本机端口上提供 /metrics"""
+        registry = MetricsRegistry()
+        registry.counter('steps_total', "物理步数").inc(5)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'game.prom')
+            with MetricsExporter(registry, path=path, port=0, interval=60) as exporter:
+                url = f'http://127.0.0.1:{exporter.port}/metrics'
+                with urllib.request.urlopen(url, timeout=5) as response:
+                    body = response.read().decode()
+                self.assertIn('steps_total 5', body)
+                registry.get('steps_total').inc()
+            # 停止时最后写一次文件
+            with open(path) as f:
+                self.assertIn('steps_total 6', f.read())
+            self.assertFalse(os.path.exists(path + '.tmp'))
+
+if __name__ == '__main__':
+    unittest.main()
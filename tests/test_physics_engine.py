@@ -1,22 +1,25 @@
+import math
 import unittest
+from unittest.mock import patch
 from pygame.math import Vector2
-from game_engine import PhysicsEngine
+from game_engine import FixedTimestep, PhysicsEngine
 from game_objects import Ball, Hexagon
 from config import GAME_CONFIG
 
 class TestPhysicsEngine(unittest.TestCase):
     def setUp(self):
         self.physics = PhysicsEngine(
-            Vector2(0, 0.5),  # gravity
-            0.8,              # elasticity
-            0.99              # friction
+            Vector2(0, 1800),  # gravity（像素/秒²）
+            0.8,               # elasticity
+            0.99 ** 60         # friction（每秒）
         )
         
     def test_physics_init(self):
         """测试物理引擎初始化"""
-        self.assertEqual(self.physics.gravity, Vector2(0, 0.5))
+        self.assertEqual(self.physics.gravity, Vector2(0, 1800))
         self.assertEqual(self.physics.elasticity, 0.8)
-        self.assertEqual(self.physics.friction, 0.99)
+        self.assertEqual(self.physics.friction, 0.99 ** 60)
+        self.assertAlmostEqual(self.physics.dt, 1 / GAME_CONFIG['TIMESTEP']['PHYSICS_HZ'])
         
     def test_centripetal_force(self):
         """测试向心力计算"""
@@ -35,7 +38,7 @@ class TestPhysicsEngine(unittest.TestCase):
         hex = Hexagon(Vector2(400, 300), 200, (200, 200, 255))
         
         # 设置球体速度，使其向六边形移动
-        ball.velocity = Vector2(0, 5)
+        ball.velocity = Vector2(0, 300)
         
         # 进行多次更新，直到发生碰撞
         collision_occurred = False
@@ -53,7 +56,7 @@ class TestPhysicsEngine(unittest.TestCase):
         hex = Hexagon(Vector2(400, 300), 200, (200, 200, 255))
         
         # 设置球体向下运动
-        ball.velocity = Vector2(0, 5)
+        ball.velocity = Vector2(0, 300)
         initial_velocity = ball.velocity.copy()
         
         # 运行直到发生碰撞
@@ -72,7 +75,7 @@ class TestPhysicsEngine(unittest.TestCase):
         hex = Hexagon(Vector2(400, 300), 200, (200, 200, 255))
         
         # 测试高速碰撞
-        ball.velocity = Vector2(0, 50)  # 设置一个很大的速度
+        ball.velocity = Vector2(0, 3000)  # 设置一个很大的速度
         self.physics.state.paused = False  # 确保物理引擎未暂停
         self.physics.update(ball, hex)
         self.assertLessEqual(
@@ -91,4 +94,153 @@ class TestPhysicsEngine(unittest.TestCase):
             
             # 验证球体始终在合理范围内
             self.assertLess(abs(ball.position.x - 400), 300)
-            self.assertLess(abs(ball.position.y - 300), 300) 
\ No newline at end of file
+            self.assertLess(abs(ball.position.y - 300), 300)
+
+    def test_fixed_timestep(self):
+        """测试固定步长累加器"""
+        timestep = FixedTimestep(60, substeps=2, max_steps=5)
+        
+        # 30FPS 渲染时每帧执行两步物理
+        self.assertEqual(timestep.advance(1 / 30), 2)
+        self.assertEqual(timestep.advance(1 / 120), 0)
+        self.assertAlmostEqual(timestep.alpha, 0.5)
+        self.assertEqual(timestep.advance(1 / 120), 1)
+        self.assertAlmostEqual(timestep.substep_dt, 1 / 120)
+        
+    def test_spiral_of_death_cap(self):
+        """测试单帧步数上限"""
+        timestep = FixedTimestep(60, max_steps=5)
+        
+        self.assertEqual(timestep.advance(1.0), 5)
+        self.assertEqual(timestep.dropped_steps, 55)
+        self.assertLess(timestep.accumulator, timestep.dt)
+        
+    def test_rate_independence(self):
+        """测试不同物理频率下运动结果一致"""
+        results = []
+        for hz in (60, 240):
+            ball = Ball(Vector2(400, 300), 10, (255, 0, 0))
+            physics = PhysicsEngine(Vector2(0, 1800), 0.8, 0.99 ** 60, dt=1 / hz)
+            for _ in range(hz // 4):  # 0.25 秒
+                physics.update(ball, None)
+            results.append(ball.position)
+        
+        # 半隐式欧拉的误差随步长减小，两种频率的位移应接近
+        self.assertAlmostEqual(results[0].y, results[1].y, delta=3)
+
+    def _inside_margin(self, ball, hexagon):
+        """球心到各边距离减去碰撞缓冲的最小值"""
+        inradius = hexagon.radius * math.cos(math.pi / 6)
+        offset = ball.position - hexagon.position
+        margins = []
+        for edge in range(6):
+            phi = math.radians(hexagon.rotation + edge * 60 + 30)
+            outward = Vector2(math.cos(phi), math.sin(phi))
+            margins.append(inradius - offset.dot(outward) - (ball.radius + 4))
+        return min(margins)
+
+    def test_continuous_collision_no_tunneling(self):
+        """测试连续碰撞检测下高速球不会穿墙"""
+        hexagon = Hexagon(Vector2(400, 300), 200, (200, 200, 255))
+        ball = Ball(Vector2(400, 300), 10, (255, 0, 0))
+        ball.velocity = Vector2(9000, 2500)
+        self.physics.continuous = True
+        
+        with patch.dict(GAME_CONFIG['PHYSICS'], {'MAX_BALL_SPEED': 10000.0}):
+            collisions = 0
+            for _ in range(120):
+                hexagon.update(GAME_CONFIG['HEXAGON']['ROTATION_ACCELERATION'])
+                collisions += self.physics.update(ball, hexagon)
+                self.assertGreater(self._inside_margin(ball, hexagon), -1e-6)
+        
+        self.assertGreater(collisions, 0)
+        
+    def test_multiple_impacts_in_one_step(self):
+        """测试单步内处理多次碰撞"""
+        hexagon = Hexagon(Vector2(400, 300), 200, (200, 200, 255))
+        hexagon.rotation_speed = 0.0
+        ball = Ball(Vector2(400, 300), 10, (255, 0, 0))
+        # 一步内的行程约为六边形宽度的三倍
+        ball.velocity = Vector2(9000, 4000)
+        
+        with patch.dict(GAME_CONFIG['PHYSICS'], {'MAX_BALL_SPEED': 10000.0}):
+            impacts = self.physics._sweep_collision(ball, hexagon, 1 / 10)
+        
+        self.assertGreaterEqual(impacts, 2)
+        self.assertGreater(self._inside_margin(ball, hexagon), -1e-6)
+        
+    def test_rotating_wall_sweeps_ball(self):
+        """测试旋转的墙扫到静止的球时把墙速传给球"""
+        hexagon = Hexagon(Vector2(400, 300), 200, (200, 200, 255))
+        hexagon.rotation_speed = 300.0
+        hexagon.rotation = 0.0  # 步末角度，步初为 -60°
+        # 球停在步初 -60° 顶点附近，随后被转过来的边扫到
+        offset = Vector2(175, 0).rotate(-55)
+        ball = Ball(hexagon.position + offset, 10, (255, 0, 0))
+        
+        impacts = self.physics._sweep_collision(ball, hexagon, 0.2)
+        
+        self.assertGreater(impacts, 0)
+        # 被墙沿旋转方向推动
+        wall_direction = Vector2(-offset.y, offset.x)
+        self.assertGreater(ball.velocity.dot(wall_direction), 0)
+        self.assertGreater(self._inside_margin(ball, hexagon), -1e-6)
+        
+    def _run_rotating(self, ball, hexagon, steps, dt=1 / 60):
+        """在共转参考系模式下运行若干步"""
+        self.physics.rotating_frame = True
+        for _ in range(steps):
+            hexagon.update(GAME_CONFIG['HEXAGON']['ROTATION_ACCELERATION'], dt)
+            self.physics.update(ball, hexagon, dt)
+        self.physics.sync_to_world(ball, hexagon)
+        
+    def test_rotating_frame_free_motion(self):
+        """测试共转参考系中的自由运动与惯性系结果一致"""
+        hexagon = Hexagon(Vector2(400, 300), 200, (200, 200, 255))
+        hexagon.rotation_speed = 90.0
+        hexagon.target_rotation_speed = 90.0
+        ball = Ball(Vector2(400, 300), 10, (255, 0, 0))
+        ball.velocity = Vector2(30, -40)
+        
+        # 无重力无摩擦，惯性系中为匀速直线运动
+        self.physics.gravity = Vector2(0, 0)
+        self.physics.friction = 1.0
+        steps = 30
+        self._run_rotating(ball, hexagon, steps, dt=1 / 600)
+        
+        elapsed = steps / 600
+        self.assertAlmostEqual(ball.velocity.x, 30, delta=0.5)
+        self.assertAlmostEqual(ball.velocity.y, -40, delta=0.5)
+        self.assertAlmostEqual(ball.position.x, 400 + 30 * elapsed, delta=0.1)
+        self.assertAlmostEqual(ball.position.y, 300 - 40 * elapsed, delta=0.1)
+        
+    def test_rotating_frame_stays_inside(self):
+        """测试共转参考系求解器长时间运行后球仍在六边形内"""
+        hexagon = Hexagon(Vector2(400, 300), 200, (200, 200, 255))
+        ball = Ball(Vector2(400, 250), 10, (255, 0, 0))
+        
+        collided = False
+        self.physics.rotating_frame = True
+        for _ in range(600):
+            hexagon.update(GAME_CONFIG['HEXAGON']['ROTATION_ACCELERATION'], 1 / 60)
+            collided |= self.physics.update(ball, hexagon, 1 / 60)
+        self.physics.sync_to_world(ball, hexagon)
+        
+        self.assertTrue(collided)
+        self.assertGreater(self._inside_margin(ball, hexagon), -1e-6)
+        
+    def test_rotating_frame_sync_round_trip(self):
+        """测试世界坐标与共转参考系之间的换算可逆"""
+        hexagon = Hexagon(Vector2(400, 300), 200, (200, 200, 255))
+        hexagon.rotation = 37.0
+        hexagon.rotation_speed = 150.0
+        ball = Ball(Vector2(430, 260), 10, (255, 0, 0))
+        ball.velocity = Vector2(-80, 25)
+        
+        self.physics._get_frame_state(ball, hexagon)
+        self.physics.sync_to_world(ball, hexagon)
+        
+        self.assertAlmostEqual(ball.position.x, 430)
+        self.assertAlmostEqual(ball.position.y, 260)
+        self.assertAlmostEqual(ball.velocity.x, -80)
+        self.assertAlmostEqual(ball.velocity.y, 25)
@@ -0,0 +1,145 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+import pygame
+from config import GAME_CONFIG
+from game import Game
+from pipeline import (PhysicsThread, StateSnapshot, TripleBuffer, capture_snapshot,
+                      make_views, render_snapshot, run_pipelined)
+from profiler import FrameProfiler
+
+class TestPipeline(unittest.TestCase):
+    def test_triple_buffer_latest(self):
+        """测试消费者总是取到最新发布的一份，被覆盖的份数计入 dropped"""
+        buffer = TripleBuffer('initial')
+        self.assertEqual(buffer.latest(), ('initial', False))
+        buffer.publish(1)
+        buffer.publish(2)
+        self.assertEqual(buffer.latest(), (2, True))
+        self.assertEqual(buffer.latest(), (2, False))
+        buffer.publish(3)
+        self.assertEqual(buffer.latest(), (3, True))
+        self.assertEqual((buffer.published, buffer.dropped), (3, 1))
+
+    def test_triple_buffer_concurrent(self):
+        """测试并发发布时消费者读到的序号单调不减"""
+        buffer = TripleBuffer(0)
+        done = threading.Event()
+
+        def produce():
+            for i in range(1, 20001):
+                buffer.publish(i)
+            done.set()
+
+        thread = threading.Thread(target=produce)
+        thread.start()
+        seen = 0
+        while not done.is_set():
+            value, _ = buffer.latest()
+            self.assertGreaterEqual(value, seen)
+            seen = value
+        thread.join()
+        self.assertEqual(buffer.latest()[0], 20000)
+
+    def test_snapshot_is_immutable(self):
+        """测试快照只读且与游戏状态一致"""
+        game = Game(seed=1, headless=True)
+        game.run_headless(5)
+        snapshot = capture_snapshot(game)
+        self.assertIsInstance(snapshot, StateSnapshot)
+        self.assertEqual(snapshot.tick, 5)
+        self.assertEqual(snapshot.position, (game.ball.position.x, game.ball.position.y))
+        with self.assertRaises(AttributeError):
+            snapshot.tick = 6
+
+    def test_physics_thread_publishes(self):
+        """测试物理线程按固定步长推进并发布快照"""
+        game = Game(seed=2, headless=True)
+        buffer = TripleBuffer(capture_snapshot(game))
+        physics = PhysicsThread(game, buffer)
+        physics.start()
+        time.sleep(0.2)
+        physics.stop()
+        snapshot, fresh = buffer.latest()
+        self.assertTrue(fresh)
+        self.assertGreater(snapshot.tick, 0)
+        self.assertEqual(snapshot.tick, game.tick)
+        self.assertEqual(buffer.published - buffer.dropped, 1)
+
+    def test_physics_thread_paused(self):
+        """测试暂停时物理线程不推进"""
+        game = Game(seed=3, headless=True)
+        game.state.paused = True
+        buffer = TripleBuffer(capture_snapshot(game))
+        physics = PhysicsThread(game, buffer)
+        physics.start()
+        time.sleep(0.1)
+        physics.stop()
+        self.assertEqual(game.tick, 0)
+        self.assertEqual(buffer.published, 0)
+
+    def test_physics_thread_blocks_while_paused(self):
+        """测试暂停时物理线程阻塞等待而不是按步长醒来，resume() 后继续推进"""
+        game = Game(seed=3, headless=True)
+        game.state.paused = True
+        wakeups = []
+        reset = game.timestep.reset
+        game.timestep.reset = lambda: (wakeups.append(1), reset())
+        buffer = TripleBuffer(capture_snapshot(game))
+        physics = PhysicsThread(game, buffer)
+        physics.start()
+        try:
+            time.sleep(0.2)
+            self.assertEqual(len(wakeups), 1)
+            game.state.paused = False
+            physics.resume()
+            time.sleep(0.1)
+        finally:
+            physics.stop()
+        self.assertGreater(game.tick, 0)
+        self.assertGreater(buffer.published, 0)
+
+    def test_render_snapshot(self):
+        """测试按快照绘制，不修改游戏本身的对象"""
+        pygame.init()
+        try:
+            game = Game(seed=4)
+            hexagon, ball = make_views(game)
+            snapshot = StateSnapshot(10, 30.0, (300.0, 250.0), (0, 255, 0), 0.0)
+            render_snapshot(game.renderer, snapshot, hexagon, ball)
+            r, g, b, _ = game.renderer.screen.get_at((300, 250))
+            self.assertGreater(g, 200)
+            self.assertLess(max(r, b), 40)
+            self.assertNotEqual(game.ball.position, ball.position)
+            self.assertEqual(hexagon.rotation, 30.0)
+        finally:
+            pygame.quit()
+
+    def test_run_pipelined_profiles(self):
+        """测试流水线主循环按帧记录剖析数据，退出时写出文件"""
+        saved_profiler = FrameProfiler._instance
+        saved_path = GAME_CONFIG['PROFILER']['DUMP_PATH']
+        FrameProfiler._instance = profiler = FrameProfiler(enabled=True)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'profile.json')
+            GAME_CONFIG['PROFILER']['DUMP_PATH'] = path
+            try:
+                game = Game(seed=5)
+                pygame.time.set_timer(pygame.QUIT, 300, loops=1)
+                run_pipelined(game)
+            finally:
+                FrameProfiler._instance = saved_profiler
+                GAME_CONFIG['PROFILER']['DUMP_PATH'] = saved_path
+            self.assertGreater(profiler.frames, 0)
+            stages = list(profiler.stages)
+            recorded = profiler.recorded()
+            self.assertGreater(recorded[:, stages.index('draw')].sum(), 0)
+            self.assertGreater(recorded[:, stages.index('physics')].sum(), 0)
+            with open(path) as f:
+                self.assertEqual(len(json.load(f)['frames_ms']), len(recorded))
+
+if __name__ == '__main__':
+    unittest.main()
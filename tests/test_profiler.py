@@ -0,0 +1,99 @@
+import csv
+import json
+import os
+import tempfile
+import time
+import unittest
+import pygame
+from profiler import FrameProfiler, _NULL_SCOPE
+
+class TestProfiler(unittest.TestCase):
+    def test_disabled_records_nothing(self):
+        """测试关闭时 scope() 返回空作用域，end_frame() 不写缓冲区"""
+        profiler = FrameProfiler(enabled=False)
+        self.assertIs(profiler.scope('physics'), _NULL_SCOPE)
+        with profiler.scope('physics'):
+            pass
+        profiler.end_frame()
+        self.assertEqual(profiler.frames, 0)
+        self.assertEqual(profiler.percentiles(), {})
+
+    def test_scope_accumulates(self):
+        """测试同一帧内多次进入同一阶段时耗时累加"""
+        profiler = FrameProfiler(stages=('physics', 'draw'), enabled=True)
+        for _ in range(3):
+            with profiler.scope('physics'):
+                time.sleep(0.002)
+        profiler.end_frame()
+        physics, draw = profiler.recorded()[0]
+        self.assertGreaterEqual(physics, 0.006)
+        self.assertEqual(draw, 0.0)
+
+    def test_ring_buffer_wraps(self):
+        """测试环形缓冲区覆盖最旧的帧，recorded() 按时间先后返回"""
+        profiler = FrameProfiler(stages=('draw',), capacity=4, enabled=True)
+        for i in range(6):
+            profiler._row[0] = float(i)
+            profiler.end_frame()
+        self.assertEqual(profiler.frames, 6)
+        self.assertEqual(profiler.recorded()[:, 0].tolist(), [2.0, 3.0, 4.0, 5.0])
+
+    def test_percentiles(self):
+        """测试分位数按毫秒计算"""
+        profiler = FrameProfiler(stages=('draw',), capacity=200, enabled=True)
+        for i in range(101):
+            profiler._row[0] = i / 1000
+            profiler.end_frame()
+        stats = profiler.percentiles()['draw']
+        self.assertAlmostEqual(stats['p50'], 50.0)
+        self.assertAlmostEqual(stats['p95'], 95.0)
+        self.assertAlmostEqual(stats['p99'], 99.0)
+
+    def test_dump(self):
+        """测试导出 CSV 和 JSON，不支持的扩展名抛出 ValueError"""
+        profiler = FrameProfiler(stages=('draw', 'frame'), capacity=2, enabled=True)
+        for i in range(3):
+            profiler._row[0] = (i + 1) / 1000
+            profiler.end_frame()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'profile.csv')
+            profiler.dump(path)
+            with open(path, newline='') as f:
+                rows = list(csv.reader(f))
+            self.assertEqual(rows[0], ['frame', 'draw', 'frame'])
+            self.assertEqual([row[0] for row in rows[1:]], ['1', '2'])
+            self.assertAlmostEqual(float(rows[-1][1]), 3.0)
+
+            path = os.path.join(directory, 'profile.json')
+            profiler.dump(path)
+            with open(path) as f:
+                data = json.load(f)
+            self.assertEqual(data['stages'], ['draw', 'frame'])
+            self.assertEqual(data['first_frame'], 1)
+            self.assertEqual(len(data['frames_ms']), 2)
+            self.assertIn('p95', data['percentiles_ms']['draw'])
+
+            with self.assertRaises(ValueError):
+                profiler.dump(os.path.join(directory, 'profile.txt'))
+
+    def test_draw_overlay(self):
+        """测试叠加层绘制在左上角，并在 refresh 帧内复用缓存"""
+        pygame.init()
+        profiler = FrameProfiler(enabled=True)
+        for _ in range(3):
+            with profiler.scope('draw'):
+                pass
+            profiler.end_frame()
+        surface = pygame.Surface((400, 300))
+        surface.fill((255, 255, 255))
+        rect = profiler.draw_overlay(surface)
+        self.assertEqual(rect.topleft, (4, 4))
+        self.assertGreater(rect.width, 0)
+        self.assertEqual(surface.get_at((6, 6))[:3], (0, 0, 0))
+        cached = profiler._overlay_surface
+        profiler.end_frame()
+        profiler.draw_overlay(surface)
+        self.assertIs(profiler._overlay_surface, cached)
+
+if __name__ == '__main__':
+    unittest.main()
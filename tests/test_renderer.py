@@ -1,8 +1,17 @@
+import random
 import unittest
+from unittest.mock import patch
 import pygame
-from game_engine import Renderer
+from game_engine import PhysicsEngine, Renderer, ResolutionController, lerp_angle
 from game_objects import Ball, Hexagon
+from geometry import ConvexPolygon
+from pipeline import StateSnapshot
 from pygame.math import Vector2
+import numpy as np
+from config import GAME_CONFIG
+from ball_system import BallSystem
+from utils import (GLOW_LAYERS, GlowSurfaceCache, HexagonSpriteCache, _SurfaceLRU,
+                   draw_ball_batch, draw_glowing_circle, draw_smooth_hexagon, glow_lod)
 
 class TestRenderer(unittest.TestCase):
     def setUp(self):
@@ -73,4 +82,311 @@ class TestRenderer(unittest.TestCase):
         outer_color = self.renderer.screen.get_at((410, 300))
         
         # 中心应该比外围更亮
-        self.assertGreater(sum(center_color[:3]), sum(outer_color[:3])) 
\ No newline at end of file
+        self.assertGreater(sum(center_color[:3]), sum(outer_color[:3]))
+
+    def _surface_bytes(self, draw):
+        """在空白的 2 倍表面上绘制，返回 RGBA 字节"""
+        surface = pygame.Surface((1600, 1200), pygame.SRCALPHA)
+        draw(surface)
+        return pygame.image.tobytes(surface, 'RGBA')
+
+    def test_hexagon_sprite_matches_vector(self):
+        """测试预渲染轮廓与直接绘制逐像素一致（含 60° 对称）"""
+        cache = HexagonSpriteCache()
+        color = (200, 200, 255)
+        for rotation in (17.25, 77.25):
+            expected = self._surface_bytes(lambda s: draw_smooth_hexagon(
+                s, color, ConvexPolygon.regular((400, 300), 200, 6, rotation).vertices, 4, 2))
+            actual = self._surface_bytes(
+                lambda s: cache.draw(s, color, (400, 300), 200, rotation, 4, 2))
+            self.assertEqual(actual, expected)
+        # 两个角度相差 60°，共用同一张预渲染图
+        self.assertEqual(len(cache.sprites), 1)
+
+    def test_hexagon_sprite_rebuild(self):
+        """测试颜色变化时重建图集，不同渲染倍数的图集分开缓存"""
+        cache = HexagonSpriteCache()
+        surface = pygame.Surface((1600, 1200), pygame.SRCALPHA)
+        cache.draw(surface, (200, 200, 255), (400, 300), 200, 0, 4, 2)
+        cache.draw(surface, (200, 200, 255), (400, 300), 200, 10, 4, 2)
+        self.assertEqual(len(cache.sprites), 2)
+
+        cache.draw(surface, (255, 0, 0), (400, 300), 200, 0, 4, 2)
+        self.assertEqual(len(cache.sprites), 1)
+        small = pygame.Surface((800, 600), pygame.SRCALPHA)
+        cache.draw(small, (255, 0, 0), (400, 300), 200, 0, 4, 1)
+        self.assertEqual(len(cache.sprites), 2)
+        self.assertEqual(small.get_at((600, 300))[:3], (255, 0, 0))
+
+    def test_sprite_cache_memory_cap(self):
+        """测试缓存超过字节上限时淘汰最久未用的项"""
+        cache = _SurfaceLRU(max_bytes=100)
+        cache.put('a', 1, 40)
+        cache.put('b', 2, 40)
+        self.assertEqual(cache.get('a'), 1)
+        cache.put('c', 3, 40)
+
+        self.assertNotIn('b', cache)
+        self.assertIn('a', cache)
+        self.assertEqual(cache.bytes, 80)
+        self.assertEqual(cache.evictions, 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_glow_sprite_matches_layers(self):
+        """测试预合成的发光精灵与逐层叠加的结果一致（误差来自逐层的 8 位取整）"""
+        for background in ((0, 0, 0, 0), (30, 60, 90, 200)):
+            layered = pygame.Surface((100, 100), pygame.SRCALPHA)
+            layered.fill(background)
+            single = layered.copy()
+            for offset, alpha in GLOW_LAYERS:
+                glow_radius = int(20 + offset * 2)
+                layer = pygame.Surface((glow_radius * 2, glow_radius * 2), pygame.SRCALPHA)
+                pygame.draw.circle(layer, (255, 128, 0, alpha), (glow_radius, glow_radius), glow_radius)
+                layered.blit(layer, (50 - glow_radius, 50 - glow_radius),
+                             special_flags=pygame.BLEND_ALPHA_SDL2)
+            with patch.dict(GAME_CONFIG['WINDOW'], {'RENDER_SCALE': 2}):
+                draw_glowing_circle(single, (255, 128, 0), (25, 25), 10)
+
+            expected = np.frombuffer(pygame.image.tobytes(layered, 'RGBA'), np.uint8).astype(int)
+            actual = np.frombuffer(pygame.image.tobytes(single, 'RGBA'), np.uint8).astype(int)
+            self.assertLessEqual(np.abs(expected - actual).max(), 10)
+
+    def test_glow_cache_budget(self):
+        """测试发光精灵缓存的字节上限、统计与预热"""
+        GlowSurfaceCache.clear()
+        budget = GlowSurfaceCache._sprites.max_bytes
+        try:
+            GlowSurfaceCache.warm_up(10, render_scale=2)
+            stats = GlowSurfaceCache.stats()
+            colors = len(GAME_CONFIG['COLORS']['BALL_COLORS'])
+            self.assertEqual(stats['entries'], colors)
+
+            # 预热后绘制全部命中
+            GlowSurfaceCache.get_sprite(10, GAME_CONFIG['COLORS']['BALL_COLORS'][0], 2)
+            self.assertEqual(GlowSurfaceCache.stats()['hits'], stats['hits'] + 1)
+
+            # 缩小上限后淘汰到只剩能容纳的数量
+            sprite_bytes = stats['bytes'] // colors
+            evictions = stats['evictions']
+            GlowSurfaceCache.set_budget(sprite_bytes * 3)
+            stats = GlowSurfaceCache.stats()
+            self.assertEqual(stats['entries'], 3)
+            self.assertEqual(stats['evictions'] - evictions, colors - 3)
+            self.assertLessEqual(stats['bytes'], sprite_bytes * 3)
+        finally:
+            GlowSurfaceCache.set_budget(budget)
+            GlowSurfaceCache.clear()
+
+    def _render_frames(self, dirty_rects, frames=70):
+        """模拟若干帧并返回每帧的屏幕内容"""
+        renderer = Renderer((800, 600), 2, dirty_rects=dirty_rects)
+        physics = PhysicsEngine(
+            GAME_CONFIG['PHYSICS']['GRAVITY'],
+            GAME_CONFIG['PHYSICS']['ELASTICITY'],
+            GAME_CONFIG['PHYSICS']['FRICTION']
+        )
+        ball = Ball(Vector2(400, 250), 10, (255, 0, 0))
+        ball.velocity = Vector2(300, 0)
+        hexagon = Hexagon(Vector2(400, 300), 200, (200, 200, 255), rng=random.Random(0))
+        screens = []
+        for frame in range(frames):
+            hexagon.update(GAME_CONFIG['HEXAGON']['ROTATION_ACCELERATION'])
+            physics.update(ball, hexagon)
+            if frame == 45:
+                ball.color = (0, 255, 0)
+            renderer.render([hexagon, ball])
+            screens.append(pygame.image.tobytes(renderer.screen, 'RGB'))
+        return screens
+
+    def test_dirty_rects_match_full_frame(self):
+        """测试脏矩形模式与整帧绘制的画面逐像素一致"""
+        with patch.dict(GAME_CONFIG['WINDOW'], {'RENDER_SCALE': 2}):
+            full = self._render_frames(False)
+            dirty = self._render_frames(True)
+        for frame, (expected, actual) in enumerate(zip(full, dirty)):
+            self.assertEqual(expected, actual, f"frame {frame}")
+
+    def test_object_bounds(self):
+        """测试物体的包围矩形覆盖其绘制范围"""
+        ball = Ball(Vector2(400, 300), 10, (255, 0, 0))
+        hexagon = Hexagon(Vector2(400, 300), 200, (200, 200, 255))
+        self.assertTrue(ball.get_bounds().collidepoint(389, 289))
+        self.assertTrue(hexagon.get_bounds().contains(ball.get_bounds()))
+        self.assertTrue(hexagon.get_bounds().collidepoint(603, 300))
+
+    def test_merge_rects(self):
+        """测试重叠的脏矩形被合并"""
+        rects = Renderer._merge_rects([
+            pygame.Rect(0, 0, 10, 10), pygame.Rect(5, 5, 10, 10),
+            pygame.Rect(50, 50, 10, 10), pygame.Rect(0, 0, 0, 0)])
+        self.assertEqual(sorted(map(tuple, rects)), [(0, 0, 15, 15), (50, 50, 10, 10)])
+
+    def test_unknown_aa_strategy(self):
+        """测试未知的抗锯齿方式被拒绝"""
+        with self.assertRaises(ValueError):
+            Renderer((800, 600), 2, aa_strategy='msaa')
+
+    def _render_strategy(self, strategy):
+        renderer = Renderer((800, 600), 2, aa_strategy=strategy)
+        ball = Ball(Vector2(300, 180), 10, (255, 0, 0))
+        hexagon = Hexagon(Vector2(400, 300), 200, (200, 200, 255), rng=random.Random(0))
+        hexagon.rotation = 13
+        for _ in range(3):
+            renderer.render([hexagon, ball])
+        return renderer
+
+    def test_aa_strategies(self):
+        """测试每种抗锯齿方式都能绘制并记录每帧耗时"""
+        for strategy in ('supersample', 'gfxdraw', 'local_supersample'):
+            renderer = self._render_strategy(strategy)
+            r, g, b, _ = renderer.screen.get_at((300, 180))
+            self.assertGreater(r, 200, strategy)
+            self.assertLess(max(g, b), 40, strategy)
+            stats = renderer.cost_stats()[strategy]
+            self.assertEqual(stats['frames'], 3)
+            self.assertGreater(stats['mean_ms'], 0)
+            self.assertGreaterEqual(stats['max_ms'], stats['p95_ms'])
+
+    def test_local_supersample_matches_supersample(self):
+        """测试局部超采样与整屏超采样的画面只有舍入误差"""
+        full = pygame.surfarray.array3d(self._render_strategy('supersample').screen).astype(int)
+        local = pygame.surfarray.array3d(
+            self._render_strategy('local_supersample').screen).astype(int)
+        self.assertLessEqual(np.abs(full - local).max(), 8)
+
+    def test_resolution_controller_hysteresis(self):
+        """测试超出预算时降档，估算仍有余量时才升档"""
+        controller = ResolutionController(1.0, 2.0, 0.25, budget=0.010, window=4)
+        self.assertEqual(controller.levels, [1.0, 1.25, 1.5, 1.75, 2.0])
+        self.assertEqual(controller.scale, 2.0)
+        # 窗口未满时不调整
+        for _ in range(3):
+            self.assertFalse(controller.record(0.020))
+        self.assertTrue(controller.record(0.020))
+        self.assertEqual(controller.scale, 1.75)
+        # 低于预算但升档后估计会超出余量：保持不变
+        for _ in range(8):
+            self.assertFalse(controller.record(0.0075))
+        self.assertEqual(controller.scale, 1.75)
+        # 余量充足时升档
+        changed = [controller.record(0.004) for _ in range(4)]
+        self.assertEqual(changed.count(True), 1)
+        self.assertEqual(controller.scale, 2.0)
+        self.assertEqual(controller.changes, 2)
+
+    def test_adaptive_scale_reallocates_on_change(self):
+        """测试倍数变化时才重新分配绘制表面"""
+        renderer = Renderer((800, 600), 2, adaptive_scale=True)
+        renderer.scaler = ResolutionController(1.0, 2.0, 0.5, budget=0.010, window=2)
+        ball = Ball(Vector2(400, 300), 10, (255, 0, 0))
+        surface = renderer.drawing_surface
+        with patch('game_engine.time.perf_counter', side_effect=[0.0, 0.005] * 2):
+            renderer.render([ball])
+            renderer.render([ball])
+        self.assertIs(renderer.drawing_surface, surface)
+        with patch('game_engine.time.perf_counter', side_effect=[0.0, 0.050] * 2):
+            renderer.render([ball])
+            renderer.render([ball])
+        self.assertEqual(renderer.render_scale, 1.5)
+        self.assertEqual(renderer.drawing_surface.get_size(), (1200, 900))
+        renderer.render([ball])
+        r, g, b, _ = renderer.screen.get_at((400, 300))
+        self.assertGreater(r, 200)
+
+    def _batch_scene(self, count=300):
+        rng = np.random.default_rng(0)
+        positions = rng.uniform((250, 150), (550, 450), (count, 2))
+        colors = np.array(GAME_CONFIG['COLORS']['BALL_COLORS'], dtype=np.uint8)[
+            rng.integers(0, 3, count)]
+        return positions, colors
+
+    def test_glow_lod(self):
+        """测试球数增加时光晕层数减少，精灵随之变小"""
+        with patch.dict(GAME_CONFIG['WINDOW'], {'GLOW_LOD': ((0, 8), (100, 4), (1000, 1))}):
+            self.assertEqual([glow_lod(n) for n in (1, 99, 100, 999, 5000)], [8, 8, 4, 4, 1])
+        full = GlowSurfaceCache.get_sprite(10, (255, 0, 0), 2)
+        core = GlowSurfaceCache.get_sprite(10, (255, 0, 0), 2, layers=1)
+        self.assertEqual(core.get_width(), 40)
+        self.assertLess(core.get_width(), full.get_width())
+
+    def test_batch_matches_single_color(self):
+        """测试同色球批量绘制与逐个绘制逐像素一致"""
+        positions, _ = self._batch_scene()
+        expected = pygame.Surface((1600, 1200), pygame.SRCALPHA)
+        for x, y in positions:
+            draw_glowing_circle(expected, (255, 0, 0), (x, y), 10, 2)
+        actual = pygame.Surface((1600, 1200), pygame.SRCALPHA)
+        draw_ball_batch(actual, positions, 10, (255, 0, 0), 2, layers=len(GLOW_LAYERS), splat=False)
+        self.assertEqual(pygame.image.tobytes(actual, 'RGBA'),
+                         pygame.image.tobytes(expected, 'RGBA'))
+
+    def test_splat_matches_blits(self):
+        """测试 NumPy 合成与逐组 blit 只有舍入误差"""
+        positions, colors = self._batch_scene()
+        # 含部分超出表面的球
+        positions[:3] = ((-5, 300), (400, 598), (-40, -40))
+        results = []
+        for splat in (False, True):
+            surface = pygame.Surface((800, 600), pygame.SRCALPHA)
+            surface.fill((20, 31, 31, 255))
+            draw_ball_batch(surface, positions, 10, colors, 1, splat=splat)
+            results.append((pygame.surfarray.array3d(surface).astype(int),
+                            pygame.surfarray.array_alpha(surface).astype(int)))
+        (rgb, alpha), (splat_rgb, splat_alpha) = results
+        self.assertLessEqual(np.abs(rgb - splat_rgb).max(), 12)
+        self.assertLess(np.abs(rgb - splat_rgb).mean(), 1)
+        # SDL 的混合按 /256 近似，逐次叠加后 alpha 会略低于精确值
+        self.assertLessEqual(np.abs(alpha - splat_alpha).max(), 8)
+
+    def test_ball_system_render(self):
+        """测试多球系统可以直接交给 Renderer 批量绘制"""
+        positions, colors = self._batch_scene(50)
+        system = BallSystem.from_arrays(positions, np.zeros_like(positions), 10, colors)
+        hexagon = Hexagon(Vector2(400, 300), 200, (200, 200, 255))
+        self.renderer.render([hexagon, system])
+        x, y = positions[0].astype(int)
+        self.assertNotEqual(self.renderer.screen.get_at((x, y))[:3], GAME_CONFIG['COLORS']['BACKGROUND'])
+        self.assertIsNone(system.get_bounds())
+
+    def test_subpixel_ball_position(self):
+        """测试球的小数位置在超采样表面上不会被截断"""
+        surfaces = []
+        for x in (300.0, 300.3):
+            self.renderer.clear()
+            Ball(Vector2(x, 300), 10, (255, 0, 0)).draw(self.renderer.drawing_surface, 2)
+            surfaces.append(pygame.image.tobytes(self.renderer.drawing_surface, 'RGBA'))
+        self.assertNotEqual(surfaces[0], surfaces[1])
+
+    def test_lerp_angle_shortest_arc(self):
+        """测试角度插值沿较短方向跨过 0°"""
+        self.assertAlmostEqual(lerp_angle(350, 10, 0.5), 0.0)
+        self.assertAlmostEqual(lerp_angle(10, 350, 0.25), 5.0)
+        self.assertAlmostEqual(lerp_angle(100, 160, 0.5), 130.0)
+
+    def test_render_interpolated(self):
+        """测试按 alpha 在前后两个状态之间插值绘制"""
+        previous = StateSnapshot(1, 350.0, (300.0, 300.0), (255, 0, 0), 0.0)
+        current = StateSnapshot(2, 10.0, (310.0, 290.0), (0, 255, 0), 0.0)
+        hexagon = Hexagon(Vector2(400, 300), 200, (200, 200, 255))
+        ball = Ball(Vector2(0, 0), 10, (255, 0, 0))
+        self.renderer.render_interpolated(previous, current, 0.25, hexagon, ball)
+        self.assertEqual(ball.position, Vector2(302.5, 297.5))
+        self.assertAlmostEqual(hexagon.rotation, 355.0)
+        self.assertEqual(ball.color, (0, 255, 0))
+        self.assertGreater(self.renderer.screen.get_at((302, 297))[1], 200)
+        # alpha 超出 [0, 1] 时不外推
+        self.renderer.render_interpolated(previous, current, 1.7, hexagon, ball)
+        self.assertEqual(ball.position, Vector2(310, 290))
+
+    def test_render_interpolated_skips_unchanged(self):
+        """测试插值结果与上一帧相同时不重绘，force 时总是重绘"""
+        snapshot = StateSnapshot(1, 30.0, (300.0, 300.0), (255, 0, 0), 0.0)
+        hexagon = Hexagon(Vector2(400, 300), 200, (200, 200, 255))
+        ball = Ball(Vector2(0, 0), 10, (255, 0, 0))
+        self.assertTrue(self.renderer.render_interpolated(snapshot, snapshot, 0.5, hexagon, ball))
+        self.assertFalse(self.renderer.render_interpolated(snapshot, snapshot, 0.9, hexagon, ball))
+        self.assertTrue(self.renderer.render_interpolated(snapshot, snapshot, 0.9, hexagon, ball,
+                                                          force=True))
+        moved = snapshot._replace(position=(301.0, 300.0))
+        self.assertTrue(self.renderer.render_interpolated(snapshot, moved, 1.0, hexagon, ball))
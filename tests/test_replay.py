@@ -0,0 +1,95 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from game import Game
+from replay import FLAG_COLLISION, RECORD_DTYPE, ReplayReader, ReplayWriter
+from config import GAME_CONFIG
+
+class TestReplay(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def _record(self, name, seed, steps=500, **kwargs):
+        """无界面运行并录制，返回文件路径和结束时的游戏"""
+        path = self._path(name)
+        game = Game(seed=seed, headless=True)
+        with ReplayWriter(path, GAME_CONFIG['TIMESTEP']['PHYSICS_HZ'], **kwargs) as recorder:
+            game.run_headless(steps, recorder)
+        return path, game
+
+    def _read(self, path):
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def test_record_size(self):
+        """测试记录为紧凑的定长格式"""
+        self.assertEqual(RECORD_DTYPE.itemsize, 46)
+
+    def test_seeded_run_reproducible(self):
+        """测试相同种子的两次运行得到逐字节相同的回放文件"""
+        first, _ = self._record('first.rpl', seed=7)
+        second, _ = self._record('second.rpl', seed=7)
+        other, _ = self._record('other.rpl', seed=8)
+
+        self.assertEqual(self._read(first), self._read(second))
+        self.assertNotEqual(self._read(first), self._read(other))
+
+    def test_playback_matches_simulation(self):
+        """测试回放的最后一帧与模拟结束时的状态一致"""
+        path, game = self._record('run.rpl', seed=3, chunk_records=64)
+
+        with ReplayReader(path) as replay:
+            self.assertEqual(len(replay), 500)
+            last = replay[-1]
+            self.assertEqual(last['tick'], game.tick)
+            self.assertEqual(last['rotation'], game.hexagon.rotation)
+            self.assertEqual(tuple(last['position']), tuple(game.ball.position))
+            self.assertEqual(tuple(last['velocity']), tuple(game.ball.velocity))
+            self.assertEqual(GAME_CONFIG['COLORS']['BALL_COLORS'][last['color_index']],
+                             game.ball.color)
+            # 有碰撞的帧都带有标记
+            self.assertTrue(np.any(replay.frames()['flags'] & FLAG_COLLISION))
+
+    def test_random_seek(self):
+        """测试压缩与未压缩文件的任意定位结果相同"""
+        compressed, _ = self._record('z.rpl', seed=5, chunk_records=50)
+        raw, _ = self._record('raw.rpl', seed=5, chunk_records=50, compress=False)
+        self.assertLess(os.path.getsize(compressed), os.path.getsize(raw))
+
+        with ReplayReader(compressed) as a, ReplayReader(raw) as b:
+            all_frames = b.frames()
+            for frame in (499, 0, 123, 50, 49, 250):
+                self.assertEqual(a[frame].tobytes(), b[frame].tobytes())
+                self.assertEqual(a[frame].tobytes(), all_frames[frame].tobytes())
+                self.assertEqual(a[frame]['tick'], frame + 1)
+            with self.assertRaises(IndexError):
+                a[500]
+
+    def test_apply_frame(self):
+        """测试回放帧可以恢复到游戏对象上"""
+        path, game = self._record('apply.rpl', seed=1, steps=100)
+        viewer = Game(headless=True)
+
+        with ReplayReader(path) as replay:
+            viewer.apply_frame(replay[99])
+
+        self.assertEqual(viewer.ball.position, game.ball.position)
+        self.assertEqual(viewer.ball.color, game.ball.color)
+        self.assertEqual(viewer.hexagon.rotation, game.hexagon.rotation)
+
+    def test_unclosed_file_rejected(self):
+        """测试未正常关闭的文件会报错"""
+        path = self._path('broken.rpl')
+        writer = ReplayWriter(path, 60)
+        writer.write(1, 0.0, (0, 0), (0, 0), 0)
+        writer._file.close()
+
+        with self.assertRaises(ValueError):
+            ReplayReader(path)
@@ -0,0 +1,77 @@
+import unittest
+import numpy as np
+import pygame
+from pygame.math import Vector2
+from simulation import WorldBatch, WorldRandom
+from game_engine import PhysicsEngine
+from game_objects import Ball, Hexagon
+from config import GAME_CONFIG
+
+class TestWorldBatch(unittest.TestCase):
+    def test_batch_init(self):
+        """测试批量世界初始化"""
+        batch = WorldBatch(16, seed=1)
+
+        self.assertEqual(len(batch), 16)
+        self.assertEqual(batch.positions.shape, (16, 2))
+        self.assertEqual(batch.rotation.shape, (16,))
+        self.assertTrue(np.all(batch.rotation_speed == GAME_CONFIG['HEXAGON']['INITIAL_SPEED']))
+
+    def test_matches_single_world(self):
+        """测试在速度变化之前与单个 Game 世界的更新一致"""
+        batch = WorldBatch(3, seed=1)
+        physics = PhysicsEngine(
+            GAME_CONFIG['PHYSICS']['GRAVITY'],
+            GAME_CONFIG['PHYSICS']['ELASTICITY'],
+            GAME_CONFIG['PHYSICS']['FRICTION']
+        )
+        ball = Ball(Vector2(400, 250), 10, GAME_CONFIG['COLORS']['BALL_COLORS'][0])
+        hexagon = Hexagon(Vector2(400, 300), 200, GAME_CONFIG['COLORS']['HEXAGON'])
+
+        steps = round(GAME_CONFIG['HEXAGON']['SPEED_CHANGE_INTERVAL'] *
+                      GAME_CONFIG['TIMESTEP']['PHYSICS_HZ'])
+        for _ in range(steps - 1):
+            hexagon.update(GAME_CONFIG['HEXAGON']['ROTATION_ACCELERATION'])
+            expected = physics.update(ball, hexagon)
+            collided = batch.step()
+            self.assertTrue(np.all(collided == expected))
+
+        self.assertAlmostEqual(batch.rotation[0], hexagon.rotation)
+        self.assertAlmostEqual(batch.positions[0, 0], ball.position.x, places=6)
+        self.assertAlmostEqual(batch.positions[0, 1], ball.position.y, places=6)
+
+    def test_seeded_worlds_reproducible(self):
+        """测试相同种子得到相同结果，且各世界互不影响"""
+        first = WorldBatch(4, seed=42)
+        second = WorldBatch(8, seed=42)
+        first.run(300)
+        second.run(300)
+
+        self.assertTrue(np.array_equal(first.positions, second.positions[:4]))
+        self.assertTrue(np.array_equal(first.color_index, second.color_index[:4]))
+        # 不同世界有不同的随机旋转
+        self.assertGreater(len(np.unique(second.target_rotation_speed)), 1)
+
+    def test_random_streams(self):
+        """测试每个世界的随机数范围与独立性"""
+        rng = WorldRandom(1000, seed=3)
+        values = rng.uniform(np.arange(1000))
+
+        self.assertTrue(np.all((values >= 0) & (values < 1)))
+        self.assertGreater(len(np.unique(values)), 990)
+
+    def test_worlds_stay_inside(self):
+        """测试长时间运行后球仍在六边形附近，颜色变化合法"""
+        batch = WorldBatch(64, seed=5)
+        collisions = batch.run(600)
+
+        distance = np.hypot(*(batch.positions - batch.center).T)
+        self.assertTrue(np.all(distance < 220))
+        self.assertTrue(np.all(collisions > 0))
+        self.assertEqual(batch.colors().shape, (64, 3))
+
+    def test_headless(self):
+        """测试批量模拟不会初始化显示"""
+        pygame.quit()
+        WorldBatch(8, seed=0).run(10)
+        self.assertFalse(pygame.display.get_init())
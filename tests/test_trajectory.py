@@ -0,0 +1,92 @@
+import csv
+import os
+import tempfile
+import unittest
+import numpy as np
+from game import Game
+from replay import RECORD_DTYPE, ReplayReader, ReplayWriter
+from trajectory import (BackgroundWriter, CsvSink, NpySink, NpzSink, batched,
+                        export_trajectory, iter_states, load_npz, open_sink)
+from config import GAME_CONFIG
+
+class TestTrajectory(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_batched_chunks(self):
+        """测试状态流按块打包，最后一块可以较短"""
+        chunks = list(batched(iter_states(Game(seed=1, headless=True), 250), 100))
+
+        self.assertEqual([len(c) for c in chunks], [100, 100, 50])
+        self.assertEqual(chunks[0].dtype, RECORD_DTYPE)
+        ticks = np.concatenate(chunks)['tick']
+        self.assertTrue(np.array_equal(ticks, np.arange(1, 251)))
+
+    def test_npy_matches_replay(self):
+        """测试 .npy 导出与相同种子的回放录制一致"""
+        path = self._path('run.npy')
+        count = export_trajectory(Game(seed=9, headless=True), NpySink(path), 1000, chunk_size=128)
+
+        replay_path = self._path('run.rpl')
+        with ReplayWriter(replay_path, GAME_CONFIG['TIMESTEP']['PHYSICS_HZ']) as recorder:
+            Game(seed=9, headless=True).run_headless(1000, recorder)
+
+        self.assertEqual(count, 1000)
+        exported = np.load(path, mmap_mode='r')
+        with ReplayReader(replay_path) as replay:
+            self.assertEqual(exported.tobytes(), replay.frames().tobytes())
+
+    def test_npz_and_csv(self):
+        """测试 .npz 与 .csv 导出的内容一致"""
+        npz_path = self._path('run.npz')
+        csv_path = self._path('run.csv')
+        npz_sink, csv_sink = open_sink(npz_path), open_sink(csv_path)
+        self.assertIsInstance(npz_sink, NpzSink)
+        self.assertIsInstance(csv_sink, CsvSink)
+        export_trajectory(Game(seed=2, headless=True), npz_sink, 300, chunk_size=64)
+        export_trajectory(Game(seed=2, headless=True), csv_sink, 300, chunk_size=64)
+        self.assertEqual((npz_sink.count, csv_sink.count), (300, 300))
+
+        frames = load_npz(npz_path)
+        with open(csv_path, newline='') as f:
+            rows = list(csv.DictReader(f))
+
+        self.assertEqual(len(frames), 300)
+        self.assertEqual(len(rows), 300)
+        for n in (0, 150, 299):
+            self.assertEqual(int(rows[n]['tick']), frames['tick'][n])
+            self.assertEqual(float(rows[n]['x']), frames['position'][n, 0])
+            self.assertEqual(float(rows[n]['vy']), frames['velocity'][n, 1])
+            self.assertEqual(int(rows[n]['color_index']), frames['color_index'][n])
+
+    def test_unknown_format(self):
+        """测试不支持的扩展名会报错"""
+        with self.assertRaises(ValueError):
+            open_sink(self._path('run.txt'))
+
+    def test_writer_error_propagates(self):
+        """测试后台写入线程的异常会传回调用方，sink 被关闭，线程退出"""
+        class FailingSink:
+            closed = False
+
+            def write(self, chunk):
+                raise IOError("disk full")
+
+            def close(self):
+                self.closed = True
+
+        sink = FailingSink()
+        writer = BackgroundWriter(sink, max_pending=1)
+        with self.assertRaises(IOError):
+            for chunk in batched(iter_states(Game(seed=0, headless=True), 100), 10):
+                writer.write(chunk)
+        self.assertTrue(sink.closed)
+        self.assertFalse(writer._thread.is_alive())
+        with self.assertRaises(IOError):
+            writer.close()
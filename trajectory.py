@@ -0,0 +1,238 @@
+import csv
+import queue
+import threading
+import zipfile
+import numpy as np
+from replay import RECORD_DTYPE
+from typing import Iterable, Iterator, Optional
+
+# CSV 列，与 RECORD_DTYPE 展平后的字段一一对应
+CSV_COLUMNS = ('tick', 'rotation', 'x', 'y', 'vx', 'vy', 'color_index', 'flags')
+
+
+def iter_states(game, steps: Optional[int] = None) -> Iterator[tuple]:
+    """逐步推进 game 并产出每步结束时的状态（steps 为 None 时无限运行）
+
+    每个元素与 Game.snapshot() 相同，字段顺序与 replay.RECORD_DTYPE 一致。
+    """
+    tick = 0
+    while steps is None or tick < steps:
+        flags = game.step()
+        yield game.snapshot(flags)
+        tick += 1
+
+
+def batched(states: Iterable[tuple], chunk_size: int = 4096) -> Iterator[np.ndarray]:
+    """把状态流按 chunk_size 条打包成 RECORD_DTYPE 数组（最后一块可能较短）"""
+    chunk = np.zeros(chunk_size, dtype=RECORD_DTYPE)
+    count = 0
+    for state in states:
+        chunk[count] = state
+        count += 1
+        if count == chunk_size:
+            yield chunk
+            # 交出的数组可能还在写入队列中，换一块新的继续填
+            chunk = np.zeros(chunk_size, dtype=RECORD_DTYPE)
+            count = 0
+    if count:
+        yield chunk[:count]
+
+
+class NpySink:
+    """流式写入单个 .npy 文件
+
+    先写入预留长度的文件头，关闭时再回填记录总数，因此不需要事先知道长度，
+    结果可以直接用 np.load 读取（或 mmap_mode='r' 映射）。
+    """
+    _HEADER_SIZE = 256
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.count = 0
+        self._file = open(path, 'wb')
+        self._file.write(self._header(0))
+
+    def _header(self, count: int) -> bytes:
+        header = repr({
+            'descr': np.lib.format.dtype_to_descr(RECORD_DTYPE),
+            'fortran_order': False,
+            'shape': (count,),
+        })
+        # 魔数 6 字节、版本 2 字节、头长度 2 字节，头部用空格补齐并以换行结束
+        padding = self._HEADER_SIZE - 10 - len(header) - 1
+        return (b'\x93NUMPY\x01\x00' + (self._HEADER_SIZE - 10).to_bytes(2, 'little') +
+                header.encode('latin1') + b' ' * padding + b'\n')
+
+    def write(self, chunk: np.ndarray) -> None:
+        self._file.write(chunk.tobytes())
+        self.count += len(chunk)
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self._file.seek(0)
+        self._file.write(self._header(self.count))
+        self._file.close()
+
+    def __enter__(self) -> 'NpySink':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class NpzSink:
+    """流式写入 .npz 文件，每块保存为一个数组 chunk_00000、chunk_00001……
+
+    用 load_npz() 可按顺序拼接回完整轨迹。
+    """
+
+    def __init__(self, path: str, compress: bool = True) -> None:
+        self.path = path
+        self.count = 0
+        self._chunks = 0
+        self._zip = zipfile.ZipFile(
+            path, 'w', zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED,
+            allowZip64=True)
+
+    def write(self, chunk: np.ndarray) -> None:
+        with self._zip.open(f'chunk_{self._chunks:05d}.npy', 'w', force_zip64=True) as f:
+            np.lib.format.write_array(f, np.ascontiguousarray(chunk), allow_pickle=False)
+        self._chunks += 1
+        self.count += len(chunk)
+
+    def close(self) -> None:
+        self._zip.close()
+
+    def __enter__(self) -> 'NpzSink':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class CsvSink:
+    """流式写入 CSV 文件，列见 CSV_COLUMNS"""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.count = 0
+        self._file = open(path, 'w', newline='')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(CSV_COLUMNS)
+
+    def write(self, chunk: np.ndarray) -> None:
+        self._writer.writerows(zip(
+            chunk['tick'].tolist(), chunk['rotation'].tolist(),
+            chunk['position'][:, 0].tolist(), chunk['position'][:, 1].tolist(),
+            chunk['velocity'][:, 0].tolist(), chunk['velocity'][:, 1].tolist(),
+            chunk['color_index'].tolist(), chunk['flags'].tolist()))
+        self.count += len(chunk)
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> 'CsvSink':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def open_sink(path: str):
+    """按扩展名选择输出：.npy、.npz 或 .csv"""
+    if path.endswith('.npy'):
+        return NpySink(path)
+    if path.endswith('.npz'):
+        return NpzSink(path)
+    if path.endswith('.csv'):
+        return CsvSink(path)
+    raise ValueError(f"Unsupported trajectory format: {path}")
+
+
+def load_npz(path: str) -> np.ndarray:
+    """读取 NpzSink 写出的文件并按块顺序拼接"""
+    with np.load(path) as data:
+        names = sorted(data.files)
+        if not names:
+            return np.zeros(0, dtype=RECORD_DTYPE)
+        return np.concatenate([data[name] for name in names])
+
+
+class BackgroundWriter:
+    """在后台线程中把数据块交给 sink 写盘
+
+    待写的块放在容量为 max_pending 的队列中：磁盘跟不上时 write() 会阻塞，
+    内存占用因此有上限。sink 由后台线程在退出时关闭；写入出错时立即关闭，
+    异常会在下一次 write() 或 close() 时抛出，write() 抛出前先停止后台线程。
+    """
+    _STOP = object()
+
+    def __init__(self, sink, max_pending: int = 4) -> None:
+        self.sink = sink
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._error: Optional[BaseException] = None
+        self._sink_closed = False
+        self._thread = threading.Thread(target=self._run, name='trajectory-writer', daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            while True:
+                chunk = self._queue.get()
+                if chunk is self._STOP:
+                    return
+                if self._error is None:
+                    try:
+                        self.sink.write(chunk)
+                    except BaseException as e:
+                        # 记录错误并立即关闭 sink，之后继续取出队列，避免生产者永远阻塞
+                        self._error = e
+                        self._close_sink()
+        finally:
+            self._close_sink()
+
+    def _close_sink(self) -> None:
+        """只关闭一次；写入已经出错时，关闭时的异常不覆盖原来的错误"""
+        if self._sink_closed:
+            return
+        self._sink_closed = True
+        try:
+            self.sink.close()
+        except BaseException as e:
+            if self._error is None:
+                self._error = e
+
+    def write(self, chunk: np.ndarray) -> None:
+        if self._error is not None:
+            # 停止后台线程后抛出错误（sink 已由后台线程关闭）
+            self.close()
+        self._queue.put(chunk)
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._queue.put(self._STOP)
+            self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self) -> 'BackgroundWriter':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def export_trajectory(game, sink, steps: Optional[int] = None, chunk_size: int = 4096,
+                      max_pending: int = 4) -> int:
+    """无界面运行 game 并把轨迹写入 sink，返回写出的记录数
+
+    步进在当前线程进行，写盘在后台线程进行。内存中最多同时存在
+    max_pending + 2 个数据块，与运行时长无关。
+    """
+    count = 0
+    with BackgroundWriter(sink, max_pending) as writer:
+        for chunk in batched(iter_states(game, steps), chunk_size):
+            writer.write(chunk)
+            count += len(chunk)
+    return count
@@ -1,11 +1,20 @@
 import math
 import random
+import numpy as np
 import pygame
+import pygame.gfxdraw
 from pygame.math import Vector2
 from config import GAME_CONFIG
+from geometry import ConvexPolygon
+from metrics import MetricsRegistry
+from collections import OrderedDict
 from functools import lru_cache
 from typing import List, Tuple, Dict, Optional
 
+def fixed_dt() -> float:
+    """配置中的固定物理步长（秒）"""
+    return 1.0 / GAME_CONFIG['TIMESTEP']['PHYSICS_HZ']
+
 def get_hex_points(angle):
     """获取旋转后的六边形顶点"""
     points = []
@@ -49,15 +58,17 @@ def get_closest_point_on_line(point, line_start, line_end):
     t = max(0, min(1, point_vec.dot(line_vec) / (line_length * line_length)))
     return Vector2(line_start[0] + t * line_vec.x, line_start[1] + t * line_vec.y)
 
-def draw_smooth_hexagon(surface, color, points, width):
+def draw_smooth_hexagon(surface, color, points, width, render_scale=None):
     """增强平滑效果的六边形绘制"""
-    render_scale = GAME_CONFIG['WINDOW']['RENDER_SCALE']
+    if render_scale is None:
+        render_scale = GAME_CONFIG['WINDOW']['RENDER_SCALE']
     points = [(x * render_scale, y * render_scale) for x, y in points]
-    width = width * render_scale
+    # 动态分辨率下倍数可能不是整数，线宽取整
+    width = round(width * render_scale)
     
     # 绘制多层渐变边框
     for i in range(3):
-        outer_width = width + (2-i) * render_scale
+        outer_width = round(width + (2-i) * render_scale)
         alpha = 100 + i * 50
         pygame.draw.polygon(surface, (*color[:3], alpha), points, outer_width)
     
@@ -67,40 +78,444 @@ def draw_smooth_hexagon(surface, color, points, width):
     # 增强顶点平滑
     for point in points:
         for r in range(3):
-            radius = (width // 2 - r) * render_scale
+            radius = round((width // 2 - r) * render_scale)
             alpha = 150 + r * 35
             pygame.draw.circle(surface, (*color[:3], alpha), 
                              (int(point[0]), int(point[1])), 
                              radius)
 
+class _SurfaceLRU:
+    """按字节数限制容量的 LRU 缓存，值的大小由调用方给出"""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    def get(self, key):
+        """命中时返回值并标记为最近使用，否则返回 None"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, value, size: int) -> None:
+        if key in self._entries:
+            self.bytes -= self._entries.pop(key)[1]
+        self._entries[key] = (value, size)
+        self.bytes += size
+        self.shrink()
+
+    def shrink(self) -> None:
+        """淘汰最久未用的项直到不超过上限（至少保留最近的一项）"""
+        while self.bytes > self.max_bytes and len(self._entries) > 1:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.bytes -= evicted
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.bytes = 0
+
+class HexagonSpriteCache:
+    """六边形轮廓的旋转图集
+
+    按 angle_step 量化角度，用 draw_smooth_hexagon 在离屏表面上预渲染轮廓。
+    正六边形旋转 60° 后与自身重合，只需覆盖 [0°, 60°)。轮廓是一圈细环，
+    预渲染结果切成 tile_size 的小块并裁掉透明部分，只保存非空的块，
+    绘制时一次 blits 即可。图集在用到时才生成，总大小受 max_bytes 限制；
+    不同渲染倍数的图集分开缓存（动态分辨率来回切换时仍然有效），
+    颜色、线宽或半径变化时整体重建。
+    """
+
+    def __init__(self, angle_step: float = 0.25, max_bytes: int = 64 * 1024 * 1024,
+                 tile_size: int = 32) -> None:
+        self.angle_step = angle_step
+        self.tile_size = tile_size
+        self.sprites = _SurfaceLRU(max_bytes)
+        self._params = None
+
+    @property
+    def angle_count(self) -> int:
+        return max(1, round(60.0 / self.angle_step))
+
+    def draw(self, surface: pygame.Surface, color, center, radius: float,
+             rotation: float, width: int, render_scale: Optional[int] = None,
+             supersample: int = 1) -> None:
+        """在 center（未缩放坐标）处绘制角度为 rotation 的六边形轮廓
+
+        supersample 大于 1 时先以 render_scale * supersample 倍预渲染，
+        再缩小到 render_scale 倍保存（只对这一张精灵做超采样）。
+        """
+        if render_scale is None:
+            render_scale = GAME_CONFIG['WINDOW']['RENDER_SCALE']
+        shape = (tuple(color[:3]), width, radius)
+        if shape != self._params:
+            self.sprites.clear()
+            self._params = shape
+
+        index = round((rotation % 60.0) / self.angle_step) % self.angle_count
+        key = (render_scale, supersample, index)
+        tiles = self.sprites.get(key)
+        if tiles is None:
+            tiles, size = self._build(index, shape + (render_scale, supersample))
+            self.sprites.put(key, tiles, size)
+
+        ox = round(center[0] * render_scale)
+        oy = round(center[1] * render_scale)
+        surface.blits([(tile, (ox + x, oy + y), None, pygame.BLEND_RGBA_MAX)
+                       for tile, x, y in tiles], doreturn=False)
+
+    def _build(self, index: int, params) -> Tuple[list, int]:
+        """预渲染一个角度，返回 [(小块, 相对中心的偏移)] 和占用字节数"""
+        color, width, radius, render_scale, supersample = params
+        # 留出边框加粗和顶点圆的余量，半边长取超采样倍数的整数倍以便对齐缩小
+        draw_scale = render_scale * supersample
+        half = math.ceil((math.ceil(radius * draw_scale + (width + 2) * draw_scale) + 2) /
+                         supersample) * supersample
+        canvas = pygame.Surface((half * 2, half * 2), pygame.SRCALPHA)
+        angle = index * self.angle_step
+        points = [(half / draw_scale + radius * math.cos(math.radians(angle + i * 60)),
+                   half / draw_scale + radius * math.sin(math.radians(angle + i * 60)))
+                  for i in range(6)]
+        draw_smooth_hexagon(canvas, color, points, width, draw_scale)
+        if supersample > 1:
+            half //= supersample
+            canvas = pygame.transform.smoothscale(canvas, (half * 2, half * 2))
+
+        # 只检查靠近轮廓的块：块中心到轮廓的距离超过线宽余量加半条对角线的块一定是空的
+        outline = ConvexPolygon.regular((half, half), radius * render_scale, 6, angle)
+        reach = (width + 2) * render_scale + 2 + self.tile_size * 0.75
+        corners = [(x, y) for y in range(0, half * 2, self.tile_size)
+                   for x in range(0, half * 2, self.tile_size)]
+        middles = np.array(corners, dtype=np.float64) + self.tile_size / 2
+        near = np.abs(outline.edge_distances_many(middles).min(axis=1)) <= reach
+
+        tiles, size = [], 0
+        bounds = canvas.get_rect()
+        for (x, y), keep in zip(corners, near):
+            if not keep:
+                continue
+            area = pygame.Rect(x, y, self.tile_size, self.tile_size).clip(bounds)
+            used = canvas.subsurface(area).get_bounding_rect()
+            if used.width == 0 or used.height == 0:
+                continue
+            used.move_ip(area.x, area.y)
+            tile = canvas.subsurface(used).copy()
+            tiles.append((tile, used.x - half, used.y - half))
+            size += used.width * used.height * tile.get_bytesize()
+        return tiles, size
+
+_hexagon_sprites: Optional[HexagonSpriteCache] = None
+
+def draw_cached_hexagon(surface: pygame.Surface, color, center, radius: float,
+                        rotation: float, width: int, render_scale: Optional[int] = None,
+                        supersample: int = 1) -> None:
+    """用共享的旋转图集绘制六边形轮廓（效果同 draw_smooth_hexagon）"""
+    global _hexagon_sprites
+    if _hexagon_sprites is None:
+        config = GAME_CONFIG['HEXAGON']
+        _hexagon_sprites = HexagonSpriteCache(
+            config['SPRITE_ANGLE_STEP'], int(config['SPRITE_CACHE_MB'] * 1024 * 1024))
+    _hexagon_sprites.draw(surface, color, center, radius, rotation, width,
+                          render_scale, supersample)
+
+# 发光球体的层：(半径增量，单位为未缩放像素, alpha)，由内到外依次叠加
+GLOW_LAYERS = tuple((i * 1.5, 120 - i * 15) for i in range(8))
+
 # 缓存发光球体的表面
 class GlowSurfaceCache:
-    _surfaces: Dict[Tuple[int, Tuple[int, int, int], int], pygame.Surface] = {}
-    
+    """发光球体的预合成精灵
+
+    八层同色圆按 SDL2 alpha 混合依次叠加，等价于一张颜色不变、
+    alpha 为 1 - Π(1 - aᵢ) 的精灵，因此每个 (半径, 颜色, 渲染倍数) 只需一张表面，
+    每个球每帧只需一次 blit。缓存按字节数限制容量（LRU）。
+    """
+    _sprites = _SurfaceLRU(int(GAME_CONFIG['WINDOW']['GLOW_CACHE_MB'] * 1024 * 1024))
+
+    @classmethod
+    def get_sprite(cls, radius: float, color: Tuple[int, int, int],
+                   render_scale: Optional[int] = None, supersample: int = 1,
+                   layers: Optional[int] = None) -> pygame.Surface:
+        """取得半径为 radius（未缩放像素）的发光精灵，不存在时生成
+
+        supersample 大于 1 时以 render_scale * supersample 倍合成后缩小。
+        layers 为只使用最内的几层光晕（细节层次），None 表示全部。
+        """
+        if render_scale is None:
+            render_scale = GAME_CONFIG['WINDOW']['RENDER_SCALE']
+        if layers is None:
+            layers = len(GLOW_LAYERS)
+        key = (radius, tuple(color[:3]), render_scale, supersample, layers)
+        sprite = cls._sprites.get(key)
+        if sprite is None:
+            draw_scale = render_scale * supersample
+            sprite = cls._build(radius * draw_scale, key[1], draw_scale, supersample,
+                                GLOW_LAYERS[:layers])
+            if supersample > 1:
+                size = sprite.get_width() // supersample
+                sprite = pygame.transform.smoothscale(sprite, (size, size))
+            cls._sprites.put(key, sprite, sprite.get_width() * sprite.get_height() *
+                             sprite.get_bytesize())
+        return sprite
+
+    @staticmethod
+    def _build(radius: float, color: Tuple[int, int, int], render_scale: int,
+               align: int = 1, glow_layers=GLOW_LAYERS) -> pygame.Surface:
+        """按各层的覆盖范围合成 alpha，精灵半边长取 align 的整数倍"""
+        layers = [(int(radius + offset * render_scale), alpha) for offset, alpha in glow_layers]
+        outer = math.ceil(max(r for r, _ in layers) / align) * align
+        transmit = np.ones((outer * 2, outer * 2), dtype=np.float64)
+        for glow_radius, alpha in layers:
+            # 与逐层绘制相同：在各自 2r×2r 的表面上画圆，再按中心对齐
+            layer = pygame.Surface((glow_radius * 2, glow_radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(layer, (255, 255, 255, 255), (glow_radius, glow_radius), glow_radius)
+            covered = pygame.surfarray.array_alpha(layer) > 0
+            start = outer - glow_radius
+            region = transmit[start:start + glow_radius * 2, start:start + glow_radius * 2]
+            region[covered] *= 1 - alpha / 255
+
+        sprite = pygame.Surface((outer * 2, outer * 2), pygame.SRCALPHA)
+        sprite.fill((*color, 0))
+        alpha = pygame.surfarray.pixels_alpha(sprite)
+        alpha[...] = np.rint((1 - transmit) * 255).astype(np.uint8)
+        del alpha
+        return sprite
+
+    @classmethod
+    def warm_up(cls, radius: float, colors=None, render_scale: Optional[int] = None) -> None:
+        """预先生成一组颜色（默认 BALL_COLORS）的精灵，避免运行中首次绘制时卡顿"""
+        for color in colors if colors is not None else GAME_CONFIG['COLORS']['BALL_COLORS']:
+            cls.get_sprite(radius, color, render_scale)
+
+    @classmethod
+    def set_budget(cls, max_bytes: int) -> None:
+        """修改字节上限，超出的部分立即淘汰"""
+        cls._sprites.max_bytes = max_bytes
+        cls._sprites.shrink()
+
+    @classmethod
+    def clear(cls) -> None:
+        cls._sprites.clear()
+
     @classmethod
-    def get_surface(cls, radius: int, color: Tuple[int, int, int], 
-                   alpha: int) -> pygame.Surface:
-        key = (radius, color, alpha)
-        if key not in cls._surfaces:
-            surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
-            pygame.draw.circle(surface, (*color, alpha), 
-                             (radius, radius), radius)
-            cls._surfaces[key] = surface
-        return cls._surfaces[key]
+    def stats(cls) -> Dict[str, int]:
+        """缓存条目数、字节数与命中、未命中、淘汰次数"""
+        return {
+            'entries': len(cls._sprites),
+            'bytes': cls._sprites.bytes,
+            'hits': cls._sprites.hits,
+            'misses': cls._sprites.misses,
+            'evictions': cls._sprites.evictions,
+        }
+
+def _register_cache_metrics(cache: str, get_lru) -> None:
+    """缓存已经自己计数，导出时再读取，绘制时没有额外开销"""
+    def read(attr: str):
+        return lambda: getattr(get_lru(), attr) if get_lru() is not None else 0
+
+    registry = MetricsRegistry.get_registry()
+    registry.counter('sprite_cache_hits_total', "精灵缓存命中次数", fn=read('hits'), cache=cache)
+    registry.counter('sprite_cache_misses_total', "精灵缓存未命中次数", fn=read('misses'), cache=cache)
+    registry.counter('sprite_cache_evictions_total', "精灵缓存淘汰次数",
+                     fn=read('evictions'), cache=cache)
+    registry.gauge('sprite_cache_bytes', "精灵缓存占用的字节数", fn=read('bytes'), cache=cache)
+
+_register_cache_metrics('glow', lambda: GlowSurfaceCache._sprites)
+_register_cache_metrics('hexagon', lambda: _hexagon_sprites.sprites if _hexagon_sprites is not None else None)
 
 def draw_glowing_circle(surface: pygame.Surface, color: Tuple[int, int, int],
-                       position: Tuple[int, int], radius: int) -> None:
-    """优化的发光球体绘制"""
-    render_scale = GAME_CONFIG['WINDOW']['RENDER_SCALE']
-    position = (position[0] * render_scale, position[1] * render_scale)
-    radius = radius * render_scale
-
-    # 使用缓存的发光表面
-    for i in range(8):
-        alpha = 120 - i * 15
-        radius_offset = i * 1.5
-        glow_radius = int(radius + radius_offset * render_scale)
-        glow_surface = GlowSurfaceCache.get_surface(glow_radius, color, alpha)
-        surface.blit(glow_surface,
-                    (position[0] - glow_radius, position[1] - glow_radius),
-                    special_flags=pygame.BLEND_ALPHA_SDL2) 
\ No newline at end of file
+                       position: Tuple[float, float], radius: int,
+                       render_scale: Optional[int] = None, supersample: int = 1) -> None:
+    """优化的发光球体绘制：一次 blit 预合成的发光精灵
+
+    position 可以带小数，放大到 render_scale 倍后才取整，超采样时保留亚像素位置。
+    """
+    if render_scale is None:
+        render_scale = GAME_CONFIG['WINDOW']['RENDER_SCALE']
+    sprite = GlowSurfaceCache.get_sprite(radius, color, render_scale, supersample)
+    half = sprite.get_width() // 2
+    surface.blit(sprite,
+                 (round(position[0] * render_scale) - half, round(position[1] * render_scale) - half),
+                 special_flags=pygame.BLEND_ALPHA_SDL2)
+
+def glow_lod(count: int) -> int:
+    """按球数从 WINDOW['GLOW_LOD'] 中选出光晕层数"""
+    layers = len(GLOW_LAYERS)
+    for min_count, lod_layers in GAME_CONFIG['WINDOW']['GLOW_LOD']:
+        if count >= min_count:
+            layers = lod_layers
+    return layers
+
+def draw_ball_batch(surface: pygame.Surface, positions: np.ndarray, radii, colors: np.ndarray,
+                    render_scale: Optional[float] = None, supersample: int = 1,
+                    layers: Optional[int] = None, splat: Optional[bool] = None) -> None:
+    """批量绘制发光球体，效果同逐个调用 draw_glowing_circle
+
+    球按颜色分组，每种颜色只处理一趟（同色球之间的叠加顺序不影响结果）。
+    球数达到 WINDOW['SPLAT_MIN_BALLS'] 时用 NumPy 在 surfarray 视图上直接合成，
+    耗时基本与球数无关；否则每种颜色一次 blits。layers 默认由 glow_lod() 按球数决定。
+    """
+    count = len(positions)
+    if count == 0:
+        return
+    if render_scale is None:
+        render_scale = GAME_CONFIG['WINDOW']['RENDER_SCALE']
+    if layers is None:
+        layers = glow_lod(count)
+    if splat is None:
+        splat = count >= GAME_CONFIG['WINDOW']['SPLAT_MIN_BALLS']
+    # 与 draw_glowing_circle 相同：放大后再取整（同为就近取偶）
+    anchors = np.rint(np.asarray(positions, dtype=np.float64) * render_scale)
+    radii = np.broadcast_to(np.asarray(radii, dtype=np.float64), (count,))
+    colors = np.broadcast_to(np.asarray(colors, dtype=np.uint8), (count, 3))
+
+    # 把颜色编码成一个整数后排序分组
+    keys = (colors[:, 0].astype(np.int64) << 16) | (colors[:, 1].astype(np.int64) << 8) | colors[:, 2]
+    order = np.argsort(keys, kind='stable')
+    starts = np.flatnonzero(np.diff(keys[order], prepend=-1))
+    groups = []
+    for group in np.split(order, starts[1:]):
+        color = tuple(int(c) for c in colors[group[0]])
+        # 同一颜色内再按半径分组，每组共用一张精灵
+        for radius in np.unique(radii[group]):
+            members = group[radii[group] == radius]
+            groups.append((color, float(radius), anchors[members]))
+
+    if splat:
+        _splat_glow(surface, groups, render_scale, supersample, layers)
+        return
+    for color, radius, anchor in groups:
+        sprite = GlowSurfaceCache.get_sprite(radius, color, render_scale, supersample, layers)
+        corners = (anchor - sprite.get_width() // 2).astype(np.int64).tolist()
+        surface.blits([(sprite, corner, None, pygame.BLEND_ALPHA_SDL2) for corner in corners],
+                      doreturn=False)
+
+@lru_cache(maxsize=64)
+def _splat_kernel(radius: float, render_scale: float, supersample: int, layers: int):
+    """发光精灵的 log 透射率沿 x 方向的差分：(边长, 行, 列, 权重)
+
+    精灵的 alpha 由同心圆环构成，每行只有在环的边界处差分不为零，
+    把这些稀疏的差分散布到图上再沿 x 累加，就得到所有球的 log 透射率之和。
+    """
+    sprite = GlowSurfaceCache.get_sprite(radius, (255, 255, 255), render_scale, supersample, layers)
+    alpha = pygame.surfarray.array_alpha(sprite).T / 255.0
+    log_transmit = np.log1p(-np.minimum(alpha, 0.999))
+    diff = np.diff(np.pad(log_transmit, ((0, 0), (1, 1))), axis=1)
+    rows, cols = np.nonzero(diff)
+    return alpha.shape[0], rows, cols, diff[rows, cols]
+
+def _splat_glow(surface: pygame.Surface, groups: list, render_scale: float,
+                supersample: int, layers: int) -> None:
+    """用 NumPy 在 surfarray 视图上合成各颜色组的光晕
+
+    同色的 n 次 SDL2 alpha 混合等价于一次颜色不变、透射率为 ΠTᵢ 的混合。
+    每种颜色先求出覆盖区域内各像素的 ΣlogTᵢ，再对目标做一次
+    dst = c + (dst - c)·T，alpha 通道同理（c 取 255）。
+    """
+    width, height = surface.get_size()
+    kernels, boxes = [], []
+    for color, radius, anchor in groups:
+        size, rows, cols, weights = _splat_kernel(radius, render_scale, supersample, layers)
+        corners = (anchor - size // 2).astype(np.int64)
+        # 去掉完全在表面之外的球
+        visible = ((corners[:, 0] + size > 0) & (corners[:, 0] < width) &
+                   (corners[:, 1] + size > 0) & (corners[:, 1] < height))
+        corners = corners[visible]
+        kernels.append((color, size, rows, cols, weights, corners))
+        if len(corners):
+            boxes.append((corners.min(axis=0), corners.max(axis=0) + size))
+    if not boxes:
+        return
+    x0, y0 = np.maximum(np.min([b[0] for b in boxes], axis=0), 0)
+    x1, y1 = np.minimum(np.max([b[1] for b in boxes], axis=0), (width, height))
+    pad = max(k[1] for k in kernels)
+    acc_w, acc_h = int(x1 - x0) + 2 * pad + 1, int(y1 - y0) + 2 * pad
+
+    has_alpha = bool(surface.get_flags() & pygame.SRCALPHA)
+    rgb = pygame.surfarray.pixels3d(surface)
+    region = np.empty((y1 - y0, x1 - x0, 4 if has_alpha else 3), dtype=np.float32)
+    region[..., :3] = rgb[x0:x1, y0:y1].transpose(1, 0, 2)
+    if has_alpha:
+        alpha = pygame.surfarray.pixels_alpha(surface)
+        region[..., 3] = alpha[x0:x1, y0:y1].T
+
+    index = 0
+    while index < len(kernels):
+        # 同一颜色的各半径组累加到同一张图上
+        color = kernels[index][0]
+        indices, weights = [], []
+        while index < len(kernels) and kernels[index][0] == color:
+            _, _, rows, cols, kernel_weights, corners = kernels[index]
+            base = (corners[:, 1] - y0 + pad) * acc_w + (corners[:, 0] - x0 + pad)
+            indices.append((base[:, None] + (rows * acc_w + cols)[None, :]).ravel())
+            weights.append(np.broadcast_to(kernel_weights, (len(base), len(rows))).ravel())
+            index += 1
+        flat = np.concatenate(indices)
+        if not len(flat):
+            continue
+        acc = np.bincount(flat, np.concatenate(weights), minlength=acc_w * acc_h)
+        acc = acc.reshape(acc_h, acc_w)[pad:pad + y1 - y0]
+        transmit = np.exp(np.cumsum(acc, axis=1, dtype=np.float32)[:, pad:pad + x1 - x0])
+        target = np.array((*color, 255)[:region.shape[2]], dtype=np.float32)
+        region -= target
+        region *= transmit[..., None]
+        region += target
+
+    region += 0.5
+    rgb[x0:x1, y0:y1] = region[..., :3].transpose(1, 0, 2)
+    del rgb
+    if has_alpha:
+        alpha[x0:x1, y0:y1] = region[..., 3].T
+        del alpha
+
+def draw_aa_hexagon(surface: pygame.Surface, color, center, radius: float,
+                    rotation: float, width: int) -> None:
+    """原始分辨率下用 gfxdraw 抗锯齿图元绘制六边形轮廓
+
+    边框是内外两个六边形之间的环带，拆成六个梯形填充，再用 aapolygon
+    描出内外边缘。外侧加一圈半透明的宽环带近似 draw_smooth_hexagon 的渐变。
+    """
+    def ring(half_width):
+        # 沿法线方向偏移半个线宽，对应顶点方向偏移 half_width / cos30°
+        offset = half_width / math.cos(math.pi / 6)
+        outer = [(center[0] + (radius + offset) * math.cos(math.radians(rotation + i * 60)),
+                  center[1] + (radius + offset) * math.sin(math.radians(rotation + i * 60)))
+                 for i in range(6)]
+        inner = [(center[0] + (radius - offset) * math.cos(math.radians(rotation + i * 60)),
+                  center[1] + (radius - offset) * math.sin(math.radians(rotation + i * 60)))
+                 for i in range(6)]
+        return outer, inner
+
+    for half_width, alpha in ((width / 2 + 1, 100), (width / 2, 255)):
+        outer, inner = ring(half_width)
+        rgba = (*color[:3], alpha)
+        for i in range(6):
+            j = (i + 1) % 6
+            pygame.gfxdraw.filled_polygon(surface, [outer[i], outer[j], inner[j], inner[i]], rgba)
+        pygame.gfxdraw.aapolygon(surface, outer, rgba)
+        pygame.gfxdraw.aapolygon(surface, inner, rgba)
+
+def draw_aa_glowing_circle(surface: pygame.Surface, color: Tuple[int, int, int],
+                           position: Tuple[int, int], radius: int) -> None:
+    """原始分辨率下绘制发光球体：一倍大小的发光精灵，再用 aacircle 描出球体边缘
+
+    gfxdraw.filled_circle 带 alpha 时会重复绘制中间一列，逐层叠加会留下竖线和环纹，
+    因此光晕仍用预合成的精灵，只在最内层边缘使用抗锯齿图元。
+    """
+    x, y = round(position[0]), round(position[1])
+    draw_glowing_circle(surface, color, (x, y), radius, 1)
+    offset, alpha = GLOW_LAYERS[0]
+    pygame.gfxdraw.aacircle(surface, x, y, int(radius + offset), (*color[:3], alpha))